@@ -0,0 +1,108 @@
+"""Benchmark the local CPU paths of the pipeline: word counting, parsing and publishing.
+
+API calls are answered in-process by the fake LLM's canned responses, so
+the stage timings cover prompt building, response parsing and model
+validation without any network or sleep.
+
+Usage:
+    python benchmarks/bench_cpu.py --words 250,1000,5000 --json
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from src.fake_llm import FakeLLMServer
+from src.fake_llm.responses import CRITERIA, _generate_text
+from src.publisher import publish_content
+from src.publisher.validation import calculate_word_count, compute_text_stats
+from src.reviewer.reviewer import parse_review, review_content
+from src.revision_agent import revise_content
+from src.citation_editor import add_citations
+from src.utils.backends import LLMBackend, set_backend
+
+from bench_pipeline import percentiles
+
+
+class InProcessBackend(LLMBackend):
+    """Answer requests with the fake LLM's canned responses, without HTTP."""
+
+    name = "in-process"
+
+    def __init__(self):
+        self.fake = FakeLLMServer(seed=0)
+
+    def create(self, messages, api_key, **params):
+        """Build the canned response for a request."""
+        from openai.types.chat import ChatCompletion
+
+        return ChatCompletion.model_validate(self.fake.complete({"messages": messages, **params}))
+
+
+def time_calls(func, repeat: int) -> dict:
+    """Call func repeatedly and report per-call latency percentiles in seconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return {**percentiles(latencies), "calls_per_second": round(repeat / sum(latencies), 1)}
+
+
+def run(word_counts: list, repeat: int) -> dict:
+    """Time each CPU path for each text length."""
+    review_text = "SCORES:\n" + "\n".join(f"{c}: 8/10 | Feedback: Solid {c.lower()}." for c in CRITERIA) + "\n\nOVERALL FEEDBACK:\nGood."
+    previous = set_backend(InProcessBackend())
+    try:
+        results = []
+        for words in word_counts:
+            text = _generate_text(words, random.Random(0))
+            cited = add_citations(text, "fake-key", model="gpt-4o")
+            results.append({
+                "words": calculate_word_count(text),
+                "word_count": time_calls(lambda: calculate_word_count(text), repeat),
+                "text_stats": time_calls(lambda: compute_text_stats(cited.cited_content), repeat),
+                "parse_review": time_calls(lambda: parse_review(review_text), repeat),
+                "review_stage": time_calls(lambda: review_content(text, "fake-key", model="gpt-4o"), repeat),
+                "revise_stage": time_calls(lambda: revise_content(text, "fake-key", model="gpt-4o"), repeat),
+                "cite_stage": time_calls(lambda: add_citations(text, "fake-key", model="gpt-4o"), repeat),
+                "publish": time_calls(lambda: publish_content(cited), repeat)
+            })
+        return {"repeat": repeat, "results": results}
+    finally:
+        set_backend(previous)
+
+
+def _ints(text: str) -> list:
+    """Parse a comma-separated list of integers."""
+    return [int(part) for part in text.split(",") if part]
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=_ints, default=[250, 1000, 5000], help="Text lengths to benchmark")
+    parser.add_argument("--repeat", type=int, default=50, help="Calls per measurement")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run(args.words, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for row in report["results"]:
+        print(f"\n{row['words']} words (p50 / p99 ms)")
+        for name, timing in row.items():
+            if isinstance(timing, dict):
+                print(f"  {name:>13}: {timing['p50'] * 1000:8.3f} / {timing['p99'] * 1000:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
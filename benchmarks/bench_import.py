@@ -0,0 +1,80 @@
+"""Benchmark CLI startup and import time.
+
+Each command is run in a fresh interpreter several times and the median
+wall-clock time is reported. With --max-ms the script exits non-zero when any
+command is slower than the budget, so it can guard against regressions.
+
+Usage:
+    python benchmarks/bench_import.py --repeat 10 --max-ms 100
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+project_root = str(Path(__file__).parent.parent)
+
+COMMANDS = {
+    "python": [sys.executable, "-c", "pass"],
+    "import src.cli": [sys.executable, "-c", "import src.cli"],
+    "--help": [sys.executable, "-m", "src.cli", "--help"],
+    "publish --help": [sys.executable, "-m", "src.cli", "publish", "--help"],
+}
+
+# Modules that must not be imported just to start the CLI
+HEAVY_MODULES = ["openai", "pydantic", "dotenv", "typer", "rich"]
+
+
+def time_command(command: list, repeat: int) -> float:
+    """Median wall-clock milliseconds of running the command."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=project_root, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def heavy_imports() -> list:
+    """Heavy modules imported by `import src.cli`."""
+    code = f"import sys, src.cli; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a CLI command exceeds this median")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {name: round(time_command(command, args.repeat), 1) for name, command in COMMANDS.items()}
+    heavy = heavy_imports()
+
+    if args.json:
+        print(json.dumps({"median_ms": report, "heavy_imports": heavy}, indent=2))
+    else:
+        for name, ms in report.items():
+            print(f"{name:>16}: {ms:7.1f} ms")
+        print(f"Heavy modules imported at startup: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {heavy}")
+    if args.max_ms is not None:
+        failures.extend(
+            f"{name} took {ms} ms (budget {args.max_ms} ms)"
+            for name, ms in report.items() if name != "python" and ms > args.max_ms
+        )
+    if failures:
+        print("\n".join(f"REGRESSION: {failure}" for failure in failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark end-to-end pipeline throughput and per-stage latency against the fake LLM server.
+
+Runs sweeps around a base scenario, varying one of draft count, section
+concurrency or section length at a time, and reports sections per minute
+and p50/p95/p99 latency per section and per stage. Stage latencies come
+from the per-call latency recorded by the cost tracker.
+
+Usage:
+    python benchmarks/bench_pipeline.py --llm-latency 0.05 --json
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.input_handler.content_input import ContentInput
+from src.pipeline import run_section
+from src.utils.cost_tracker import cost_tracker
+
+KEYPOINTS = ["Gold nanoparticles", "Bayesian optimization", "Surface-enhanced Raman scattering"]
+
+
+def percentiles(values: list) -> dict:
+    """p50, p95 and p99 of a list of seconds."""
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None}
+    cuts = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    return {"count": len(values), "p50": round(cuts[49], 6), "p95": round(cuts[94], 6), "p99": round(cuts[98], 6)}
+
+
+def run_scenario(sections: int, versions: int, concurrency: int, word_limit: int) -> dict:
+    """Run sections through the pipeline and report throughput and latency."""
+    section_input = ContentInput(section="Introduction", keypoints=KEYPOINTS, word_limit=word_limit)
+
+    def timed_section() -> float:
+        start = time.perf_counter()
+        run_section(section_input, "fake-key", num_versions=versions)
+        return time.perf_counter() - start
+
+    with cost_tracker.track_calls() as calls:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, timed_section) for _ in range(sections)]
+            section_latencies = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+    # Multi-choice responses are recorded once per choice with the same latency
+    stage_latencies = {}
+    seen = set()
+    for call in calls:
+        key = (call["operation"], call["latency"])
+        if call["latency"] is not None and key not in seen:
+            seen.add(key)
+            stage_latencies.setdefault(call["operation"], []).append(call["latency"])
+
+    return {
+        "sections": sections,
+        "versions": versions,
+        "concurrency": concurrency,
+        "word_limit": word_limit,
+        "seconds": round(elapsed, 4),
+        "sections_per_minute": round(sections / elapsed * 60, 2),
+        "api_calls": sum(len(latencies) for latencies in stage_latencies.values()),
+        "section_latency": percentiles(section_latencies),
+        "stage_latency": {stage: percentiles(latencies) for stage, latencies in stage_latencies.items()}
+    }
+
+
+def run(llm_latency: str, tokens_per_second: float, sections: int, draft_counts: list,
+        concurrency_levels: list, word_limits: list, base_versions: int = 3,
+        base_concurrency: int = 1, base_word_limit: int = 500) -> dict:
+    """Run every sweep against one fake LLM server."""
+    with FakeLLMServer(latency=llm_latency, tokens_per_second=tokens_per_second, seed=0) as llm:
+        config.OPENAI_BASE_URL = llm.base_url
+        config.MODEL_NAME = "gpt-4o"
+        # Routing can escalate fake drafts and make call counts vary between runs
+        config.MODEL_ROUTING = False
+
+        sweeps = {
+            "versions": [run_scenario(sections, v, base_concurrency, base_word_limit) for v in draft_counts],
+            "concurrency": [run_scenario(max(sections, c), base_versions, c, base_word_limit) for c in concurrency_levels],
+            "word_limit": [run_scenario(sections, base_versions, base_concurrency, w) for w in word_limits]
+        }
+        return {
+            "llm_latency": str(llm.latency),
+            "tokens_per_second": tokens_per_second,
+            "llm_requests": llm.requests,
+            "sweeps": sweeps
+        }
+
+
+def _ints(text: str) -> list:
+    """Parse a comma-separated list of integers."""
+    return [int(part) for part in text.split(",") if part]
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-latency", default="0.05", help="Fake LLM latency in seconds or a distribution spec")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake LLM output rate (0 for instant)")
+    parser.add_argument("--sections", type=int, default=4, help="Sections per scenario")
+    parser.add_argument("--versions", type=_ints, default=list(range(1, 11)), help="Draft counts to sweep")
+    parser.add_argument("--concurrency", type=_ints, default=[1, 2, 4, 8], help="Section concurrency levels to sweep")
+    parser.add_argument("--word-limits", type=_ints, default=[250, 500, 1000, 2000], help="Section lengths to sweep")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run(args.llm_latency, args.tokens_per_second, args.sections, args.versions, args.concurrency, args.word_limits)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Fake LLM latency {report['llm_latency']}, {report['llm_requests']} requests")
+    for sweep, rows in report["sweeps"].items():
+        print(f"\nSweep: {sweep}")
+        print(f"{'versions':>9} {'conc':>5} {'words':>6} {'sec/min':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'calls':>6}")
+        for row in rows:
+            latency = row["section_latency"]
+            print(f"{row['versions']:>9} {row['concurrency']:>5} {row['word_limit']:>6} {row['sections_per_minute']:>8.1f} "
+                  f"{latency['p50']:>7.3f} {latency['p95']:>7.3f} {latency['p99']:>7.3f} {row['api_calls']:>6}")
+
+
+if __name__ == "__main__":
+    main()
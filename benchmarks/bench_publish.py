@@ -0,0 +1,96 @@
+"""Benchmark bulk publishing throughput across worker counts.
+
+Usage:
+    python benchmarks/bench_publish.py --documents 400 --words 1000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from src.citation_editor.models import Citation, CitedContent
+from src.publisher import publish_many
+
+SENTENCE = "Gold nanoparticles exhibit localized surface plasmon resonance that enhances Raman scattering [Reason for citation: LSPR mechanism]."
+
+
+def make_documents(count: int, words: int) -> list:
+    """Create synthetic cited documents of roughly the given length."""
+    sentences_per_doc = max(1, words // len(SENTENCE.split()))
+    paragraphs = [" ".join([SENTENCE] * 5) for _ in range(max(1, sentences_per_doc // 5))]
+    text = "\n\n".join(paragraphs)
+    return [
+        CitedContent(
+            original_content=text,
+            cited_content=text,
+            citations=[
+                Citation(text="[LSPR mechanism]", source="Citation reason", location=f"Paragraph {i}", reason="LSPR mechanism")
+                for i in range(len(paragraphs))
+            ],
+            citation_changes=[],
+            citation_summary=f"Document {n}"
+        )
+        for n in range(count)
+    ]
+
+
+def worker_counts(max_workers: int) -> list:
+    """Powers of two up to and including max_workers."""
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run(documents: int, words: int, max_workers: int, chunksize: int) -> dict:
+    """Time publish_many for each worker count and report the speedup."""
+    docs = make_documents(documents, words)
+    results = []
+    baseline = None
+    for workers in worker_counts(max_workers):
+        start = time.perf_counter()
+        published = sum(1 for _ in publish_many(docs, workers=workers, chunksize=chunksize))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        results.append({
+            "workers": workers,
+            "documents": published,
+            "seconds": round(elapsed, 4),
+            "docs_per_second": round(published / elapsed, 2),
+            "speedup": round(baseline / elapsed, 2),
+            "efficiency": round(baseline / elapsed / workers, 2)
+        })
+    return {"documents": documents, "words": words, "chunksize": chunksize, "results": results}
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=400)
+    parser.add_argument("--words", type=int, default=1000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run(args.documents, args.words, args.max_workers, args.chunksize)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Publishing {report['documents']} documents of ~{report['words']} words")
+    print(f"{'workers':>8} {'seconds':>9} {'docs/s':>9} {'speedup':>8} {'efficiency':>11}")
+    for row in report["results"]:
+        print(f"{row['workers']:>8} {row['seconds']:>9.3f} {row['docs_per_second']:>9.1f} {row['speedup']:>8.2f} {row['efficiency']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
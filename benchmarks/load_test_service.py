@@ -0,0 +1,100 @@
+"""Load test the job service against the local fake LLM server.
+
+Starts a fake LLM server and the service in this process, submits jobs over
+HTTP from several client threads and reports job throughput and latency.
+
+Usage:
+    python benchmarks/load_test_service.py --jobs 40 --workers 8 --llm-latency 0.2
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.service import JobManager, ServiceServer
+
+
+def request(method: str, url: str, payload=None) -> dict:
+    """Send a JSON request to the service."""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())
+
+
+def run_job(service_url: str, word_limit: int, versions: int, poll_interval: float) -> float:
+    """Submit one section job, wait for it and return its latency in seconds."""
+    start = time.perf_counter()
+    job = request("POST", f"{service_url}/jobs", {
+        "section": {"section": "Introduction", "keypoints": ["Gold nanoparticles", "Bayesian optimization"], "word_limit": word_limit},
+        "num_versions": versions
+    })
+    while job["status"] in ("queued", "running"):
+        time.sleep(poll_interval)
+        job = request("GET", f"{service_url}/jobs/{job['id']}")
+    if job["status"] != "succeeded":
+        raise RuntimeError(f"Job {job['id']} {job['status']}: {job.get('error')}")
+    return time.perf_counter() - start
+
+
+def run(jobs: int, workers: int, clients: int, llm_latency: float, word_limit: int, versions: int) -> dict:
+    """Run the load test and return the report."""
+    with FakeLLMServer(latency=llm_latency, seed=0) as llm:
+        config.OPENAI_BASE_URL = llm.base_url
+        config.MODEL_NAME = "gpt-4o"
+        manager = JobManager(api_key="fake-key", workers=workers)
+        service = ServiceServer(manager, port=0)
+        threading.Thread(target=service.serve_forever, daemon=True).start()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            latencies = list(pool.map(lambda _: run_job(service.url, word_limit, versions, 0.01), range(jobs)))
+        elapsed = time.perf_counter() - start
+
+        service.shutdown()
+        service.server_close()
+        manager.shutdown()
+
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            "jobs": jobs,
+            "workers": workers,
+            "clients": clients,
+            "llm_latency": llm_latency,
+            "llm_requests": llm.requests,
+            "seconds": round(elapsed, 3),
+            "jobs_per_minute": round(jobs / elapsed * 60, 1),
+            "latency_p50": round(quantiles[49], 3),
+            "latency_p95": round(quantiles[94], 3),
+            "latency_max": round(max(latencies), 3)
+        }
+
+
+def main():
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=8, help="Service worker pool size")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent submitting clients")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM seconds per request")
+    parser.add_argument("--word-limit", type=int, default=300)
+    parser.add_argument("--versions", type=int, default=3)
+    args = parser.parse_args()
+
+    report = run(args.jobs, args.workers, args.clients, args.llm_latency, args.word_limit, args.versions)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Run the benchmark suite and write the results to JSON for comparing commits.
+
+Runs the CPU path benchmark and the end-to-end pipeline benchmark against
+the fake LLM server, and saves both with the commit, Python version and
+machine they ran on. With --compare, prints how the key numbers changed
+against an earlier results file.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --quick --compare benchmarks/results/<commit>.json
+"""
+import os
+import json
+import platform
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+import bench_cpu
+import bench_pipeline
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, with a marker for local changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def key_metrics(report: dict) -> dict:
+    """Flatten the numbers worth comparing between runs."""
+    metrics = {}
+    for sweep, rows in report["pipeline"]["sweeps"].items():
+        for row in rows:
+            name = f"pipeline.{sweep}.v{row['versions']}.c{row['concurrency']}.w{row['word_limit']}"
+            metrics[f"{name}.sections_per_minute"] = row["sections_per_minute"]
+            metrics[f"{name}.p95"] = row["section_latency"]["p95"]
+    for row in report["cpu"]["results"]:
+        for path, timing in row.items():
+            if isinstance(timing, dict):
+                metrics[f"cpu.w{row['words']}.{path}.p50"] = timing["p50"]
+    return metrics
+
+
+def compare(report: dict, baseline: dict):
+    """Print the relative change of every metric present in both reports."""
+    current, previous = key_metrics(report), key_metrics(baseline)
+    print(f"Comparing {report['meta']['commit']} with {baseline['meta']['commit']}")
+    for name in sorted(current.keys() & previous.keys()):
+        if previous[name]:
+            change = (current[name] - previous[name]) / previous[name] * 100
+            print(f"  {name:<60} {previous[name]:>12.6g} -> {current[name]:>12.6g} ({change:+.1f}%)")
+
+
+def main():
+    """Run the suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Smaller sweeps for a fast check")
+    parser.add_argument("--llm-latency", default="0.05", help="Fake LLM latency in seconds or a distribution spec")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if args.quick:
+        pipeline = bench_pipeline.run(args.llm_latency, 0.0, 2, [1, 3, 10], [1, 4], [250, 1000])
+        cpu = bench_cpu.run([250, 1000], 20)
+    else:
+        pipeline = bench_pipeline.run(args.llm_latency, 0.0, 4, list(range(1, 11)), [1, 2, 4, 8], [250, 500, 1000, 2000])
+        cpu = bench_cpu.run([250, 1000, 5000], 50)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick
+        },
+        "pipeline": pipeline,
+        "cpu": cpu
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
 """Citation editor module for adding citations to content."""
-from .models import Citation, CitedContent
-from .editor import add_citations
+from .models import Citation, CitedContent, Claim
 
-__all__ = ['add_citations', 'Citation', 'CitedContent'] 
\ No newline at end of file
+def __getattr__(name):
+    """Import the editor, and with it the OpenAI client, only when it is used."""
+    if name in ('add_citations', 'aadd_citations'):
+        from . import editor
+        return getattr(editor, name)
+    if name in ('cite_claims', 'acite_claims', 'detect_claims'):
+        from . import claims
+        return getattr(claims, name)
+    if name in ('revise_and_cite', 'arevise_and_cite'):
+        from . import fused
+        return getattr(fused, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['add_citations', 'aadd_citations', 'revise_and_cite', 'arevise_and_cite', 'cite_claims', 'acite_claims', 'detect_claims', 'Citation', 'CitedContent', 'Claim'] 
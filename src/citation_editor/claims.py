@@ -0,0 +1,239 @@
+"""Local detection of sentences that need citations, so only those go to the model."""
+from typing import List, Dict, Optional, Tuple
+import re
+
+from .models import Citation, CitedContent, Claim
+from ..revision_agent.models import RevisionChange
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, run_stage, arun_stage, response_text
+
+# Output tokens of one "N | Reason: ..." line
+CLAIM_REASON_TOKENS = 20
+
+# Signals that a sentence states something a reader would want a source for
+CLAIM_PATTERNS = {
+    "quantitative": re.compile(
+        r'\b\d+(?:\.\d+)?\s*(?:%|percent\b|-?fold\b|times\b|nm\b|μm\b|mm\b|mg\b|mL\b|K\b|°C|eV\b)'
+        # Multi-digit numbers, except years
+        r'|\b(?!(?:19|20)\d\d\b)\d{2,}(?:\.\d+)?\b'
+    ),
+    "comparative": re.compile(
+        r'\b(?!(?:rather|other)\b)(?:\w+er|more|less|fewer|better|worse)\s+than\b'
+        r'|\b(?:outperform\w*|superior|inferior|compared (?:to|with)|in contrast to)\b'
+        r'|\b(?:increas|decreas|improv|reduc|enhanc)(?:e|es|ed|ing)\b',
+        re.I
+    ),
+    "evidence": re.compile(
+        r'\b(?:stud(?:y|ies)|research|evidence|literature|previous(?:ly)?|prior work|reported|'
+        r'(?:has|have) been (?:shown|demonstrated|reported|used)|(?:show[sn]?|showed|demonstrate[sd]?|found)\s+that|'
+        r'according to|widely|commonly|well[- ]known|well[- ]established|extensively)\b',
+        re.I
+    ),
+    # A capitalised or acronym name before a method noun; a bare acronym such as DNA is not a method
+    "named_method": re.compile(
+        r"\b(?!(?:The|This|That|These|Those|Our|Their|Its|Each|Every|Such|Both|A|An|In|We)\b)"
+        r"[A-Z][A-Za-z0-9-]*(?:['’]s)?\s+(?:[a-z]+\s+)?(?:method|algorithm|optimization|model|theory|equation|approximation|process|law)\b"
+    ),
+}
+
+# Sentences starting like this lean on the one before, which is sent along as context
+_DEPENDENT_START = re.compile(r'^(?:This|These|That|Those|It|They|Such|However|Moreover|Furthermore|In addition)\b')
+_BOUNDARY = re.compile(r'[.!?]+(?=\s|$)')
+# Abbreviations whose full stop does not end a sentence, matched against the text before the stop
+_ABBREVIATION = re.compile(
+    r'(?:\bet al|\be\.g|\bi\.e|\bcf|\bvs|\bapprox|\bca|\bresp|\b(?:Fig|Figs|Eq|Eqs|Ref|Refs|Sec|Tab|No|Dr|Prof))$'
+)
+_PARAGRAPH = re.compile(r'\S(?:.*?\S)?(?=\n\s*\n|\s*$)', re.S)
+_REASON_LINE = re.compile(r'^\s*(\d+)\s*[.:)]?\s*\|\s*(?:Reason:\s*)?(.+?)\s*$')
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Start and end offsets of the sentences of a paragraph, skipping full stops of abbreviations."""
+    spans = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        if match.group() == "." and _ABBREVIATION.search(text, start, match.start()):
+            continue
+        # A sentence does not go on in lower case
+        if text[match.end():].lstrip()[:1].islower():
+            continue
+        spans.append((start, match.end()))
+        start = match.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+def split_sentences(content: str) -> List[Claim]:
+    """
+    Split content into its sentences, keeping their position in the text.
+
+    Args:
+        content: Content to split
+
+    Returns:
+        List[Claim]: Every sentence, with no signals
+    """
+    sentences = []
+    for p, paragraph in enumerate(_PARAGRAPH.finditer(content), start=1):
+        s = 0
+        for begin, end in _sentence_spans(paragraph.group()):
+            raw = paragraph.group()[begin:end]
+            text = raw.strip()
+            if not text:
+                continue
+            s += 1
+            start = paragraph.start() + begin + (len(raw) - len(raw.lstrip()))
+            sentences.append(Claim(paragraph=p, sentence=s, text=text, start=start, end=start + len(text), signals=[]))
+    return sentences
+
+def detect_claims(content: str) -> List[Claim]:
+    """
+    Flag the sentences likely to need a citation.
+
+    A sentence is flagged when it contains a quantitative statement, a
+    comparison, an appeal to prior work or evidence, or a named method.
+
+    Args:
+        content: Content to scan
+
+    Returns:
+        List[Claim]: Flagged sentences, in text order, with the signals found
+    """
+    claims = []
+    for sentence in split_sentences(content):
+        signals = [name for name, pattern in CLAIM_PATTERNS.items() if pattern.search(sentence.text)]
+        if signals:
+            claims.append(sentence.model_copy(update={"signals": signals}))
+    return claims
+
+def create_claim_citation_messages(content: str, claims: List[Claim]) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking why each flagged sentence needs a citation.
+
+    Only the flagged sentences are sent, each preceded by the sentence before
+    it when it starts with a reference to it ("This", "However", ...).
+
+    Args:
+        content: Content the claims were found in
+        claims: Flagged sentences
+
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    sentences = split_sentences(content)
+    previous = {(s.paragraph, s.sentence): sentences[i - 1].text for i, s in enumerate(sentences) if i > 0}
+    lines = []
+    for i, claim in enumerate(claims, start=1):
+        context = previous.get((claim.paragraph, claim.sentence)) if _DEPENDENT_START.match(claim.text) else None
+        lines.append(f"{i}. {claim.text}" + (f"\n   (after: {context})" if context else ""))
+    numbered = "\n".join(lines)
+
+    prompt = f"""These sentences come from an academic text. For each sentence that needs a citation to support it, give the reason in a few words.
+
+Flagged sentences:
+
+{numbered}
+
+Reply with one line per sentence that needs a citation, in this exact format, and leave out sentences that do not:
+
+1 | Reason: [Why this sentence needs a citation]
+3 | Reason: [Why this sentence needs a citation]"""
+
+    return [
+        {"role": "system", "content": "You are an expert academic citation editor. Decide which statements need academic support and say briefly why. Reply only in the requested format."},
+        {"role": "user", "content": prompt}
+    ]
+
+def insert_citations(content: str, claims: List[Claim], reasons: Dict[int, str]) -> CitedContent:
+    """
+    Insert citation reasons after the sentences they belong to.
+
+    Args:
+        content: Content to add citations to
+        claims: Flagged sentences, numbered from 1 in the prompt
+        reasons: Citation reason per claim number
+
+    Returns:
+        CitedContent: Content with a bracketed reason after each cited sentence
+    """
+    citations = []
+    citation_changes = []
+    cited_content = content
+    # Insert from the end so earlier offsets stay valid
+    for number in sorted(reasons, reverse=True):
+        claim, reason = claims[number - 1], reasons[number]
+        cited_content = f"{cited_content[:claim.end]} [{reason}]{cited_content[claim.end:]}"
+    for number in sorted(reasons):
+        claim, reason = claims[number - 1], reasons[number]
+        location = f"Paragraph {claim.paragraph}, sentence {claim.sentence}"
+        citations.append(Citation(text=f"[{reason}]", source="Citation reason", location=location, reason=reason))
+        citation_changes.append(RevisionChange(type="citation", location=location, change=f"Added citation reason: {reason}"))
+
+    return CitedContent(
+        original_content=content,
+        cited_content=cited_content,
+        citations=citations,
+        citation_changes=citation_changes,
+        citation_summary=f"Added {len(citations)} citation reasons to the {len(claims)} sentences flagged as claims."
+    )
+
+def claim_citations_from_response(content: str, claims: List[Claim], response_text: str) -> CitedContent:
+    """
+    Parse a claim citation response.
+
+    Args:
+        content: Content the claims were found in
+        claims: Flagged sentences that were sent
+        response_text: Model output with "N | Reason: ..." lines
+
+    Returns:
+        CitedContent: Content with citations added
+
+    Raises:
+        OutputRejected: If no reason could be matched to a claim; carries the uncited content
+    """
+    reasons = {}
+    for line in response_text.split("\n"):
+        match = _REASON_LINE.match(line)
+        if match and 1 <= int(match.group(1)) <= len(claims):
+            reasons[int(match.group(1))] = match.group(2).strip("[] ")
+    cited = insert_citations(content, claims, reasons)
+    if not reasons:
+        raise OutputRejected("no citation reasons matched a flagged sentence", cited)
+    return cited
+
+def cite_claims_steps(content: str):
+    """Steps of citing the flagged claims of content, per model (see utils.stage)."""
+    claims = detect_claims(content)
+    messages = create_claim_citation_messages(content, claims) if claims else []
+
+    def steps(model: str):
+        if not claims:
+            return insert_citations(content, claims, {})
+        response = yield Request("cite_claims", messages, {"model": model, "max_tokens": CLAIM_REASON_TOKENS * len(claims)})
+        return claim_citations_from_response(content, claims, response_text(response))
+
+    return steps
+
+def cite_claims(content: str, api_key: str, model: Optional[str] = None) -> CitedContent:
+    """
+    Add citation reasons to the sentences the local claim detector flags.
+
+    Unlike add_citations, the model sees only the flagged sentences and
+    answers with one short reason per citation, capped at
+    CLAIM_REASON_TOKENS per sentence; the reasons are inserted into the
+    text locally.
+
+    Args:
+        content: Content to add citations to
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+
+    Returns:
+        CitedContent: Content with citations added
+    """
+    return run_stage("cite_claims", cite_claims_steps(content), chat_completion, api_key, model)
+
+async def acite_claims(content: str, api_key: str, model: Optional[str] = None) -> CitedContent:
+    """Async counterpart of cite_claims."""
+    return await arun_stage("cite_claims", cite_claims_steps(content), achat_completion, api_key, model)
@@ -1,24 +1,21 @@
-from typing import List, Dict
-from openai import OpenAI
+from typing import List, Dict, Optional, Tuple
 from .models import Citation, CitedContent
 from ..revision_agent.models import RevisionChange
-from .. import config
-from ..utils.cost_tracker import cost_tracker
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, run_stage, arun_stage, response_text
 import re
 
-def add_citations(content: str, api_key: str) -> CitedContent:
+def create_citation_messages(content: str) -> List[Dict[str, str]]:
     """
-    Add academic citations to the content.
+    Build the chat messages asking for citation reasons in content.
     
     Args:
         content: Content to add citations to
-        api_key: OpenAI API key
         
     Returns:
-        CitedContent: Content with citations added
+        List[Dict[str, str]]: System and user messages
     """
-    client = OpenAI(api_key=api_key)
-    
     # Calculate original word count
     word_count = len(re.findall(r'\b\w+\b', content))
     
@@ -54,27 +51,64 @@ Before submitting your response, you MUST:
    - Each paragraph maintains its original length and scope
    - All key points and arguments are preserved
    - Technical terms and concepts are accurately represented"""
+    
+    return [
+        {"role": "system", "content": "You are an expert academic citation editor. Your task is to add citation reasons throughout ALL paragraphs of the text, not just the beginning. Add reasons in square brackets to indicate where citations would be helpful. Ensure EVERY paragraph has at least one citation reason. Do NOT truncate or shorten the text."},
+        {"role": "user", "content": prompt}
+    ]
 
-    response = client.chat.completions.create(
-        messages=[
-            {"role": "system", "content": "You are an expert academic citation editor. Your task is to add citation reasons throughout ALL paragraphs of the text, not just the beginning. Add reasons in square brackets to indicate where citations would be helpful. Ensure EVERY paragraph has at least one citation reason. Do NOT truncate or shorten the text."},
-            {"role": "user", "content": prompt}
-        ],
-        model=config.MODEL_NAME,
-        temperature=config.TEMPERATURE,
-        max_tokens=config.MAX_TOKENS
-    )
+def parse_citations(citations_text: str) -> Tuple[List[Citation], List[RevisionChange]]:
+    """
+    Parse numbered "Location: ... | Reason: ..." lines into citations.
     
-    # Track costs
-    cost_tracker.add_call(
-        model=config.MODEL_NAME,
-        input_tokens=response.usage.prompt_tokens,
-        output_tokens=response.usage.completion_tokens,
-        operation="add_citations"
-    )
+    Args:
+        citations_text: Lines listing the citations, without their heading
+        
+    Returns:
+        Tuple[List[Citation], List[RevisionChange]]: The citations and the
+            change recorded for each
+    """
+    citations = []
+    citation_changes = []
+    for line in citations_text.strip().split("\n"):
+        if not line.strip() or "|" not in line:
+            continue
+            
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) < 2:
+            continue
+            
+        location = parts[0].replace("Location:", "").strip()
+        reason = parts[1].replace("Reason:", "").strip()
+        
+        citations.append(Citation(
+            text=f"[{reason}]",
+            source="Citation reason",
+            location=location,
+            reason=reason
+        ))
+        
+        citation_changes.append(RevisionChange(
+            type="citation",
+            location=location,
+            change=f"Added citation reason: {reason}"
+        ))
+    return citations, citation_changes
+
+def citations_from_response(content: str, response_text: str) -> CitedContent:
+    """
+    Parse a citation response.
     
-    # Parse response
-    response_text = response.choices[0].message.content
+    Args:
+        content: Content citations were added to
+        response_text: Model output with "Cited content:" and "Citations:" sections
+        
+    Returns:
+        CitedContent: Content with citations added
+        
+    Raises:
+        OutputRejected: If no cited content or citations were found; carries the best-effort result
+    """
     sections = response_text.split("\n\n")
     
     cited_content = ""
@@ -85,30 +119,9 @@ Before submitting your response, you MUST:
         if section.startswith("Cited content:"):
             cited_content = section.replace("Cited content:", "").strip()
         elif section.startswith("Citations:"):
-            citation_lines = section.replace("Citations:", "").strip().split("\n")
-            for line in citation_lines:
-                if not line.strip() or "|" not in line:
-                    continue
-                    
-                parts = [p.strip() for p in line.split("|")]
-                if len(parts) < 2:
-                    continue
-                    
-                location = parts[0].replace("Location:", "").strip()
-                reason = parts[1].replace("Reason:", "").strip()
-                
-                citations.append(Citation(
-                    text=f"[{reason}]",
-                    source="Citation reason",
-                    location=location,
-                    reason=reason
-                ))
-                
-                citation_changes.append(RevisionChange(
-                    type="citation",
-                    location=location,
-                    change=f"Added citation reason: {reason}"
-                ))
+            citations, citation_changes = parse_citations(section.replace("Citations:", ""))
+    
+    rejected = not cited_content.strip() or not citations
     
     # If no cited content was found or it's empty, use original content
     if not cited_content or not cited_content.strip():
@@ -130,10 +143,44 @@ Before submitting your response, you MUST:
     
     citation_summary = f"Added {len(citations)} citation reasons to indicate where academic support is needed throughout the text while preserving the full content."
     
-    return CitedContent(
+    result = CitedContent(
         original_content=content,
         cited_content=cited_content,
         citations=citations,
         citation_changes=citation_changes,
         citation_summary=citation_summary
-    ) 
\ No newline at end of file
+    )
+    if rejected:
+        raise OutputRejected("no cited content or citations found", result)
+    return result
+
+def citation_steps(content: str):
+    """Steps of adding citations to content, per model (see utils.stage)."""
+    messages = create_citation_messages(content)
+    
+    def steps(model: str):
+        response = yield Request("add_citations", messages, {"model": model})
+        return citations_from_response(content, response_text(response))
+    
+    return steps
+
+def add_citations(content: str, api_key: str, model: Optional[str] = None) -> CitedContent:
+    """
+    Add academic citations to the content.
+    
+    Unless a model is given, citations come from the model router and are
+    escalated to a stronger model when no cited content or citations could be parsed.
+    
+    Args:
+        content: Content to add citations to
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+        
+    Returns:
+        CitedContent: Content with citations added
+    """
+    return run_stage("add_citations", citation_steps(content), chat_completion, api_key, model)
+
+async def aadd_citations(content: str, api_key: str, model: Optional[str] = None) -> CitedContent:
+    """Async counterpart of add_citations."""
+    return await arun_stage("add_citations", citation_steps(content), achat_completion, api_key, model)
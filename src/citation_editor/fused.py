@@ -0,0 +1,159 @@
+from typing import List, Dict, Optional, Tuple
+from .models import CitedContent
+from .editor import parse_citations
+from ..revision_agent.models import RevisedContent, RevisionChange
+from ..revision_agent.agent import parse_revision_changes
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, run_stage, arun_stage, response_text
+import re
+
+_HEADINGS = re.compile(r'^(Revised and cited content|Revision changes|Citations):', re.M)
+# Citation reasons are marked "[Citation: ...]" so existing references such as [12] are left alone
+_CITATION_MARKER = re.compile(r'([ \t]*)\[Citation:\s*([^\]\n]*?)\s*\]')
+
+def create_revise_and_cite_messages(content: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking for a revision with citation reasons in one pass.
+    
+    Args:
+        content: Content to revise and add citations to
+    
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    # Calculate original word count
+    word_count = len(re.findall(r'\b\w+\b', content))
+    
+    prompt = f"""Revise this academic text for clarity, coherence, and academic style, and add citation reasons to it in the same pass.
+Make specific improvements to enhance:
+1. Clarity - Clear writing and well-explained concepts
+2. Coherence - Logical flow and smooth transitions
+3. Academic Style - Formal tone and appropriate vocabulary
+
+Add citation reasons as [Citation: Reason for citation] at the points of the revised text that need academic support, throughout ALL paragraphs. Keep existing references such as [12] exactly as they are.
+
+CRITICAL REQUIREMENT: The revised text MUST maintain EXACTLY {word_count} words (±10 words), not counting the [Citation: ...] reasons.
+You MUST preserve the ENTIRE content. Do NOT shorten or truncate the text.
+Make targeted improvements to specific sentences or phrases while keeping the overall structure and length intact.
+
+Original text:
+
+{content}
+
+Provide your response in this format:
+
+Revised and cited content:
+[The complete revised text with [Citation: ...] reasons - MUST include ALL paragraphs]
+
+Revision changes:
+1. [Location]: [What was changed and why]
+2. [Location]: [What was changed and why]
+[etc.]
+
+Citations:
+1. Location: [Where in text] | Reason: [Why this part needs a citation]
+2. Location: [Where in text] | Reason: [Why this part needs a citation]
+[etc.]
+
+Before submitting your response, verify that:
+- The revised content includes ALL paragraphs from the original text
+- Every paragraph has at least one [Citation: ...] reason
+- All key points, technical terms and existing references are preserved"""
+    
+    return [
+        {"role": "system", "content": "You are an expert academic editor and citation editor. Improve clarity, coherence, and academic style while preserving the FULL content and EXACT word count, and mark with [Citation: ...] where citations are needed throughout ALL paragraphs."},
+        {"role": "user", "content": prompt}
+    ]
+
+def revision_and_citations_from_response(content: str, response_text: str) -> Tuple[RevisedContent, CitedContent]:
+    """
+    Parse a fused revision and citation response.
+    
+    The revised text is the cited text with its marked citation reasons
+    removed, so both results describe the same revision. Other bracketed
+    text, such as the draft's references, is kept. In the cited text the
+    markers become plain [reason] brackets, as add_citations writes them.
+    
+    Args:
+        content: Content that was revised
+        response_text: Model output with "Revised and cited content:",
+            "Revision changes:" and "Citations:" sections
+    
+    Returns:
+        Tuple[RevisedContent, CitedContent]: The revision, and the revised
+            text with citations added
+    
+    Raises:
+        OutputRejected: If no cited content or citations were found; carries the best-effort results
+    """
+    parts = _HEADINGS.split(response_text)
+    sections = dict(zip(parts[1::2], (part.strip() for part in parts[2::2])))
+    
+    marked_content = sections.get("Revised and cited content", "")
+    revision_changes = parse_revision_changes(sections.get("Revision changes", ""))
+    citations, citation_changes = parse_citations(sections.get("Citations", ""))
+    
+    rejected = not marked_content or not citations
+    
+    # If no content was found, keep the original text
+    if not marked_content:
+        marked_content = content
+    revised_content = _CITATION_MARKER.sub("", marked_content).strip() or content
+    cited_content = _CITATION_MARKER.sub(r"\1[\2]", marked_content)
+    
+    if not revision_changes:
+        revision_changes.append(RevisionChange(
+            type="revision",
+            location="General",
+            change="No specific changes were needed; the text was already well-written."
+        ))
+    
+    revised = RevisedContent(
+        original_content=content,
+        revised_content=revised_content,
+        revision_changes=revision_changes,
+        revision_summary=f"Made {len(revision_changes)} revisions to improve clarity, coherence, and style while preserving the full content."
+    )
+    cited = CitedContent(
+        original_content=revised_content,
+        cited_content=cited_content,
+        citations=citations,
+        citation_changes=citation_changes,
+        citation_summary=f"Added {len(citations)} citation reasons to indicate where academic support is needed throughout the text while preserving the full content."
+    )
+    if rejected:
+        raise OutputRejected("no cited content or citations found", (revised, cited))
+    return revised, cited
+
+def revise_and_cite_steps(content: str):
+    """Steps of revising content and adding its citations in one call, per model (see utils.stage)."""
+    messages = create_revise_and_cite_messages(content)
+    
+    def steps(model: str):
+        response = yield Request("revise_and_cite", messages, {"model": model})
+        return revision_and_citations_from_response(content, response_text(response))
+    
+    return steps
+
+def revise_and_cite(content: str, api_key: str, model: Optional[str] = None) -> Tuple[RevisedContent, CitedContent]:
+    """
+    Revise the content and add citation reasons in a single call.
+    
+    Replaces revise_content followed by add_citations, which send the full
+    text twice and wait for it to be written out twice.
+    
+    Args:
+        content: Content to revise and add citations to
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+    
+    Returns:
+        Tuple[RevisedContent, CitedContent]: The revision, and the revised
+            text with citations added
+    """
+    return run_stage("revise_and_cite", revise_and_cite_steps(content), chat_completion, api_key, model)
+
+async def arevise_and_cite(content: str, api_key: str, model: Optional[str] = None) -> Tuple[RevisedContent, CitedContent]:
+    """Async counterpart of revise_and_cite."""
+    return await arun_stage("revise_and_cite", revise_and_cite_steps(content), achat_completion, api_key, model)
@@ -16,4 +16,13 @@ class CitedContent(BaseModel):
     cited_content: str
     citations: List[Citation]
     citation_changes: List[RevisionChange]
-    citation_summary: str 
\ No newline at end of file
+    citation_summary: str 
+
+class Claim(BaseModel):
+    """Model for a sentence flagged as likely to need a citation."""
+    paragraph: int
+    sentence: int
+    text: str
+    start: int
+    end: int
+    signals: List[str]
@@ -0,0 +1,236 @@
+"""Command line interface for the journal writer.
+
+Run from the repository root with `python -m src.cli --help`; the project is
+not installed as a package, so there is no `journal-writer` executable. The
+interface is built on argparse, and heavy dependencies (the OpenAI client,
+pydantic models, dotenv) are imported inside the commands that need them, so
+that `--help` and local-only commands start quickly.
+"""
+from typing import List, Optional
+import argparse
+import sys
+
+SINKS_HELP = "Output sinks to write: json, jsonl, markdown, latex (repeatable)"
+
+
+def _save_costs(output_dir: str, run_id: str) -> str:
+    """Save the cost history of this run next to its output."""
+    from pathlib import Path
+    from .utils.cost_tracker import cost_tracker
+
+    path = Path(output_dir) / f"costs_{run_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cost_tracker.save(str(path))
+    return str(path)
+
+
+def run(args: argparse.Namespace):
+    """Run one section through the full pipeline."""
+    import json
+    from . import config
+    from .input_handler import ContentInput
+    from .pipeline import run_section
+    from .publisher import create_sinks, write_outputs, new_run_id
+    from .utils.cost_tracker import cost_tracker
+
+    config.validate_config()
+    if args.max_cost is not None:
+        config.MAX_COST_PER_SECTION = args.max_cost
+    if args.timeout is not None:
+        config.SECTION_TIMEOUT = args.timeout
+    with open(args.input_file, encoding="utf-8") as f:
+        section_input = ContentInput.from_dict(json.load(f))
+
+    run_id = new_run_id()
+    published = run_section(section_input, config.OPENAI_API_KEY, num_versions=args.versions)
+    paths = write_outputs(published, create_sinks(args.sink or ["json"], args.output_dir, fast=True), run_id=run_id)
+
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+    print(f"Valid: {published.validation.is_valid}")
+    print(f"Costs: {_save_costs(args.output_dir, run_id)}")
+    cost_tracker.print_summary()
+
+
+def batch(args: argparse.Namespace):
+    """Run many sections and append the results to a JSON Lines file."""
+    import json
+    from . import config
+    from .input_handler import ContentInput
+    from .pipeline import run_batch
+    from .publisher import JSONLSink, new_run_id
+    from .utils.budget import BudgetExceeded
+    from .utils.deadline import DeadlineExceeded
+    from .utils.cost_tracker import cost_tracker
+
+    config.validate_config()
+    if args.max_cost is not None:
+        config.MAX_COST_PER_RUN = args.max_cost
+    if args.timeout is not None:
+        config.JOB_TIMEOUT = args.timeout
+    if args.adaptive_concurrency:
+        config.ADAPTIVE_CONCURRENCY = True
+    with open(args.input_file, encoding="utf-8") as f:
+        section_inputs = [ContentInput.from_dict(json.loads(line)) for line in f if line.strip()]
+
+    run_id = new_run_id()
+    sink = JSONLSink(args.output_dir, fast=True, filename=f"batch_{run_id}.jsonl", compress=args.compress)
+    count = 0
+    try:
+        for published in run_batch(section_inputs, config.OPENAI_API_KEY, num_versions=args.versions, concurrency=args.concurrency):
+            path = sink.write(published, f"{run_id}_{count}")
+            count += 1
+            print(f"[{count}/{len(section_inputs)}] {published.formatted_content['section']}: valid={published.validation.is_valid}")
+    except (BudgetExceeded, DeadlineExceeded) as e:
+        print(f"Stopped after {count} sections: {e}", file=sys.stderr)
+
+    if count:
+        print(f"Output: {path}")
+    if config.ADAPTIVE_CONCURRENCY:
+        from .utils.concurrency import get_limiter
+        limits = get_limiter().report()
+        print(f"Concurrency limit: {limits['limit']} (peak {limits['peak_limit']}, {limits['decreases']} cuts)")
+    print(f"Costs: {_save_costs(args.output_dir, run_id)}")
+    cost_tracker.print_summary()
+
+
+def publish(args: argparse.Namespace):
+    """Format and validate existing cited content without calling the API."""
+    import json
+    from .citation_editor.models import CitedContent
+    from .input_handler.content_input import ContentInput
+    from .publisher import create_sinks, write_outputs, publish_many
+
+    with open(args.input_file, encoding="utf-8") as f:
+        if args.input_file.endswith(".jsonl"):
+            contents = [CitedContent(**json.loads(line)) for line in f if line.strip()]
+        else:
+            contents = [CitedContent(**json.load(f))]
+
+    section_input = None
+    if args.section or args.word_limit:
+        section_input = ContentInput(section=args.section or "Introduction", keypoints=[], word_limit=args.word_limit or 1000)
+
+    sinks = create_sinks(args.sink or ["json"], args.output_dir, fast=True)
+    for published in publish_many(contents, workers=args.workers, section_inputs=[section_input] * len(contents)):
+        for name, path in write_outputs(published, sinks).items():
+            print(f"{name}: {path} (valid={published.validation.is_valid})")
+
+
+def export(args: argparse.Namespace):
+    """Convert a published JSON file to other output formats."""
+    from .publisher import create_sinks, write_outputs, load_published
+
+    published = load_published(args.input_file)
+    for name, path in write_outputs(published, create_sinks(args.sink or ["markdown"], args.output_dir)).items():
+        print(f"{name}: {path}")
+
+
+def cost_report(args: argparse.Namespace):
+    """Summarise the API costs of previous runs."""
+    from .utils.cost_tracker import CostTracker
+
+    CostTracker.load(args.cost_files).print_summary()
+
+
+def serve(args: argparse.Namespace):
+    """Run a long-lived service that queues section and paper jobs."""
+    from . import config
+    from .service import serve as serve_jobs
+
+    config.validate_config()
+    serve_jobs(args.host, args.port, args.workers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with every subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Generate, review, revise, cite and publish scientific article sections."
+    )
+    parser.add_argument("--record", help="Record every API exchange to this cassette file")
+    parser.add_argument("--replay", help="Serve API calls from this cassette file instead of the network")
+    parser.add_argument("--replay-latency", type=float, default=1.0,
+                        help="Multiplier for recorded latencies in replay mode (0 for none)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    def command(name, func):
+        """Register a subcommand, with the first line of its function's docstring as help."""
+        summary = func.__doc__.splitlines()[0]
+        subparser = commands.add_parser(name, help=summary, description=summary)
+        subparser.set_defaults(func=func)
+        return subparser
+
+    sub = command("run", run)
+    sub.add_argument("input_file", help="JSON file with section, keypoints and word_limit")
+    sub.add_argument("--versions", "-n", type=int, default=3, help="Number of drafts to generate")
+    sub.add_argument("--output-dir", "-o", default="output", help="Directory for output files")
+    sub.add_argument("--sink", "-s", action="append", help=SINKS_HELP + "; default: json")
+    sub.add_argument("--max-cost", type=float, help="Hard cap in USD for the section (default: MAX_COST_PER_SECTION)")
+    sub.add_argument("--timeout", type=float,
+                     help="Seconds for the section; partial results are published when it expires (default: SECTION_TIMEOUT)")
+
+    sub = command("batch", batch)
+    sub.add_argument("input_file", help="JSON Lines file with one section input per line")
+    sub.add_argument("--versions", "-n", type=int, default=3, help="Number of drafts to generate per section")
+    sub.add_argument("--concurrency", "-c", type=int, default=1, help="Sections processed at the same time")
+    sub.add_argument("--output-dir", "-o", default="output", help="Directory for output files")
+    sub.add_argument("--compress", action="store_true", help="Write gzip-compressed JSON Lines")
+    sub.add_argument("--max-cost", type=float, help="Hard cap in USD for the whole batch (default: MAX_COST_PER_RUN)")
+    sub.add_argument("--timeout", type=float, help="Seconds for the whole batch (default: JOB_TIMEOUT)")
+    sub.add_argument("--adaptive-concurrency", action="store_true",
+                     help="Adapt the number of API calls in flight to 429s and latency (AIMD)")
+
+    sub = command("publish", publish)
+    sub.add_argument("input_file", help="JSON file with cited content, or JSON Lines with one per line")
+    sub.add_argument("--section", help="Section type of the content")
+    sub.add_argument("--word-limit", type=int, help="Target word count")
+    sub.add_argument("--workers", "-w", type=int, default=1, help="Worker processes for JSON Lines input")
+    sub.add_argument("--output-dir", "-o", default="output", help="Directory for output files")
+    sub.add_argument("--sink", "-s", action="append", help=SINKS_HELP + "; default: json")
+
+    sub = command("export", export)
+    sub.add_argument("input_file", help="Published content JSON file")
+    sub.add_argument("--sink", "-s", action="append", help=SINKS_HELP + "; default: markdown")
+    sub.add_argument("--output-dir", "-o", default="output", help="Directory for output files")
+
+    sub = command("cost-report", cost_report)
+    sub.add_argument("cost_files", nargs="+", help="Cost history files saved by run or batch")
+
+    sub = command("serve", serve)
+    sub.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    sub.add_argument("--port", "-p", type=int, default=8080, help="Port to listen on")
+    sub.add_argument("--workers", "-w", type=int, default=4, help="Jobs run at the same time")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point for `python -m src.cli`.
+
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 0
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.record or args.replay:
+        from . import config
+
+        config.LLM_BACKEND = "record" if args.record else "replay"
+        config.CASSETTE_PATH = args.record or args.replay
+        config.REPLAY_LATENCY_SCALE = args.replay_latency
+
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
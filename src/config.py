@@ -1,28 +1,106 @@
-"""Configuration module for shared settings across the application."""
+"""Configuration module for shared settings across the application.
+
+Settings are loaded lazily: the .env file is read the first time a setting is
+accessed, so importing this module (and anything that imports it) stays cheap.
+"""
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+_loaded = False
+
+def _optional(convert, value):
+    """Convert an optional setting, keeping unset values as None."""
+    return convert(value) if value else None
+
+def load_config():
+    """
+    Load environment variables from .env file and populate the settings.
+    
+    Settings assigned before the first load (e.g. by tests or the CLI) are kept.
+    """
+    global _loaded
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    settings = {
+        # Model Configuration
+        'MODEL_NAME': os.getenv('MODEL_NAME', 'o1-2024-12-17'),  # Default to gpt-4 if not set
+        'TEMPERATURE': float(os.getenv('TEMPERATURE', '0.7')),  # Default to 0.7 if not set
+        'MAX_TOKENS': int(os.getenv('MAX_TOKENS', '200000')),  # Default to 200000 if not set
+        'CHEAP_MODEL_NAME': os.getenv('CHEAP_MODEL_NAME', 'gpt-4o-mini'),  # Model for drafts and screening reviews
+        'MODEL_ROUTING': os.getenv('MODEL_ROUTING', 'true').lower() in ('1', 'true', 'yes'),  # Route cheap stages to CHEAP_MODEL_NAME
+
+        # API Configuration
+        'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY'),
+        'OPENAI_BASE_URL': os.getenv('OPENAI_BASE_URL'),  # Default to the OpenAI API if not set
+        'LLM_ENDPOINTS': os.getenv('LLM_ENDPOINTS'),  # base_url|api_key|weight,... to spread requests over (see utils.client_pool)
+        'ENDPOINT_FAILURE_THRESHOLD': int(os.getenv('ENDPOINT_FAILURE_THRESHOLD', '3')),  # Consecutive failures that open an endpoint's circuit
+        'ENDPOINT_COOLDOWN': float(os.getenv('ENDPOINT_COOLDOWN', '30')),  # Seconds before an open circuit is probed again
+        'LLM_BACKEND': os.getenv('LLM_BACKEND', 'openai'),  # openai, record or replay
+        'CASSETTE_PATH': os.getenv('CASSETTE_PATH'),  # Cassette file for the record and replay backends
+        'REPLAY_LATENCY_SCALE': float(os.getenv('REPLAY_LATENCY_SCALE', '1.0')),  # 0 replays instantly
+
+        # Pipeline Configuration
+        'DEDUP_THRESHOLD': float(os.getenv('DEDUP_THRESHOLD', '0.9')),  # Jaccard similarity at which drafts are collapsed
+        'REVIEW_CHUNK_TOKENS': int(os.getenv('REVIEW_CHUNK_TOKENS', '6000')),  # Longer drafts are reviewed in chunks and the reviews merged
+        'STAGE_POLICY': os.getenv('STAGE_POLICY', 'false').lower() in ('1', 'true', 'yes'),  # Skip or shorten revision and citation per section
+        'CITE_CLAIMS_ONLY': os.getenv('CITE_CLAIMS_ONLY', 'false').lower() in ('1', 'true', 'yes'),  # Send only sentences flagged as claims to the citation stage
+        'POLICY_SKIP_SCORE': int(os.getenv('POLICY_SKIP_SCORE', '9')),  # Score on every criterion at which revision is skipped
+
+        # Concurrency Configuration
+        'ADAPTIVE_CONCURRENCY': os.getenv('ADAPTIVE_CONCURRENCY', 'false').lower() in ('1', 'true', 'yes'),  # Limit calls in flight with AIMD
+        'CONCURRENCY_INITIAL': int(os.getenv('CONCURRENCY_INITIAL', '4')),  # Calls in flight to start with
+        'CONCURRENCY_MIN': int(os.getenv('CONCURRENCY_MIN', '1')),
+        'CONCURRENCY_MAX': int(os.getenv('CONCURRENCY_MAX', '64')),
+
+        # Hedging Configuration
+        'HEDGE_REQUESTS': os.getenv('HEDGE_REQUESTS', 'false').lower() in ('1', 'true', 'yes'),  # Duplicate slow calls
+        'HEDGE_PERCENTILE': float(os.getenv('HEDGE_PERCENTILE', '95')),  # Stage latency percentile after which a call is duplicated
+        'HEDGE_MAX_FRACTION': float(os.getenv('HEDGE_MAX_FRACTION', '0.05')),  # Largest share of calls that may be duplicated
+        'HEDGE_MIN_SAMPLES': int(os.getenv('HEDGE_MIN_SAMPLES', '20')),  # Calls per stage and model seen before hedging
 
-# Model Configuration
-MODEL_NAME = os.getenv('MODEL_NAME', 'o1-2024-12-17')  # Default to gpt-4 if not set
-TEMPERATURE = float(os.getenv('TEMPERATURE', '0.7'))  # Default to 0.7 if not set
-MAX_TOKENS = int(os.getenv('MAX_TOKENS', '200000'))  # Default to 200000 if not set
+        # Deadline Configuration (unset means no limit)
+        'REQUEST_TIMEOUT': _optional(float, os.getenv('REQUEST_TIMEOUT')),  # Seconds per HTTP request (default: the client's)
+        'SECTION_TIMEOUT': _optional(float, os.getenv('SECTION_TIMEOUT')),  # Seconds per section
+        'JOB_TIMEOUT': _optional(float, os.getenv('JOB_TIMEOUT')),  # Seconds per paper job or batch
 
-# API Configuration
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+        # Service Configuration
+        'MAX_FINISHED_JOBS': int(os.getenv('MAX_FINISHED_JOBS', '1000')),  # Finished jobs the service keeps results for
+
+        # Budget Configuration (unset means no cap)
+        'MAX_COST_PER_SECTION': _optional(float, os.getenv('MAX_COST_PER_SECTION')),  # USD per section
+        'MAX_COST_PER_RUN': _optional(float, os.getenv('MAX_COST_PER_RUN')),  # USD per paper or batch
+        'MAX_TOKENS_PER_SECTION': _optional(int, os.getenv('MAX_TOKENS_PER_SECTION')),  # Input plus output tokens per section
+        'MAX_TOKENS_PER_RUN': _optional(int, os.getenv('MAX_TOKENS_PER_RUN')),  # Input plus output tokens per paper or batch
+    }
+    for name, value in settings.items():
+        globals().setdefault(name, value)
+
+    _loaded = True
+
+def __getattr__(name):
+    """Load the configuration on first access to a setting."""
+    if not _loaded and not name.startswith('__'):
+        load_config()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def validate_config():
     """Validate that all required configuration is present."""
-    if not OPENAI_API_KEY:
+    if not _loaded:
+        load_config()
+
+    # Replayed runs never reach the API
+    if not OPENAI_API_KEY and not LLM_ENDPOINTS and LLM_BACKEND != 'replay':
         raise ValueError("OPENAI_API_KEY environment variable is required")
-    
+
     if not MODEL_NAME:
         raise ValueError("MODEL_NAME environment variable is required")
-    
+
     if not TEMPERATURE:
         raise ValueError("TEMPERATURE environment variable is required")
-    
+
     if not MAX_TOKENS:
-        raise ValueError("MAX_TOKENS environment variable is required") 
\ No newline at end of file
+        raise ValueError("MAX_TOKENS environment variable is required")
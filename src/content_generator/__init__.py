@@ -1,12 +1,20 @@
 """Content generator module for creating content versions."""
-from .models import GeneratedContent
-from .generator import generate_content_version
+from .models import GeneratedContent, DeduplicationResult, DuplicateDraft
+from .dedup import deduplicate_versions
 
-def generate_content_versions(section_type: str, keypoints: list, word_limit: int, api_key: str, num_versions: int = 3) -> list:
-    """Generate multiple versions of content."""
-    return [
-        generate_content_version(section_type, keypoints, word_limit, api_key)
-        for _ in range(num_versions)
-    ]
+def __getattr__(name):
+    """Import the generator, and with it the OpenAI client, only when it is used."""
+    if name in ('generate_content_versions', 'generate_content_version', 'agenerate_content_versions'):
+        from . import generator
+        return getattr(generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['generate_content_versions', 'generate_content_version', 'GeneratedContent'] 
\ No newline at end of file
+__all__ = [
+    'generate_content_versions',
+    'generate_content_version',
+    'agenerate_content_versions',
+    'deduplicate_versions',
+    'GeneratedContent',
+    'DeduplicationResult',
+    'DuplicateDraft'
+]
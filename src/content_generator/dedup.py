@@ -0,0 +1,136 @@
+"""Near-duplicate detection for generated drafts using MinHash sketches."""
+from typing import Dict, List, Optional, Tuple, Set, FrozenSet
+from collections import defaultdict
+import hashlib
+import heapq
+import re
+
+from .models import GeneratedContent, DuplicateDraft, DeduplicationResult
+from .. import config
+
+_WORD = re.compile(r"\w+")
+
+# Number of minimum hashes kept per draft; the estimate's standard error is about 1/sqrt(SKETCH_SIZE)
+SKETCH_SIZE = 128
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+
+def _stable_hash(words) -> int:
+    """Hash a shingle to 64 bits, the same in every process (unlike the salted built-in hash)."""
+    return int.from_bytes(hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Hash the overlapping word n-grams of a text.
+
+    Hashes do not depend on the process, so deduplication decisions are the
+    same across runs, worker processes and recorded replays.
+
+    Args:
+        text: Text to shingle
+        size: Number of words per shingle
+
+    Returns:
+        Set[int]: Hashes of the shingles
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {_stable_hash(words)} if words else set()
+    return {_stable_hash(shingle) for shingle in zip(*(words[i:] for i in range(size)))}
+
+
+def minhash_signature(text: str, sketch_size: int = SKETCH_SIZE, shingle_size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """
+    Compute a bottom-k MinHash signature: the smallest shingle hashes of a text.
+
+    A single hash function with the k smallest values gives the same Jaccard
+    estimate as k independent permutations, at the cost of one hash per shingle.
+
+    Args:
+        text: Text to sketch
+        sketch_size: Number of minimum hashes to keep
+        shingle_size: Number of words per shingle
+
+    Returns:
+        FrozenSet[int]: The minimum hashes
+    """
+    return frozenset(heapq.nsmallest(sketch_size, shingles(text, shingle_size)))
+
+
+def estimate_jaccard(first: FrozenSet[int], second: FrozenSet[int], sketch_size: int = SKETCH_SIZE) -> float:
+    """
+    Estimate the Jaccard similarity of two texts from their signatures.
+
+    Args:
+        first: Signature of the first text
+        second: Signature of the second text
+        sketch_size: Sketch size used for both signatures
+
+    Returns:
+        float: Estimated Jaccard similarity between 0 and 1
+    """
+    if not first or not second:
+        return 0.0
+    union = heapq.nsmallest(sketch_size, first | second)
+    shared = sum(1 for h in union if h in first and h in second)
+    return shared / len(union)
+
+
+def deduplicate_versions(
+    versions: List[GeneratedContent],
+    threshold: Optional[float] = None,
+    sketch_size: int = SKETCH_SIZE
+) -> Tuple[List[GeneratedContent], DeduplicationResult]:
+    """
+    Collapse drafts that are near-duplicates of an earlier draft.
+
+    Each draft is compared against the drafts kept so far and dropped when its
+    estimated Jaccard similarity to one of them reaches the threshold. An
+    inverted index over signature hashes limits the exact estimate to drafts
+    sharing enough minimum hashes, so distinct drafts cost almost nothing to
+    compare and hundreds of drafts stay fast.
+
+    Args:
+        versions: Generated drafts, in generation order
+        threshold: Jaccard similarity at which drafts are collapsed (default: config.DEDUP_THRESHOLD)
+        sketch_size: Number of minimum hashes kept per draft
+
+    Returns:
+        Tuple[List[GeneratedContent], DeduplicationResult]: Kept drafts and the deduplication decisions
+    """
+    threshold = config.DEDUP_THRESHOLD if threshold is None else threshold
+    kept: List[int] = []
+    signatures: Dict[int, FrozenSet[int]] = {}
+    index_by_hash: Dict[int, List[int]] = defaultdict(list)
+    duplicates: List[DuplicateDraft] = []
+
+    for index, version in enumerate(versions):
+        signature = minhash_signature(version.content, sketch_size)
+
+        # The estimate can never exceed shared hashes / larger signature size
+        overlap: Dict[int, int] = defaultdict(int)
+        for h in signature:
+            for kept_index in index_by_hash.get(h, ()):
+                overlap[kept_index] += 1
+
+        best_index, best_similarity = None, 0.0
+        for kept_index, shared in overlap.items():
+            if shared < threshold * max(len(signature), len(signatures[kept_index])):
+                continue
+            similarity = estimate_jaccard(signature, signatures[kept_index], sketch_size)
+            if similarity > best_similarity:
+                best_index, best_similarity = kept_index, similarity
+
+        if best_index is not None and best_similarity >= threshold:
+            duplicates.append(DuplicateDraft(index=index, duplicate_of=best_index, similarity=round(best_similarity, 4)))
+        else:
+            kept.append(index)
+            signatures[index] = signature
+            for h in signature:
+                index_by_hash[h].append(index)
+
+    result = DeduplicationResult(threshold=threshold, kept=kept, duplicates=duplicates)
+    return [versions[i] for i in kept], result
@@ -1,29 +1,32 @@
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, Set, Optional
+from openai import BadRequestError
 from .models import GeneratedContent
 from .. import config
-from ..utils.cost_tracker import cost_tracker
+from ..publisher.validation import calculate_word_count
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, Calls, drive, adrive, run_stage, arun_stage, response_text
+from ..utils.deadline import DeadlineExceeded
 
-def generate_content(prompt: str, api_key: str) -> str:
+# Models that rejected or ignored the `n` parameter
+_N_UNSUPPORTED_MODELS: Set[str] = set()
+
+def _content_request(prompt: str, model: str, **params: Any) -> Request:
+    """Request for generated text from a prompt."""
+    return Request("generate_content", [{"role": "user", "content": prompt}], {"model": model, **params})
+
+def _content_steps(prompt: str, model: str):
+    """Steps of generating text from a prompt (see utils.stage)."""
+    response = yield _content_request(prompt, model)
+    return response_text(response)
+
+def generate_content(prompt: str, api_key: str, model: Optional[str] = None) -> str:
     """Generate content using OpenAI API."""
-    client = OpenAI(api_key=api_key)
-    
-    response = client.chat.completions.create(
-        messages=[{"role": "user", "content": prompt}],
-        model=config.MODEL_NAME,
-        temperature=config.TEMPERATURE,
-        max_tokens=config.MAX_TOKENS
-    )
-    
-    # Track costs
-    cost_tracker.add_call(
-        model=config.MODEL_NAME,
-        input_tokens=response.usage.prompt_tokens,
-        output_tokens=response.usage.completion_tokens,
-        operation="generate_content"
-    )
-    
-    return response.choices[0].message.content
+    return drive(_content_steps(prompt, model or config.MODEL_NAME), chat_completion, api_key)
+
+async def agenerate_content(prompt: str, api_key: str, model: Optional[str] = None) -> str:
+    """Generate content using OpenAI API without blocking the event loop."""
+    return await adrive(_content_steps(prompt, model or config.MODEL_NAME), achat_completion, api_key)
 
 def create_prompt(section_type: str, keypoints: List[str], word_limit: int) -> str:
     """Create a prompt for content generation."""
@@ -65,37 +68,118 @@ Before submitting your response, you MUST:
 IMPORTANT: Include the word count at the end of your response in parentheses."""
     return prompt
 
-def generate_content_version(section_type: str, keypoints: List[str], word_limit: int, api_key: str) -> GeneratedContent:
-    """Generate a single version of content."""
-    prompt = create_prompt(section_type, keypoints, word_limit)
-    content = generate_content(prompt, api_key)
-    
+def _to_generated_content(content: str, section_type: str, word_limit: int, model: str, **params: Any) -> GeneratedContent:
+    """Wrap generated text in a GeneratedContent."""
     return GeneratedContent(
         content=content,
         section=section_type,
         word_limit=word_limit,
         generation_params={
-            "model": config.MODEL_NAME,
+            "model": model,
             "temperature": config.TEMPERATURE,
-            "max_tokens": config.MAX_TOKENS
+            "max_tokens": config.MAX_TOKENS,
+            **params
         }
-    ) 
+    )
 
-def generate_content_versions(section_type: str, keypoints: List[str], word_limit: int, api_key: str) -> List[GeneratedContent]:
+def _choices_to_versions(response, section_type: str, word_limit: int, model: str, num_versions: int) -> List[GeneratedContent]:
+    """Wrap each choice of a multi-choice response in a GeneratedContent."""
+    return [
+        _to_generated_content(choice.message.content, section_type, word_limit, model, n=num_versions, choice_index=choice.index)
+        for choice in response.choices
+    ]
+
+def _validate_drafts(versions: List[GeneratedContent], word_limit: int) -> List[GeneratedContent]:
+    """Reject the drafts when none of them meets the word count requirement of the prompt."""
+    low, high = int(word_limit * 0.7), int(word_limit * 1.1)
+    if any(low <= calculate_word_count(version.content) <= high for version in versions):
+        return versions
+    raise OutputRejected(f"no draft between {low} and {high} words", versions)
+
+def _concurrent_steps(prompt: str, section_type: str, word_limit: int, num_versions: int, model: str):
+    """
+    Steps of generating versions with one request each, sent concurrently.
+    
+    When the deadline expires, the drafts that finished in time are kept.
+    """
+    if num_versions <= 0:
+        return []
+    results = yield Calls([_content_request(prompt, model) for _ in range(num_versions)])
+    versions = [
+        _to_generated_content(response_text(result), section_type, word_limit, model)
+        for result in results if not isinstance(result, BaseException)
+    ]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for error in errors:
+        if not isinstance(error, DeadlineExceeded) or not versions:
+            raise error
+    if errors:
+        print(f"Warning: deadline expired after {len(versions)} of {num_versions} drafts")
+    return versions
+
+def versions_steps(section_type: str, keypoints: List[str], word_limit: int, num_versions: int, use_n: bool):
+    """
+    Steps of generating versions, per model (see utils.stage).
+    
+    The versions are requested as the choices of one request when the model
+    supports `n`, and with concurrent single requests otherwise.
+    """
+    prompt = create_prompt(section_type, keypoints, word_limit)
+    
+    def steps(model: str):
+        if num_versions <= 1 or not use_n or model in _N_UNSUPPORTED_MODELS:
+            versions = yield from _concurrent_steps(prompt, section_type, word_limit, num_versions, model)
+            return _validate_drafts(versions, word_limit)
+        
+        try:
+            response = yield _content_request(prompt, model, n=num_versions)
+        except BadRequestError as e:
+            if getattr(e, "param", None) != "n" and "'n'" not in str(e):
+                raise
+            _N_UNSUPPORTED_MODELS.add(model)
+            versions = yield from _concurrent_steps(prompt, section_type, word_limit, num_versions, model)
+            return _validate_drafts(versions, word_limit)
+        
+        versions = _choices_to_versions(response, section_type, word_limit, model, num_versions)
+        # Some endpoints ignore `n` and return a single choice; top up the rest
+        if len(versions) < num_versions:
+            _N_UNSUPPORTED_MODELS.add(model)
+            versions.extend((yield from _concurrent_steps(prompt, section_type, word_limit, num_versions - len(versions), model)))
+        return _validate_drafts(versions, word_limit)
+    
+    return steps
+
+def generate_content_version(section_type: str, keypoints: List[str], word_limit: int, api_key: str, model: Optional[str] = None) -> GeneratedContent:
+    """Generate a single version of content."""
+    return generate_content_versions(section_type, keypoints, word_limit, api_key, num_versions=1, model=model)[0]
+
+def generate_content_versions(section_type: str, keypoints: List[str], word_limit: int, api_key: str, num_versions: int = 3, use_n: bool = True, model: Optional[str] = None) -> List[GeneratedContent]:
     """
     Generate multiple versions of content based on key points.
     
+    By default all versions are requested as choices of one API call, so the
+    prompt is sent and billed once. Models that reject the `n` parameter are
+    remembered and served with concurrent single requests instead.
+    
+    Unless a model is given, drafts come from the model router: the cheap model
+    first, escalating when none of its drafts meets the word count requirement.
+    
     Args:
         section_type: Type of section to generate
         keypoints: List of key points to include
         word_limit: Target word count
         api_key: OpenAI API key
+        num_versions: Number of versions to generate
+        use_n: Request all versions in one call when the model supports it
+        model: Model to use, bypassing the model router (optional)
         
     Returns:
         List[GeneratedContent]: List of generated content versions
     """
-    versions = []
-    for _ in range(3):  # Generate 3 versions
-        version = generate_content_version(section_type, keypoints, word_limit, api_key)
-        versions.append(version)
-    return versions 
\ No newline at end of file
+    steps = versions_steps(section_type, keypoints, word_limit, num_versions, use_n)
+    return run_stage("generate_content", steps, chat_completion, api_key, model)
+
+async def agenerate_content_versions(section_type: str, keypoints: List[str], word_limit: int, api_key: str, num_versions: int = 3, use_n: bool = True, model: Optional[str] = None) -> List[GeneratedContent]:
+    """Async counterpart of generate_content_versions."""
+    steps = versions_steps(section_type, keypoints, word_limit, num_versions, use_n)
+    return await arun_stage("generate_content", steps, achat_completion, api_key, model)
@@ -1,5 +1,5 @@
 """Models for content generation."""
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pydantic import BaseModel
 
 class GeneratedContent(BaseModel):
@@ -11,4 +11,16 @@ class GeneratedContent(BaseModel):
     
     def __str__(self) -> str:
         """Return a string representation of the content."""
-        return self.content 
\ No newline at end of file
+        return self.content
+
+class DuplicateDraft(BaseModel):
+    """Model for a draft collapsed into an earlier, near-identical draft."""
+    index: int
+    duplicate_of: int
+    similarity: float
+
+class DeduplicationResult(BaseModel):
+    """Model for the outcome of near-duplicate draft detection."""
+    threshold: float
+    kept: List[int]
+    duplicates: List[DuplicateDraft]
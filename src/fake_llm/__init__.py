@@ -0,0 +1,6 @@
+"""Local OpenAI-compatible stand-in server for load and throughput testing."""
+from .server import FakeLLMServer
+from .latency import LatencyDistribution
+from .responses import detect_stage, canned_response
+
+__all__ = ['FakeLLMServer', 'LatencyDistribution', 'detect_stage', 'canned_response']
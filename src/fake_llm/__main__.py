@@ -0,0 +1,37 @@
+"""Run the fake LLM server: python -m src.fake_llm --port 8099 --latency lognormal:0.3,0.5 --tokens-per-second 80"""
+import argparse
+import time
+
+from .server import FakeLLMServer
+
+
+def main():
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", default="0", help="Seconds before the first token, or a distribution such as uniform:0.1,0.5 or lognormal:0.3,0.5")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Output rate for streamed and non-streamed responses (0 for instant)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 5xx error")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        args.host, args.port, args.latency, args.seed,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after
+    ).start()
+    print(f"Fake LLM server listening on {server.base_url} (latency {server.latency})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
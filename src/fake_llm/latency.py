@@ -0,0 +1,71 @@
+"""Latency distributions for the fake LLM server."""
+from typing import Union
+import math
+import random
+
+class LatencyDistribution:
+    """
+    Random response latency in seconds.
+
+    Specs are written as "kind:param,param", for example "constant:0.2",
+    "uniform:0.1,0.5", "normal:0.3,0.05", "lognormal:0.3,0.5" (median and
+    sigma, for the long tails real APIs show) or "exponential:0.3" (mean).
+    A plain number is a constant latency.
+    """
+
+    KINDS = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, kind: str = "constant", *params: float):
+        """
+        Initialize the distribution.
+
+        Args:
+            kind: One of constant, uniform, normal, lognormal, exponential
+            *params: Parameters of the distribution, in seconds
+
+        Raises:
+            ValueError: If the kind or number of parameters is wrong
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{kind}'. Available: {', '.join(self.KINDS)}")
+        if len(params) != self.KINDS[kind]:
+            raise ValueError(f"The {kind} distribution takes {self.KINDS[kind]} parameter(s)")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: Union[float, str, "LatencyDistribution"]) -> "LatencyDistribution":
+        """
+        Build a distribution from a spec.
+
+        Args:
+            spec: Seconds, a "kind:params" string or a distribution
+
+        Returns:
+            LatencyDistribution: The distribution
+        """
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls("constant", float(spec))
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("constant", float(kind))
+        return cls(kind.strip(), *(float(p) for p in params.split(",")))
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds (never negative)."""
+        if self.kind == "constant":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        mean = self.params[0]
+        return rng.expovariate(1 / mean) if mean > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
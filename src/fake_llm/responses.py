@@ -0,0 +1,136 @@
+"""Canned, stage-appropriate responses for the fake LLM server."""
+from typing import Dict, List
+import random
+import re
+
+SENTENCES = [
+    "Gold nanoparticles exhibit localized surface plasmon resonance that depends on particle size and shape.",
+    "Bayesian optimization offers a sample-efficient strategy for exploring high-dimensional synthesis spaces.",
+    "The interplay between precursor concentration and temperature governs nucleation and growth kinetics.",
+    "Surface-enhanced Raman scattering benefits from strong near-field enhancement at plasmonic hot spots.",
+    "Systematic control of reducing agent concentration enables reproducible tuning of particle morphology.",
+    "These observations motivate a data-driven approach to optimizing nanoparticle synthesis conditions.",
+]
+
+CRITERIA = ["Clarity", "Coherence", "Academic Style", "Content Quality", "Structure"]
+
+_WORD_LIMIT = re.compile(r'EXACTLY (\d+) words')
+_PARAGRAPH_HEADER = re.compile(r'^\[Paragraph (\d+)\]\s*$', re.M)
+_NUMBERED_LINE = re.compile(r'^\d+\. ', re.M)
+_ORIGINAL_TEXT = re.compile(r'Original text:\s*\n(.*?)\n\s*\nProvide your response', re.S)
+
+
+def detect_stage(messages: List[Dict[str, str]]) -> str:
+    """
+    Work out which pipeline stage sent a request from its prompt.
+
+    Args:
+        messages: Chat messages of the request
+
+    Returns:
+        str: One of generate, review, rank, reduce, review_paragraphs, revise, cite, cite_claims, revise_cite
+    """
+    prompt = messages[-1]["content"] if messages else ""
+    if "PARAGRAPH SCORES:" in prompt:
+        return "review_paragraphs"
+    if "Revised and cited content:" in prompt:
+        return "revise_cite"
+    if "Flagged sentences:" in prompt:
+        return "cite_claims"
+    if "MERGED FEEDBACK:" in prompt:
+        return "reduce"
+    if "RANKING SCORES:" in prompt:
+        return "rank"
+    if "Revised content:" in prompt:
+        return "revise"
+    if "Cited content:" in prompt:
+        return "cite"
+    if "SCORES:" in prompt:
+        return "review"
+    return "generate"
+
+
+def _generate_text(words: int, rng: random.Random) -> str:
+    """Build academic-sounding paragraphs of roughly the given length."""
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        sentences.append(sentence)
+        count += len(sentence.split())
+    paragraphs = [" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4)]
+    return "\n\n".join(paragraphs)
+
+
+def _original_text(prompt: str, pattern: re.Pattern) -> str:
+    """Extract the text under revision, citation or review from a prompt."""
+    match = pattern.search(prompt)
+    return match.group(1).strip() if match else SENTENCES[0]
+
+
+def canned_response(stage: str, prompt: str, rng: random.Random) -> str:
+    """
+    Build a response in the format the stage's parser expects.
+
+    Args:
+        stage: Pipeline stage (generate, review, rank, reduce, review_paragraphs, revise, cite, cite_claims, revise_cite)
+        prompt: Prompt of the request
+        rng: Random source for scores and text
+
+    Returns:
+        str: Response text
+    """
+    if stage == "review":
+        lines = [f"{c}: {rng.randint(6, 10)}/10 | Feedback: The text handles {c.lower()} well overall." for c in CRITERIA]
+        return "SCORES:\n" + "\n".join(lines) + "\n\nOVERALL FEEDBACK:\nA solid section with minor opportunities for tightening."
+
+    if stage == "rank":
+        return "RANKING SCORES:\n" + "\n".join(f"{c}: {rng.randint(6, 10)}/10" for c in CRITERIA)
+
+    if stage == "reduce":
+        lines = [f"{c}: Across the text, {c.lower()} is handled well with a few weaker passages." for c in CRITERIA]
+        return "MERGED FEEDBACK:\n" + "\n".join(lines) + "\n\nOVERALL FEEDBACK:\nA solid text whose parts are of consistent quality."
+
+    if stage == "cite_claims":
+        count = len(_NUMBERED_LINE.findall(prompt))
+        return "\n".join(f"{i} | Reason: Supports claim {i}" for i in range(1, count + 1, 2))
+
+    if stage == "review_paragraphs":
+        # The format example at the end of the prompt adds two headers
+        count = max(len(_PARAGRAPH_HEADER.findall(prompt)) - 2, 1)
+        blocks = [
+            f"[Paragraph {i + 1}]\n" + "\n".join(f"{c}: {rng.randint(6, 10)}/10 | Feedback: Paragraph {i + 1} handles {c.lower()} well." for c in CRITERIA)
+            for i in range(count)
+        ]
+        return "PARAGRAPH SCORES:\n\n" + "\n\n".join(blocks)
+
+    if stage == "revise":
+        text = " ".join(_original_text(prompt, _ORIGINAL_TEXT).split())
+        return (
+            f"Revised content:\n{text}\n\n"
+            "Revision changes:\n"
+            "1. First paragraph: Tightened the topic sentence for clarity.\n"
+            "2. Second paragraph: Improved the transition between ideas."
+        )
+
+    if stage in ("cite", "revise_cite"):
+        text = " ".join(_original_text(prompt, _ORIGINAL_TEXT).split())
+        sentences = re.split(r'(?<=\.)\s+', text)
+        # The fused stage marks its citation reasons so they can be told apart from references
+        marker = "Citation: " if stage == "revise_cite" else ""
+        cited = " ".join(f"{s} [{marker}Supports claim {i + 1}]" if i % 2 == 0 else s for i, s in enumerate(sentences))
+        citations = "\n".join(
+            f"{i // 2 + 1}. Location: Sentence {i + 1} | Reason: Supports claim {i + 1}"
+            for i in range(0, len(sentences), 2)
+        )
+        if stage == "cite":
+            return f"Cited content:\n{cited}\n\nCitations:\n{citations}"
+        return (
+            f"Revised and cited content:\n{cited}\n\n"
+            "Revision changes:\n"
+            "1. First paragraph: Tightened the topic sentence for clarity.\n\n"
+            f"Citations:\n{citations}"
+        )
+
+    match = _WORD_LIMIT.search(prompt)
+    return _generate_text(int(match.group(1)) if match else 300, rng)
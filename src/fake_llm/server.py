@@ -0,0 +1,260 @@
+"""OpenAI-compatible chat completions server backed by canned responses."""
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from .latency import LatencyDistribution
+from .responses import detect_stage, canned_response
+
+# Injected server errors, picked at random when a 5xx is drawn
+SERVER_ERRORS = [(500, "Internal server error"), (502, "Bad gateway"), (503, "The engine is currently overloaded")]
+
+_TOKEN_PIECES = re.compile(r"\s*\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for the usage block of fake responses."""
+    return max(1, len(text) // 4)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler for the fake chat completions endpoint."""
+
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+        """Send a JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, chunks: Iterator[dict]):
+        """Send chat completion chunks as server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def do_POST(self):
+        """Handle POST /v1/chat/completions."""
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        fake = self.server.fake
+        fault = fake.draw_fault()
+        if fault:
+            status, message, headers = fault
+            self._send_json(status, {"error": {"message": message, "type": "fake_error", "code": status}}, headers)
+        elif request.get("stream"):
+            self._send_stream(fake.stream(request))
+        else:
+            self._send_json(200, fake.complete(request))
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that knows its FakeLLMServer."""
+
+    daemon_threads = True
+
+    def __init__(self, address, fake: "FakeLLMServer"):
+        super().__init__(address, _Handler)
+        self.fake = fake
+
+
+class FakeLLMServer:
+    """Local stand-in for the OpenAI chat completions API."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: Union[float, str, LatencyDistribution] = 0.0, seed: Optional[int] = None,
+                 tokens_per_second: float = 0.0, rate_limit_rate: float = 0.0,
+                 error_rate: float = 0.0, retry_after: float = 0.0):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds to wait before the first token of each response,
+                as a number or a distribution spec such as "lognormal:0.3,0.5"
+            seed: Seed for the canned responses, latencies and injected errors
+            tokens_per_second: Output generation rate; streamed responses are
+                paced at this rate and others wait for the whole completion (0 for instant)
+            rate_limit_rate: Fraction of requests answered with 429
+            error_rate: Fraction of requests answered with a 5xx error
+            retry_after: Retry-After seconds sent with 429 responses
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.faults: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def latency(self) -> LatencyDistribution:
+        """Distribution of the time to the first token."""
+        return self._latency
+
+    @latency.setter
+    def latency(self, value: Union[float, str, LatencyDistribution]):
+        self._latency = LatencyDistribution.parse(value)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to OpenAI(base_url=...)."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    def draw_fault(self) -> Optional[Tuple[int, str, Dict[str, str]]]:
+        """
+        Decide whether the next request fails.
+
+        Returns:
+            Optional[Tuple[int, str, Dict[str, str]]]: Status, message and extra
+                headers of the injected error, or None to answer normally
+        """
+        with self._lock:
+            self.requests += 1
+            draw = self._rng.random()
+            if draw < self.rate_limit_rate:
+                fault = (429, "Rate limit reached for requests", {"Retry-After": str(self.retry_after)})
+            elif draw < self.rate_limit_rate + self.error_rate:
+                status, message = self._rng.choice(SERVER_ERRORS)
+                fault = (status, message, {})
+            else:
+                return None
+            self.faults[fault[0]] = self.faults.get(fault[0], 0) + 1
+        return fault
+
+    def _respond(self, request: dict) -> Tuple[List[str], int, float]:
+        """Draw the response contents, prompt tokens and latency for a request."""
+        messages = request.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+        stage = detect_stage(messages)
+        with self._lock:
+            seeds = [self._rng.random() for _ in range(request.get("n") or 1)]
+            latency = self._latency.sample(self._rng)
+
+        contents = [canned_response(stage, prompt, random.Random(seed)) for seed in seeds]
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+        return contents, prompt_tokens, latency
+
+    def _usage(self, prompt_tokens: int, contents: List[str]) -> dict:
+        """Build the usage block of a response."""
+        completion_tokens = sum(estimate_tokens(c) for c in contents)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    def complete(self, request: dict) -> dict:
+        """
+        Build a chat completion response for a request body.
+
+        Args:
+            request: Parsed chat.completions.create request body
+
+        Returns:
+            dict: ChatCompletion response body
+        """
+        contents, prompt_tokens, latency = self._respond(request)
+        usage = self._usage(prompt_tokens, contents)
+        if self.tokens_per_second:
+            latency += usage["completion_tokens"] / self.tokens_per_second
+        if latency:
+            time.sleep(latency)
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model"),
+            "choices": [
+                {"index": i, "message": {"role": "assistant", "content": c}, "finish_reason": "stop"}
+                for i, c in enumerate(contents)
+            ],
+            "usage": usage
+        }
+
+    def stream(self, request: dict) -> Iterator[dict]:
+        """
+        Build the chunks of a streamed chat completion, paced at tokens_per_second.
+
+        Args:
+            request: Parsed chat.completions.create request body with stream=True
+
+        Yields:
+            dict: ChatCompletionChunk bodies
+        """
+        contents, prompt_tokens, latency = self._respond(request)
+        if latency:
+            time.sleep(latency)
+
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model")
+        }
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+        for i, content in enumerate(contents):
+            yield {**base, "choices": [{"index": i, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+            for piece in _TOKEN_PIECES.findall(content):
+                # Words stand in for tokens; pace by the tokens they would count as
+                if delay:
+                    time.sleep(delay * estimate_tokens(piece))
+                yield {**base, "choices": [{"index": i, "delta": {"content": piece}, "finish_reason": None}]}
+            yield {**base, "choices": [{"index": i, "delta": {}, "finish_reason": "stop"}]}
+        if (request.get("stream_options") or {}).get("include_usage"):
+            yield {**base, "choices": [], "usage": self._usage(prompt_tokens, contents)}
+
+    def start(self) -> "FakeLLMServer":
+        """Start serving in a background thread."""
+        self._httpd = _Server((self.host, self.port), self)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
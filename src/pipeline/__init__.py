@@ -0,0 +1,6 @@
+"""Pipeline module for running sections through every stage."""
+from .orchestrator import run_section, run_batch
+from .async_orchestrator import arun_section, arun_paper
+from .policy import StagePolicy, StageDecision, StageAction
+
+__all__ = ['run_section', 'run_batch', 'arun_section', 'arun_paper', 'StagePolicy', 'StageDecision', 'StageAction']
@@ -0,0 +1,209 @@
+"""Async pipeline: many sections in flight on one event loop."""
+from typing import Iterable, List, Optional
+import asyncio
+
+from ..input_handler.content_input import ContentInput
+from ..content_generator import agenerate_content_versions, deduplicate_versions
+from ..reviewer import areview_map_reduce, ascore_content, areview_incremental, ParagraphReviewCache, ReviewedContent
+from ..version_selector import select_best_version
+from ..revision_agent import arevise_content, RevisedContent
+from ..citation_editor import aadd_citations, acite_claims, arevise_and_cite
+from ..publisher import publish_content, PublishedContent
+from .. import config
+from ..utils.cost_tracker import cost_tracker
+from ..utils.budget import Budget, use_budget
+from ..utils.deadline import Deadline, DeadlineExceeded, use_deadline
+from .orchestrator import affordable_versions, stage_deadline, uncited, run_report
+from .policy import StagePolicy, StageAction
+
+async def arescore(selected: ReviewedContent, revised: RevisedContent, api_key: str) -> ReviewedContent:
+    """Async counterpart of orchestrator.rescore."""
+    paragraph_cache = ParagraphReviewCache()
+    paragraph_cache.seed(selected)
+    return await areview_incremental(revised.revised_content, api_key, paragraph_cache)
+
+async def arun_section(section_input: ContentInput, api_key: str, num_versions: int = 3,
+                       dedup_threshold: Optional[float] = None, budget: Optional[Budget] = None,
+                       deadline: Optional[Deadline] = None, fused_revise_cite: bool = False,
+                       policy: Optional[StagePolicy] = None, rank_drafts: bool = False,
+                       rescore_revision: bool = False, speculative: bool = False) -> PublishedContent:
+    """
+    Async counterpart of run_section; drafts are reviewed concurrently.
+
+    Budgets, stage deadlines, partial results on expiry, re-scoring of the
+    revision and the map-reduce review of long drafts work as in run_section.
+    Speculative revision is not supported here.
+
+    Args:
+        section_input: Section type, key points and word limit
+        api_key: OpenAI API key
+        num_versions: Number of drafts to generate
+        dedup_threshold: Jaccard similarity at which near-duplicate drafts are
+            collapsed before review (default: config.DEDUP_THRESHOLD)
+        budget: Paper budget the section counts against (optional)
+        deadline: Paper deadline the section must also meet (optional)
+        fused_revise_cite: Revise the selected draft and add its citations in
+            one call (see citation_editor.revise_and_cite)
+        policy: Decides whether revision and citation run, run on the cheap
+            model or are skipped (default: a StagePolicy when config.STAGE_POLICY is set)
+        rank_drafts: Rank the drafts on scores alone (see reviewer.score_content)
+            and review only the selected draft in detail
+        rescore_revision: Re-score the revised text, sending only the paragraphs
+            the revision changed to the reviewer
+        speculative: Not supported; use run_section
+
+    Returns:
+        PublishedContent: The published section, with pipeline details in its metadata
+
+    Raises:
+        ValueError: If speculative is set
+        BudgetExceeded: If a call does not fit into the remaining budget
+        DeadlineExceeded: If no draft was generated before the deadline
+    """
+    if speculative:
+        raise ValueError("speculative revision is only supported by run_section")
+    section_budget = Budget(config.MAX_COST_PER_SECTION, config.MAX_TOKENS_PER_SECTION, name="section", parent=budget)
+    requested_versions = num_versions
+    num_versions = affordable_versions(section_budget, section_input, num_versions, fused_revise_cite)
+    if num_versions < requested_versions:
+        print(f"Warning: budget only allows {num_versions} of {requested_versions} drafts")
+
+    if policy is None and config.STAGE_POLICY:
+        policy = StagePolicy()
+
+    section_deadline = Deadline(config.SECTION_TIMEOUT, name="section", parent=deadline)
+    expired_stages: List[str] = []
+    decisions = []
+    with cost_tracker.track_calls() as calls, use_budget(section_budget):
+        with use_deadline(stage_deadline(section_deadline, "generate_content")):
+            versions = await agenerate_content_versions(
+                section_type=section_input.section,
+                keypoints=section_input.keypoints,
+                word_limit=section_input.word_limit,
+                api_key=api_key,
+                num_versions=num_versions
+            )
+        unique_versions, deduplication = deduplicate_versions(versions, dedup_threshold)
+
+        ranking = rank_drafts and len(unique_versions) > 1
+        review = ascore_content if ranking else areview_map_reduce
+        with use_deadline(stage_deadline(section_deadline, "review_content")) as review_deadline:
+            results = await asyncio.gather(
+                *(review(version.content, api_key=api_key) for version in unique_versions),
+                return_exceptions=True
+            )
+        reviewed_versions = [result for result in results if isinstance(result, ReviewedContent)]
+        for result in results:
+            if isinstance(result, DeadlineExceeded):
+                expired_stages.append("review_content")
+                break
+            if isinstance(result, BaseException):
+                raise result
+        selected_version = select_best_version(reviewed_versions) if reviewed_versions else None
+        if ranking and selected_version and not expired_stages:
+            try:
+                with use_deadline(review_deadline):
+                    selected_version = await areview_map_reduce(selected_version.content, api_key=api_key)
+            except DeadlineExceeded:
+                # The ranking scores stand in for the detailed review
+                expired_stages.append("review_content")
+
+        text = selected_version.content if selected_version else unique_versions[0].content
+        decision = policy.revision(
+            text, selected_version, section_input.word_limit, section_budget,
+            "revise_and_cite" if fused_revise_cite else "revise_content"
+        ) if policy else None
+        if decision:
+            decisions.append(decision)
+        stages = ["revise_content", "add_citations"] if fused_revise_cite else ["revise_content"]
+        model = decision.model if decision else None
+        cited_content = None
+        revised_review = None
+        if not decision or decision.action != StageAction.SKIP:
+            try:
+                with use_deadline(stage_deadline(section_deadline, *stages)):
+                    if fused_revise_cite:
+                        revised_content, cited_content = await arevise_and_cite(text, api_key=api_key, model=model)
+                    else:
+                        revised_content = await arevise_content(text, api_key=api_key, model=model)
+                    text = revised_content.revised_content
+                    if rescore_revision and selected_version:
+                        revised_review = await arescore(selected_version, revised_content, api_key)
+            except DeadlineExceeded:
+                expired_stages += stages
+
+        if cited_content is None and "add_citations" in expired_stages:
+            cited_content = uncited(text, "deadline expired")
+        elif cited_content is None:
+            decision = policy.citation(text, section_budget) if policy else None
+            if decision:
+                decisions.append(decision)
+            if decision and decision.action == StageAction.SKIP:
+                cited_content = uncited(text, decision.reason)
+            else:
+                try:
+                    with use_deadline(stage_deadline(section_deadline, "add_citations")):
+                        cite = acite_claims if config.CITE_CLAIMS_ONLY else aadd_citations
+                        cited_content = await cite(text, api_key=api_key, model=decision.model if decision else None)
+                except DeadlineExceeded:
+                    expired_stages.append("add_citations")
+                    cited_content = uncited(text, "deadline expired")
+    if expired_stages:
+        print(f"Warning: deadline expired during {', '.join(expired_stages)}; publishing partial results")
+
+    published = publish_content(cited_content, section_input)
+    published.metadata["pipeline"] = {
+        "num_versions": len(versions),
+        "deduplication": deduplication.model_dump(),
+        "review_scores": [version.total_score for version in reviewed_versions],
+        "selected_score": selected_version.total_score if selected_version else None,
+        "revised_score": revised_review.total_score if revised_review else None,
+        "speculation": None,
+        "fused_revise_cite": fused_revise_cite,
+        "rank_drafts": rank_drafts,
+        "policy": [decision.model_dump(mode="json") for decision in decisions],
+        **run_report(calls, section_budget, requested_versions, section_deadline, expired_stages)
+    }
+    return published
+
+async def arun_paper(section_inputs: Iterable[ContentInput], api_key: str, num_versions: int = 3,
+                     concurrency: Optional[int] = None, budget: Optional[Budget] = None,
+                     deadline: Optional[Deadline] = None, fused_revise_cite: bool = False,
+                     rank_drafts: bool = False, rescore_revision: bool = False) -> List[PublishedContent]:
+    """
+    Run the sections of a paper concurrently on the running event loop.
+
+    Args:
+        section_inputs: Sections to run, in paper order
+        api_key: OpenAI API key
+        num_versions: Number of drafts to generate per section
+        concurrency: Most sections in flight at once (default: all of them)
+        budget: Budget shared by all sections (default: capped by
+            config.MAX_COST_PER_RUN and config.MAX_TOKENS_PER_RUN)
+        deadline: Deadline shared by all sections (default: config.JOB_TIMEOUT)
+        fused_revise_cite: Revise and cite each section in one call
+        rank_drafts: Rank each section's drafts on scores alone before a
+            detailed review of the selected one
+        rescore_revision: Re-score each section's revision
+
+    Returns:
+        List[PublishedContent]: Published sections, in input order
+
+    Raises:
+        BudgetExceeded: When the paper runs out of budget
+        DeadlineExceeded: When the deadline passes before a section has a draft
+    """
+    section_inputs = list(section_inputs)
+    if budget is None:
+        budget = Budget(config.MAX_COST_PER_RUN, config.MAX_TOKENS_PER_RUN, name="paper")
+    if deadline is None:
+        deadline = Deadline(config.JOB_TIMEOUT, name="paper")
+    semaphore = asyncio.Semaphore(concurrency or max(len(section_inputs), 1))
+
+    async def run(section_input: ContentInput) -> PublishedContent:
+        async with semaphore:
+            return await arun_section(section_input, api_key, num_versions, budget=budget, deadline=deadline,
+                                      fused_revise_cite=fused_revise_cite, rank_drafts=rank_drafts,
+                                      rescore_revision=rescore_revision)
+
+    return list(await asyncio.gather(*(run(section_input) for section_input in section_inputs)))
@@ -0,0 +1,372 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+from ..input_handler.content_input import ContentInput
+from ..content_generator import generate_content_versions, deduplicate_versions
+from ..reviewer import score_content, review_map_reduce, review_incremental, ParagraphReviewCache, ReviewedContent
+from ..version_selector import select_best_version
+from ..revision_agent import revise_content, RevisedContent
+from ..citation_editor import add_citations, cite_claims, revise_and_cite, CitedContent
+from ..publisher import publish_content, PublishedContent
+from .. import config
+from ..utils.cost_tracker import cost_tracker
+from ..utils.budget import Budget, use_budget
+from ..utils.deadline import Deadline, DeadlineExceeded, use_deadline
+from ..utils.model_router import model_router
+from ..utils.tokens import estimate_tokens
+from .speculative import review_and_revise
+from .policy import StagePolicy, StageAction, StageDecision
+
+# Rough sizes used to plan a section within its budget
+STAGE_PROMPT_TOKENS = 800  # Instructions wrapped around the text in each prompt
+REVIEW_OUTPUT_TOKENS = 400
+TOKENS_PER_WORD = 1.4
+
+# Share of a section's time given to each stage, in pipeline order; time an
+# earlier stage does not use is spread over the later ones
+STAGE_TIME_SHARES = {
+    "generate_content": 0.3,
+    "review_content": 0.25,
+    "revise_content": 0.25,
+    "add_citations": 0.2,
+}
+
+def routing_report(calls: List[Dict]) -> Dict:
+    """
+    Summarise which models served each stage of a run and what routing saved.
+    
+    Args:
+        calls: Cost records of the run (see CostTracker.track_calls)
+        
+    Returns:
+        Dict: Models per operation, operations that escalated, and the cost
+            compared with running every call on config.MODEL_NAME
+    """
+    models: Dict[str, List[str]] = {}
+    for call in calls:
+        operation_models = models.setdefault(call["operation"], [])
+        if call["model"] not in operation_models:
+            operation_models.append(call["model"])
+    return {
+        "models": models,
+        "escalations": [operation for operation, used in models.items() if len(used) > 1],
+        **cost_tracker.estimate_savings(config.MODEL_NAME, calls)
+    }
+
+def estimate_section_cost(section_input: ContentInput, num_versions: int, fused: bool = False) -> Tuple[float, int]:
+    """
+    Estimate the cost and tokens of running a section with a number of drafts.
+    
+    Args:
+        section_input: Section type, key points and word limit
+        num_versions: Number of drafts
+        fused: Revision and citations come from one revise_and_cite call
+        
+    Returns:
+        Tuple[float, int]: Estimated cost in USD and input plus output tokens
+    """
+    def call(stage: str, input_tokens: int, output_tokens: int) -> Tuple[float, int]:
+        model = model_router.models_for(stage)[0]
+        return cost_tracker.calculate_cost(model, input_tokens, output_tokens), input_tokens + output_tokens
+    
+    text_tokens = int(section_input.word_limit * TOKENS_PER_WORD)
+    prompt_tokens = STAGE_PROMPT_TOKENS + sum(estimate_tokens(point) for point in section_input.keypoints)
+    calls = [call("generate_content", prompt_tokens, text_tokens * num_versions)]
+    calls += [call("review_content", STAGE_PROMPT_TOKENS + text_tokens, REVIEW_OUTPUT_TOKENS)] * num_versions
+    if fused:
+        calls.append(call("revise_and_cite", STAGE_PROMPT_TOKENS + text_tokens, text_tokens))
+    else:
+        calls += [call(stage, STAGE_PROMPT_TOKENS + text_tokens, text_tokens) for stage in ("revise_content", "add_citations")]
+    return sum(cost for cost, _ in calls), sum(tokens for _, tokens in calls)
+
+def affordable_versions(budget: Budget, section_input: ContentInput, num_versions: int, fused: bool = False) -> int:
+    """
+    Reduce the number of drafts so a section fits into the remaining budget.
+    
+    Args:
+        budget: Budget of the section
+        section_input: Section type, key points and word limit
+        num_versions: Number of drafts requested
+        fused: Revision and citations come from one revise_and_cite call
+        
+    Returns:
+        int: Number of drafts to generate (at least one)
+    """
+    while num_versions > 1 and not budget.fits(*estimate_section_cost(section_input, num_versions, fused)):
+        num_versions -= 1
+    return num_versions
+
+def run_report(calls: List[Dict], budget: Budget, requested_versions: int, deadline: Deadline,
+               expired_stages: List[str]) -> Dict:
+    """
+    Summarise the routing, hedging, budget and deadline of a section run.
+    
+    Args:
+        calls: Cost records of the run
+        budget: Budget of the section
+        requested_versions: Drafts requested before the budget was applied
+        deadline: Deadline of the section
+        expired_stages: Stages that ran out of time
+        
+    Returns:
+        Dict: Report entries for metadata["pipeline"]
+    """
+    return {
+        "routing": routing_report(calls),
+        "hedging": cost_tracker.hedge_summary(calls),
+        "budget": {**budget.report(), "requested_versions": requested_versions},
+        "deadline": {**deadline.report(), "expired_stages": expired_stages}
+    }
+
+def stage_deadline(deadline: Deadline, *stages: str) -> Deadline:
+    """
+    Carve the deadline of one or more consecutive stages out of a section deadline.
+    
+    Args:
+        deadline: Deadline of the section
+        *stages: Stages run under the new deadline (keys of STAGE_TIME_SHARES)
+        
+    Returns:
+        Deadline: The stages' share of the time left
+    """
+    order = list(STAGE_TIME_SHARES)
+    later = order[order.index(stages[0]):]
+    share = sum(STAGE_TIME_SHARES[stage] for stage in stages) / sum(STAGE_TIME_SHARES[stage] for stage in later)
+    return deadline.child(share, name="+".join(stages))
+
+def rescore(selected: ReviewedContent, revised: RevisedContent, api_key: str) -> ReviewedContent:
+    """Re-score a revision, sending only the paragraphs it changed to the reviewer."""
+    paragraph_cache = ParagraphReviewCache()
+    paragraph_cache.seed(selected)
+    return review_incremental(revised.revised_content, api_key, paragraph_cache)
+
+def uncited(content: str, reason: str) -> CitedContent:
+    """Wrap text that did not go through the citation stage so it can be published."""
+    return CitedContent(
+        original_content=content,
+        cited_content=content,
+        citations=[],
+        citation_changes=[],
+        citation_summary=f"No citations added: {reason}"
+    )
+
+def run_section(section_input: ContentInput, api_key: str, num_versions: int = 3, dedup_threshold: Optional[float] = None,
+                budget: Optional[Budget] = None, rescore_revision: bool = False,
+                speculative: bool = False, deadline: Optional[Deadline] = None,
+                fused_revise_cite: bool = False, policy: Optional[StagePolicy] = None,
+                rank_drafts: bool = False) -> PublishedContent:
+    """
+    Run a section through generation, review, selection, revision, citation and publishing.
+    
+    Every call is charged to a section budget capped by config.MAX_COST_PER_SECTION
+    and config.MAX_TOKENS_PER_SECTION, nested in the given paper or batch budget.
+    Fewer drafts are generated when the requested number would not fit.
+    
+    The section must finish within config.SECTION_TIMEOUT and the given job
+    deadline. Each stage gets a share of the time left (STAGE_TIME_SHARES);
+    when a stage runs out of time its calls are cut off and the section
+    continues with what it has: the drafts and reviews that finished, the
+    best draft unrevised, or the revision without citations.
+    
+    With config.CITE_CLAIMS_ONLY, citations are added by
+    citation_editor.cite_claims, which sends only the sentences flagged as
+    claims to the model.
+    
+    Drafts longer than config.REVIEW_CHUNK_TOKENS are reviewed in chunks
+    concurrently and the chunk reviews merged (see reviewer.review_map_reduce),
+    so a long draft takes about as long to review as a short one.
+    
+    Args:
+        section_input: Section type, key points and word limit
+        api_key: OpenAI API key
+        num_versions: Number of drafts to generate
+        dedup_threshold: Jaccard similarity at which near-duplicate drafts are
+            collapsed before review (default: config.DEDUP_THRESHOLD)
+        budget: Paper or batch budget the section counts against (optional)
+        rescore_revision: Re-score the revised text, sending only the paragraphs
+            the revision changed to the reviewer
+        speculative: Review drafts concurrently and start revising a clear
+            leader before every review is in (see pipeline.speculative)
+        deadline: Job or batch deadline the section must also meet (optional)
+        fused_revise_cite: Revise the selected draft and add its citations in
+            one call (see citation_editor.revise_and_cite); ignored when speculative
+        policy: Decides whether revision and citation run, run on the cheap
+            model or are skipped (default: a StagePolicy when config.STAGE_POLICY
+            is set); its decisions are recorded in metadata["pipeline"]["policy"].
+            A speculative revision starts before the reviews the policy needs,
+            so it always runs and is recorded as a run decision
+        rank_drafts: Rank the drafts on scores alone (see reviewer.score_content)
+            and review only the selected draft in detail; ignored when speculative
+        
+    Returns:
+        PublishedContent: The published section, with pipeline details in its metadata
+        
+    Raises:
+        BudgetExceeded: If a call does not fit into the remaining budget
+        DeadlineExceeded: If no draft was generated before the deadline
+    """
+    section_budget = Budget(config.MAX_COST_PER_SECTION, config.MAX_TOKENS_PER_SECTION, name="section", parent=budget)
+    requested_versions = num_versions
+    fused_revise_cite = fused_revise_cite and not speculative
+    num_versions = affordable_versions(section_budget, section_input, num_versions, fused_revise_cite)
+    if num_versions < requested_versions:
+        print(f"Warning: budget only allows {num_versions} of {requested_versions} drafts")
+    
+    if policy is None and config.STAGE_POLICY:
+        policy = StagePolicy()
+    
+    section_deadline = Deadline(config.SECTION_TIMEOUT, name="section", parent=deadline)
+    expired_stages: List[str] = []
+    decisions = []
+    with cost_tracker.track_calls() as calls, use_budget(section_budget):
+        with use_deadline(stage_deadline(section_deadline, "generate_content")):
+            versions = generate_content_versions(
+                section_type=section_input.section,
+                keypoints=section_input.keypoints,
+                word_limit=section_input.word_limit,
+                api_key=api_key,
+                num_versions=num_versions
+            )
+        unique_versions, deduplication = deduplicate_versions(versions, dedup_threshold)
+        speculation = None
+        reviewed_versions = []
+        selected_version = revised_content = revised_review = cited_content = None
+        if speculative:
+            try:
+                with use_deadline(stage_deadline(section_deadline, "review_content", "revise_content")):
+                    reviewed_versions, selected_version, revised_content, speculation = review_and_revise(
+                        [version.content for version in unique_versions], api_key
+                    )
+            except DeadlineExceeded as e:
+                expired_stages += ["review_content", "revise_content"]
+                reviewed_versions = e.reviews
+                if reviewed_versions:
+                    selected_version = select_best_version(reviewed_versions)
+            if policy:
+                decisions.append(StageDecision(
+                    stage="revise_content", action=StageAction.RUN,
+                    reason="speculative revision starts before the reviews the policy needs"
+                ))
+            if rescore_revision and selected_version and revised_content:
+                try:
+                    with use_deadline(stage_deadline(section_deadline, "revise_content")):
+                        revised_review = rescore(selected_version, revised_content, api_key)
+                except DeadlineExceeded:
+                    expired_stages.append("revise_content")
+        else:
+            ranking = rank_drafts and len(unique_versions) > 1
+            try:
+                with use_deadline(stage_deadline(section_deadline, "review_content")):
+                    review = score_content if ranking else review_map_reduce
+                    for version in unique_versions:
+                        reviewed_versions.append(review(version.content, api_key=api_key))
+                    if ranking:
+                        selected_version = review_map_reduce(select_best_version(reviewed_versions).content, api_key=api_key)
+            except DeadlineExceeded:
+                expired_stages.append("review_content")
+            # The ranking scores stand in when the detailed review ran out of time
+            if reviewed_versions and selected_version is None:
+                selected_version = select_best_version(reviewed_versions)
+            content = selected_version.content if selected_version else unique_versions[0].content
+            decision = policy.revision(
+                content, selected_version, section_input.word_limit, section_budget,
+                "revise_and_cite" if fused_revise_cite else "revise_content"
+            ) if policy else None
+            if decision:
+                decisions.append(decision)
+            stages = ["revise_content", "add_citations"] if fused_revise_cite else ["revise_content"]
+            model = decision.model if decision else None
+            if not decision or decision.action != StageAction.SKIP:
+                try:
+                    with use_deadline(stage_deadline(section_deadline, *stages)):
+                        if fused_revise_cite:
+                            revised_content, cited_content = revise_and_cite(content, api_key=api_key, model=model)
+                        else:
+                            revised_content = revise_content(content, api_key=api_key, model=model)
+                        if rescore_revision and selected_version:
+                            revised_review = rescore(selected_version, revised_content, api_key)
+                except DeadlineExceeded:
+                    expired_stages += stages
+        
+        # Fall back to the best text that finished in time
+        if revised_content:
+            text = revised_content.revised_content
+        else:
+            text = selected_version.content if selected_version else unique_versions[0].content
+        if cited_content is None and "add_citations" in expired_stages:
+            cited_content = uncited(text, "deadline expired")
+        elif cited_content is None:
+            decision = policy.citation(text, section_budget) if policy else None
+            if decision:
+                decisions.append(decision)
+            if decision and decision.action == StageAction.SKIP:
+                cited_content = uncited(text, decision.reason)
+            else:
+                try:
+                    with use_deadline(stage_deadline(section_deadline, "add_citations")):
+                        cite = cite_claims if config.CITE_CLAIMS_ONLY else add_citations
+                        cited_content = cite(text, api_key=api_key, model=decision.model if decision else None)
+                except DeadlineExceeded:
+                    expired_stages.append("add_citations")
+                    cited_content = uncited(text, "deadline expired")
+    if expired_stages:
+        print(f"Warning: deadline expired during {', '.join(expired_stages)}; publishing partial results")
+    
+    published = publish_content(cited_content, section_input)
+    published.metadata["pipeline"] = {
+        "num_versions": len(versions),
+        "deduplication": deduplication.model_dump(),
+        "review_scores": [version.total_score for version in reviewed_versions],
+        "selected_score": selected_version.total_score if selected_version else None,
+        "revised_score": revised_review.total_score if revised_review else None,
+        "speculation": speculation,
+        "fused_revise_cite": fused_revise_cite,
+        "rank_drafts": rank_drafts and not speculative,
+        "policy": [decision.model_dump(mode="json") for decision in decisions],
+        **run_report(calls, section_budget, requested_versions, section_deadline, expired_stages)
+    }
+    return published
+
+def run_batch(section_inputs: Iterable[ContentInput], api_key: str, num_versions: int = 3, concurrency: int = 1,
+              budget: Optional[Budget] = None, deadline: Optional[Deadline] = None) -> Iterator[PublishedContent]:
+    """
+    Run many sections through the pipeline.
+    
+    Args:
+        section_inputs: Sections to run
+        api_key: OpenAI API key
+        num_versions: Number of drafts to generate per section
+        concurrency: Number of sections processed at the same time
+        budget: Budget shared by all sections (default: capped by
+            config.MAX_COST_PER_RUN and config.MAX_TOKENS_PER_RUN)
+        deadline: Deadline shared by all sections (default: config.JOB_TIMEOUT)
+        
+    Returns:
+        Iterator[PublishedContent]: Published sections, in input order
+        
+    Raises:
+        BudgetExceeded: When the batch runs out of budget; sections already
+            yielded are complete
+        DeadlineExceeded: When the batch deadline passes before a section
+            has a draft
+    """
+    if budget is None:
+        budget = Budget(config.MAX_COST_PER_RUN, config.MAX_TOKENS_PER_RUN, name="batch")
+    if deadline is None:
+        deadline = Deadline(config.JOB_TIMEOUT, name="batch")
+    
+    if concurrency <= 1:
+        for section_input in section_inputs:
+            yield run_section(section_input, api_key, num_versions, budget=budget, deadline=deadline)
+        return
+    
+    # Each section runs in a copy of the caller's context so cost scopes and backends carry over
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_section, s, api_key, num_versions,
+                            budget=budget, deadline=deadline)
+            for s in section_inputs
+        ]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,126 @@
+"""Per-section decisions to run, shorten or skip the stages after selection."""
+from typing import Dict, List, Optional, Tuple
+from enum import Enum
+
+from pydantic import BaseModel
+
+from .. import config
+from ..reviewer import ReviewedContent
+from ..publisher.validation import calculate_word_count
+from ..utils.budget import Budget
+from ..utils.cost_tracker import cost_tracker
+from ..utils.model_router import model_router
+from ..utils.tokens import estimate_message_tokens, estimate_tokens
+
+class StageAction(str, Enum):
+    """What the policy does with a stage."""
+    RUN = "run"
+    SHORTEN = "shorten"  # Run on the cheap model
+    SKIP = "skip"
+
+class StageDecision(BaseModel):
+    """Model for the policy's decision about one stage of a section."""
+    stage: str
+    action: StageAction
+    reason: str
+    model: Optional[str] = None
+
+def _stage_call(stage: str, content: str) -> Tuple[List[Dict[str, str]], int]:
+    """Build the messages a stage would send for content and estimate its output tokens, to size the call."""
+    if stage == "revise_content":
+        from ..revision_agent.agent import create_revision_messages
+        return create_revision_messages(content), estimate_tokens(content)
+    if stage == "revise_and_cite":
+        from ..citation_editor.fused import create_revise_and_cite_messages
+        return create_revise_and_cite_messages(content), estimate_tokens(content)
+    if config.CITE_CLAIMS_ONLY:
+        from ..citation_editor.claims import CLAIM_REASON_TOKENS, create_claim_citation_messages, detect_claims
+        claims = detect_claims(content)
+        return create_claim_citation_messages(content, claims), CLAIM_REASON_TOKENS * len(claims)
+    from ..citation_editor.editor import create_citation_messages
+    return create_citation_messages(content), estimate_tokens(content)
+
+class StagePolicy:
+    """
+    Decide per section whether revision and citation run, shorten or skip.
+
+    Revision is skipped when the selected draft scored at least skip_score on
+    every criterion and its length is within the word limit, since the
+    revision only polishes style and keeps the length as it is. Either stage
+    is shortened to the cheap model when the remaining budget cannot pay for
+    its routed model, and skipped when it cannot pay for the cheap one either.
+    """
+
+    def __init__(self, skip_score: Optional[int] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            skip_score: Lowest score on every criterion at which revision is
+                skipped (default: config.POLICY_SKIP_SCORE)
+        """
+        self._skip_score = skip_score
+
+    @property
+    def skip_score(self) -> int:
+        """Lowest score on every criterion at which revision is skipped."""
+        return self._skip_score if self._skip_score is not None else config.POLICY_SKIP_SCORE
+
+    def _afford(self, stage: str, content: str, budget: Optional[Budget]) -> StageDecision:
+        """Run a stage on its routed model, the cheap model or not at all, whichever the budget allows."""
+        if budget is None:
+            return StageDecision(stage=stage, action=StageAction.RUN, reason="no budget")
+        messages, output_tokens = _stage_call(stage, content)
+        models = model_router.models_for(stage)[:1]
+        if config.CHEAP_MODEL_NAME not in models:
+            models.append(config.CHEAP_MODEL_NAME)
+        for i, model in enumerate(models):
+            input_tokens = estimate_message_tokens(messages, model)
+            cost = cost_tracker.calculate_cost(model, input_tokens, output_tokens)
+            if budget.fits(cost, input_tokens + output_tokens):
+                if i == 0:
+                    return StageDecision(stage=stage, action=StageAction.RUN, reason=f"budget allows {model}")
+                return StageDecision(stage=stage, action=StageAction.SHORTEN, model=model,
+                                     reason=f"budget only allows {model}")
+        return StageDecision(stage=stage, action=StageAction.SKIP, reason="budget cannot pay for the call")
+
+    def revision(self, content: str, review: Optional[ReviewedContent], word_limit: int,
+                 budget: Optional[Budget] = None, stage: str = "revise_content") -> StageDecision:
+        """
+        Decide how to revise the selected draft.
+
+        Args:
+            content: Selected draft
+            review: Review of the draft (None if reviews ran out of time)
+            word_limit: Target word count of the section
+            budget: Section budget (optional)
+            stage: revise_content, or revise_and_cite when revision and
+                citations are fused
+
+        Returns:
+            StageDecision: Whether and on which model to revise
+        """
+        if review is not None and review.scores:
+            lowest = min(score.score for score in review.scores)
+            word_count = calculate_word_count(content)
+            # Same margins as the publisher's word count check
+            within_limit = word_limit * 0.85 <= word_count <= word_limit * 1.1
+            if lowest >= self.skip_score and within_limit:
+                return StageDecision(
+                    stage=stage, action=StageAction.SKIP,
+                    reason=f"every criterion scored {lowest}+ and {word_count} words fit the {word_limit}-word limit"
+                )
+        return self._afford(stage, content, budget)
+
+    def citation(self, content: str, budget: Optional[Budget] = None) -> StageDecision:
+        """
+        Decide how to add citations to the final text.
+
+        Args:
+            content: Text to cite
+            budget: Section budget (optional)
+
+        Returns:
+            StageDecision: Whether and on which model to add citations
+        """
+        return self._afford("add_citations", content, budget)
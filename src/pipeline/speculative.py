@@ -0,0 +1,143 @@
+"""Speculative revision of the leading draft while its rivals are still being reviewed."""
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+import contextvars
+import time
+
+from ..reviewer import review_content, ReviewedContent
+from ..version_selector import select_best_version
+from ..revision_agent import revise_content, RevisedContent
+from ..utils.cost_tracker import cost_tracker
+from ..utils.deadline import DeadlineExceeded
+
+# A leader is clear once it is this many points ahead of every other finished review
+DEFAULT_MARGIN = 0.5
+# Reviews that must be finished before speculating
+DEFAULT_MIN_REVIEWS = 2
+
+class _Speculation:
+    """A revision started before the review round finished."""
+
+    def __init__(self, index: int, future: Future, calls: List[Dict]):
+        self.index = index
+        self.future = future
+        self.calls = calls
+        self.started_at = time.perf_counter()
+
+def _tracked(speculation_calls: List[Dict], content: str, api_key: str) -> Tuple[RevisedContent, float]:
+    """Revise content, collecting the calls it makes and when it finished."""
+    with cost_tracker.track_calls() as calls:
+        try:
+            return revise_content(content, api_key=api_key), time.perf_counter()
+        finally:
+            speculation_calls.extend(calls)
+
+def clear_leader(reviews: List[Optional[ReviewedContent]], margin: float, min_reviews: int) -> Optional[int]:
+    """
+    Find a draft that leads the finished reviews by a clear margin.
+
+    Args:
+        reviews: Reviews so far, None for drafts still being reviewed
+        margin: Points the leader must be ahead of the runner-up
+        min_reviews: Finished reviews needed before a leader can be called
+
+    Returns:
+        Optional[int]: Index of the leader, or None if there is no clear leader yet
+    """
+    finished = sorted(
+        ((review.total_score, i) for i, review in enumerate(reviews) if review is not None),
+        key=lambda item: (-item[0], item[1])
+    )
+    if len(finished) < min_reviews:
+        return None
+    if len(finished) > 1 and finished[0][0] - finished[1][0] < margin:
+        return None
+    return finished[0][1]
+
+def review_and_revise(contents: List[str], api_key: str, margin: float = DEFAULT_MARGIN,
+                      min_reviews: int = DEFAULT_MIN_REVIEWS) -> Tuple[List[ReviewedContent], ReviewedContent, RevisedContent, Dict]:
+    """
+    Review drafts concurrently and start revising a clear leader before all reviews are in.
+
+    When the final selection matches the speculation its revision is used;
+    speculation on a draft that is overtaken is cancelled if it has not
+    started, and otherwise discarded when it finishes.
+
+    Args:
+        contents: Drafts to review
+        api_key: OpenAI API key
+        margin: Points a leader must be ahead of the runner-up to speculate on it
+        min_reviews: Finished reviews needed before speculating
+
+    Returns:
+        Tuple[List[ReviewedContent], ReviewedContent, RevisedContent, Dict]: Reviews in
+            draft order, the selected review, its revision, and a report of the
+            speculation (latency saved, tokens and cost wasted on discarded work)
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the revision is done;
+            its reviews attribute holds the reviews that finished in time
+    """
+    reviews: List[Optional[ReviewedContent]] = [None] * len(contents)
+    speculation: Optional[_Speculation] = None
+    overtaken: List[_Speculation] = []
+    started = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(contents), 1)) as review_pool, \
+                ThreadPoolExecutor(max_workers=2) as revise_pool:
+
+            def speculate(index: int) -> _Speculation:
+                calls: List[Dict] = []
+                future = revise_pool.submit(contextvars.copy_context().run, _tracked, calls, contents[index], api_key)
+                return _Speculation(index, future, calls)
+
+            futures = {
+                review_pool.submit(contextvars.copy_context().run, review_content, content, api_key=api_key): i
+                for i, content in enumerate(contents)
+            }
+            for future in as_completed(futures):
+                reviews[futures[future]] = future.result()
+                if all(review is not None for review in reviews):
+                    break
+                leader = clear_leader(reviews, margin, min_reviews)
+                if leader is not None and (speculation is None or speculation.index != leader):
+                    if speculation:
+                        speculation.future.cancel()
+                        overtaken.append(speculation)
+                    speculation = speculate(leader)
+                    started += 1
+            reviews_done = time.perf_counter()
+
+            selected = select_best_version(reviews)
+            winner = next(i for i, review in enumerate(reviews) if review is selected)
+            latency_saved = 0.0
+            used = speculation is not None and speculation.index == winner
+            if used:
+                revised, finished_at = speculation.future.result()
+                duration = finished_at - speculation.started_at
+                latency_saved = min(reviews_done - speculation.started_at, duration)
+            else:
+                if speculation:
+                    speculation.future.cancel()
+                    overtaken.append(speculation)
+                revised = revise_content(selected.content, api_key=api_key)
+
+            cancelled = sum(1 for spec in overtaken if spec.future.cancelled())
+    except DeadlineExceeded as e:
+        # The caller can still select from the reviews that finished in time
+        e.reviews = [review for review in reviews if review is not None]
+        raise
+    # Leaving the pools waits for discarded revisions, so their usage is complete
+    wasted_calls = [call for spec in overtaken for call in spec.calls]
+
+    report = {
+        "speculations": started,
+        "used": used,
+        "cancelled": cancelled,
+        "discarded": len(overtaken) - cancelled,
+        "latency_saved": latency_saved,
+        "tokens_wasted": sum(call["input_tokens"] + call["output_tokens"] for call in wasted_calls),
+        "cost_wasted": sum(call["cost"] for call in wasted_calls)
+    }
+    return reviews, selected, revised, report
@@ -1,4 +1,26 @@
 from .publisher import ContentPublisher, publish_content
-from .models import PublishedContent
+from .bulk import publish_many
+from .models import PublishedContent, TextStats
+from .sinks import OutputSink, JSONSink, JSONLSink, MarkdownSink, LaTeXSink, create_sinks, write_outputs, new_run_id, load_published
+from .validation import ValidationEngine, ValidationContext, compute_text_stats, default_engine
 
-__all__ = ['ContentPublisher', 'publish_content', 'PublishedContent'] 
\ No newline at end of file
+__all__ = [
+    'ContentPublisher',
+    'publish_content',
+    'publish_many',
+    'PublishedContent',
+    'TextStats',
+    'ValidationEngine',
+    'ValidationContext',
+    'compute_text_stats',
+    'default_engine',
+    'OutputSink',
+    'JSONSink',
+    'JSONLSink',
+    'MarkdownSink',
+    'LaTeXSink',
+    'create_sinks',
+    'write_outputs',
+    'new_run_id',
+    'load_published'
+]
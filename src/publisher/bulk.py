@@ -0,0 +1,88 @@
+"""Bulk publishing of cited content across a process pool."""
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+import os
+
+from ..citation_editor.models import CitedContent
+from ..input_handler.content_input import ContentInput
+from .models import PublishedContent
+from .publisher import ContentPublisher
+
+# Items sent to a worker per task; large enough to amortise pickling overhead
+DEFAULT_CHUNKSIZE = 16
+
+Job = Tuple[CitedContent, Optional[ContentInput]]
+
+_MISSING = object()
+
+
+def _publish_chunk(jobs: List[Job]) -> List[PublishedContent]:
+    """Publish a chunk of documents inside a worker process."""
+    return [ContentPublisher(section_input).publish(content) for content, section_input in jobs]
+
+
+def _aligned(contents: Iterable[CitedContent], section_inputs: Sequence[Optional[ContentInput]]) -> Iterator[Job]:
+    """Pair each document with its section input, failing if the two differ in length."""
+    inputs = iter(section_inputs)
+    for content in contents:
+        try:
+            yield content, next(inputs)
+        except StopIteration:
+            raise ValueError("section_inputs has fewer items than contents") from None
+    if next(inputs, _MISSING) is not _MISSING:
+        raise ValueError("section_inputs has more items than contents")
+
+
+def _chunked(jobs: Iterable[Job], chunksize: int) -> Iterator[List[Job]]:
+    """Split jobs into lists of at most chunksize items."""
+    iterator = iter(jobs)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def publish_many(
+    contents: Iterable[CitedContent],
+    workers: Optional[int] = None,
+    section_inputs: Optional[Sequence[Optional[ContentInput]]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[PublishedContent]:
+    """
+    Publish many documents, spreading formatting and validation across processes.
+
+    Results are yielded as soon as their chunk completes, so they may arrive
+    out of input order; use `original_content` to match them back up.
+
+    Args:
+        contents: Cited content to publish
+        workers: Number of worker processes (default: CPU count); 1 publishes in-process
+        section_inputs: Section input for each document, aligned with contents (optional)
+        chunksize: Number of documents dispatched to a worker per task
+
+    Returns:
+        Iterator[PublishedContent]: Published content in completion order
+
+    Raises:
+        ValueError: If chunksize is below 1, or section_inputs and contents differ in length
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    workers = workers or os.cpu_count() or 1
+    if section_inputs is None:
+        jobs = ((content, None) for content in contents)
+    else:
+        jobs = _aligned(contents, section_inputs)
+
+    if workers == 1:
+        for content, section_input in jobs:
+            yield ContentPublisher(section_input).publish(content)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_publish_chunk, chunk) for chunk in _chunked(jobs, chunksize)]
+        for future in as_completed(futures):
+            yield from future.result()
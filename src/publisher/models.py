@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from ..citation_editor.models import CitedContent
 
 class ValidationResult(BaseModel):
@@ -48,4 +48,12 @@ class PublishedContent(BaseModel):
                     "warnings": ["Consider adding more examples"]
                 }
             }
-        } 
\ No newline at end of file
+        }
+
+
+class TextStats(BaseModel):
+    """Model for text statistics shared across validators."""
+    word_count: int = Field(..., description="Number of words, excluding word count markers")
+    paragraph_count: int = Field(..., description="Number of non-empty paragraphs")
+    sentence_count: int = Field(..., description="Number of sentences")
+    citation_spans: List[Tuple[int, int]] = Field(default_factory=list, description="Start and end offsets of bracketed citations")
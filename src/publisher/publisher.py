@@ -1,103 +1,103 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
-import json
-import re
 
 from ..citation_editor.models import CitedContent
-from .models import PublishedContent, ValidationResult
+from ..input_handler.content_input import ContentInput
+from .models import PublishedContent, ValidationResult, TextStats
+from .validation import (
+    ValidationContext,
+    ValidationEngine,
+    DEFAULT_WORD_LIMIT,
+    default_engine,
+    calculate_word_count,
+    compute_text_stats,
+    validate_word_count,
+    validate_citations,
+    validate_structure,
+    validate_metadata,
+)
 from .. import config
 
+# Section type used when the section input does not provide one
+DEFAULT_SECTION_TYPE = "Introduction"
+
 class ContentPublisher:
     """Content publisher for final output formatting and validation."""
-    
-    def __init__(self):
-        """Initialize the content publisher."""
-        self.validators = [
-            self._validate_word_count,
-            self._validate_citations,
-            self._validate_structure,
-            self._validate_metadata
-        ]
-    
-    def _validate_word_count(self, content: CitedContent) -> List[str]:
+
+    def __init__(self, section_input: Optional[ContentInput] = None, engine: Optional[ValidationEngine] = None):
+        """
+        Initialize the content publisher.
+
+        Args:
+            section_input: Input the section was generated from; supplies the section type and word limit
+            engine: Validation engine to use (default: the module-level default engine)
+        """
+        self.section_input = section_input
+        self.engine = engine or default_engine
+
+    @property
+    def section_type(self) -> str:
+        """Section type of the published content."""
+        return self.section_input.section if self.section_input else DEFAULT_SECTION_TYPE
+
+    @property
+    def word_limit(self) -> int:
+        """Target word count of the published content."""
+        return self.section_input.word_limit if self.section_input else DEFAULT_WORD_LIMIT
+
+    def _final_content(self, content: CitedContent) -> str:
+        """Use the cited content if available, otherwise use original content."""
+        return content.cited_content if content.cited_content else content.original_content
+
+    def compute_stats(self, content: CitedContent) -> TextStats:
+        """Compute the shared text statistics for the content."""
+        return compute_text_stats(self._final_content(content))
+
+    def _context(self, content: CitedContent, metadata: Optional[Dict] = None, stats: Optional[TextStats] = None) -> ValidationContext:
+        """Build the validation context shared by all validators."""
+        return ValidationContext(
+            content=content,
+            stats=stats or self.compute_stats(content),
+            metadata=metadata or {},
+            word_limit=self.word_limit
+        )
+
+    def _validate_word_count(self, content: CitedContent, stats: Optional[TextStats] = None) -> List[str]:
         """Validate the word count of the content."""
-        issues = []
-        target_count = 1000  # Default word limit if not specified
-        actual_count = self._calculate_word_count(content.cited_content)
-        
-        # Allow 10% margin above and require at least 85% of target
-        if actual_count > target_count * 1.1:
-            issues.append(f"Content exceeds word limit: {actual_count} words vs {target_count} limit")
-        elif actual_count < target_count * 0.85:
-            issues.append(f"Content is too short: {actual_count} words vs {target_count} target")
-        return issues
-    
+        return validate_word_count(self._context(content, stats=stats))
+
     def _validate_citations(self, content: CitedContent) -> List[str]:
         """Validate citation formatting and placement."""
-        issues = []
-        citation_count = len(content.citations)
-        if citation_count == 0:
-            issues.append("No citations found in the content")
-        
-        # Check citation format
-        citation_pattern = r'\[.*?\]'
-        if not all('[' in cite.text and ']' in cite.text for cite in content.citations):
-            issues.append("Some citations are not properly formatted")
-        
-        return issues
-    
+        return validate_citations(self._context(content))
+
     def _validate_structure(self, content: CitedContent) -> List[str]:
         """Validate the structure of the content."""
-        issues = []
-        
-        # Basic structure checks
-        if not content.cited_content.strip():
-            issues.append("Content is empty")
-        if not content.citations:
-            issues.append("No citations found")
-        
-        return issues
-    
+        return validate_structure(self._context(content))
+
     def _validate_metadata(self, metadata: Dict) -> List[str]:
         """Validate metadata completeness."""
-        required_fields = ["author", "timestamp", "version"]
-        issues = []
-        
-        for field in required_fields:
-            if field not in metadata:
-                issues.append(f"Missing required metadata field: {field}")
-        
-        return issues
-    
-    def format_content(self, content: CitedContent) -> Dict[str, Any]:
+        return validate_metadata(ValidationContext.model_construct(metadata=metadata))
+
+    def format_content(self, content: CitedContent, stats: Optional[TextStats] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Format the content for output."""
-        metadata = self.create_metadata(content)
-        
-        # Use the cited content if available, otherwise use original content
-        final_content = content.cited_content if content.cited_content else content.original_content
-        
-        # Calculate word count properly
-        word_count = self._calculate_word_count(final_content)
-        
+        stats = stats or self.compute_stats(content)
+        metadata = metadata or self.create_metadata(content, stats)
+
         return {
-            "section": "Introduction",  # Default section type
-            "content": final_content,
+            "section": self.section_type,
+            "content": self._final_content(content),
             "citations": [citation.model_dump() for citation in content.citations],
-            "word_count": word_count,
+            "word_count": stats.word_count,
             "metadata": metadata
         }
-    
-    def create_metadata(self, content: CitedContent) -> Dict[str, Any]:
+
+    def create_metadata(self, content: CitedContent, stats: Optional[TextStats] = None) -> Dict[str, Any]:
         """Create metadata for the content."""
-        # Use the cited content if available, otherwise use original content
-        final_content = content.cited_content if content.cited_content else content.original_content
-        
-        # Calculate word count properly
-        word_count = self._calculate_word_count(final_content)
-        
+        stats = stats or self.compute_stats(content)
+
         return {
-            "section_type": "Introduction",  # Default section type
-            "word_count": word_count,
+            "section_type": self.section_type,
+            "word_count": stats.word_count,
             "citation_count": len(content.citations),
             "timestamp": datetime.now().isoformat(),
             "author": "AI Content Generator",
@@ -107,94 +107,37 @@ class ContentPublisher:
                 "temperature": config.TEMPERATURE
             }
         }
-    
+
     def _calculate_word_count(self, text: str) -> int:
         """Calculate word count properly by handling various edge cases."""
-        if not text:
-            return 0
-            
-        # Remove Word Count markers
-        text = re.sub(r'\*\*Word Count:.*?\*\*', '', text)
-        text = re.sub(r'\[Word count:.*?\]', '', text)
-        text = re.sub(r'Word Count:.*?\n', '', text)
-        text = re.sub(r'\(\d+ words\)', '', text)
-        
-        # Replace line breaks and special characters with spaces
-        text = re.sub(r'[\n\r\t]', ' ', text)
-        
-        # Remove special characters except hyphens between words and apostrophes
-        text = re.sub(r'[^\w\s\'-]', ' ', text)
-        
-        # Replace multiple spaces with a single space and trim
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Handle hyphenated words and contractions
-        text = re.sub(r'(?<=[a-zA-Z])-(?=[a-zA-Z])', ' ', text)  # Split hyphenated words
-        text = re.sub(r'\'s\b', '', text)  # Remove possessive 's
-        text = re.sub(r'\'t\b', ' not', text)  # Expand contractions
-        text = re.sub(r'\'re\b', ' are', text)
-        text = re.sub(r'\'ve\b', ' have', text)
-        text = re.sub(r'\'m\b', ' am', text)
-        text = re.sub(r'\'ll\b', ' will', text)
-        text = re.sub(r'\'d\b', ' would', text)
-        
-        # Split into words and count non-empty words
-        words = [word for word in text.split() if word.strip() and any(c.isalnum() for c in word)]
-        
-        return len(words)
-    
-    def validate_content(self, content: CitedContent, metadata: Dict) -> ValidationResult:
+        return calculate_word_count(text)
+
+    def validate_content(self, content: CitedContent, metadata: Dict, stats: Optional[TextStats] = None) -> ValidationResult:
         """Run all validation checks."""
-        all_issues = []
-        warnings = []
-        
-        # Calculate word count before validation
-        word_count = self._calculate_word_count(content.cited_content if content.cited_content else content.original_content)
-        
-        # Run all validators
-        for validator in self.validators:
-            if validator == self._validate_metadata:
-                issues = validator(metadata)
-            else:
-                issues = validator(content)
-            all_issues.extend(issues)
-        
-        # Add warnings for potential improvements
-        if len(content.citations) < 3:
-            warnings.append("Consider adding more citations for better academic rigor")
-        
-        # Add word count warning if needed
-        target_count = 1000  # Default word limit
-        if word_count < target_count * 0.7:
-            warnings.append(f"Content is shorter than target: {word_count} words vs {target_count} target")
-        elif word_count > target_count * 1.1:
-            warnings.append(f"Content is longer than target: {word_count} words vs {target_count} target")
-        
-        return ValidationResult(
-            is_valid=len(all_issues) == 0,
-            issues=all_issues,
-            warnings=warnings
-        )
-    
+        return self.engine.run(self._context(content, metadata, stats))
+
     def publish(self, content: CitedContent) -> PublishedContent:
         """
         Publish the content with formatting and validation.
-        
+
         Args:
             content: The cited content to publish
-            
+
         Returns:
             PublishedContent: The formatted and validated content
         """
-        # Format content
-        formatted_content = self.format_content(content)
-        
+        # Compute text statistics once and share them across all steps
+        stats = self.compute_stats(content)
+
         # Create metadata
-        metadata = self.create_metadata(content)
-        
+        metadata = self.create_metadata(content, stats)
+
+        # Format content
+        formatted_content = self.format_content(content, stats, metadata)
+
         # Validate
-        validation_result = self.validate_content(content, metadata)
-        
+        validation_result = self.validate_content(content, metadata, stats)
+
         return PublishedContent(
             original_content=content,
             formatted_content=formatted_content,
@@ -202,15 +145,16 @@ class ContentPublisher:
             validation=validation_result
         )
 
-def publish_content(content: CitedContent) -> PublishedContent:
+def publish_content(content: CitedContent, section_input: Optional[ContentInput] = None) -> PublishedContent:
     """
     Convenience function to publish content.
-    
+
     Args:
         content: The cited content to publish
-        
+        section_input: Input the section was generated from (optional)
+
     Returns:
         PublishedContent: The published content
     """
-    publisher = ContentPublisher()
-    return publisher.publish(content) 
\ No newline at end of file
+    publisher = ContentPublisher(section_input)
+    return publisher.publish(content)
@@ -0,0 +1,289 @@
+"""Output sinks for writing published content to disk."""
+from typing import Dict, List, Optional, Any
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import gzip
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+from ..citation_editor.models import Citation, CitedContent
+from .models import PublishedContent, ValidationResult
+
+# Fields of PublishedContent written to disk; the cited content is already in formatted_content
+OUTPUT_FIELDS = {"formatted_content", "metadata", "validation"}
+
+_LATEX_SPECIAL_CHARS = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+
+
+def new_run_id() -> str:
+    """Create a unique, time-sortable identifier for an output run."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:8]}"
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write data to path so readers never observe a partially written file.
+
+    The data goes to a temporary file in the same directory, which is then
+    renamed over the target.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def serialize_published(published: PublishedContent, fast: bool = False, indent: Optional[int] = 2) -> str:
+    """
+    Serialize the output fields of published content to JSON.
+
+    Args:
+        published: Published content to serialize
+        fast: Use pydantic's compiled model_dump_json instead of json.dumps
+        indent: JSON indentation, or None for a compact single line
+
+    Returns:
+        str: JSON document
+    """
+    if fast:
+        return published.model_dump_json(include=OUTPUT_FIELDS, indent=indent)
+    content_dict = {
+        "formatted_content": published.formatted_content,
+        "metadata": published.metadata,
+        "validation": published.validation.model_dump()
+    }
+    separators = None if indent is not None else (",", ":")
+    return json.dumps(content_dict, indent=indent, ensure_ascii=False, separators=separators, default=str)
+
+
+def load_published(path: str) -> PublishedContent:
+    """
+    Load published content from a file written by JSONSink.
+
+    The saved file only holds the output fields, so the cited content is
+    rebuilt from the formatted content.
+
+    Args:
+        path: JSON file to read
+
+    Returns:
+        PublishedContent: The loaded content
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    formatted = data["formatted_content"]
+    cited = CitedContent(
+        original_content=formatted.get("content", ""),
+        cited_content=formatted.get("content", ""),
+        citations=[Citation(**citation) for citation in formatted.get("citations", [])],
+        citation_changes=[],
+        citation_summary=""
+    )
+    return PublishedContent(
+        original_content=cited,
+        formatted_content=formatted,
+        metadata=data["metadata"],
+        validation=ValidationResult(**data["validation"])
+    )
+
+
+class OutputSink(ABC):
+    """Base class for output sinks; subclasses implement write."""
+
+    name = "base"
+
+    def __init__(self, output_dir: str = "output", fast: bool = False):
+        """
+        Initialize the sink.
+
+        Args:
+            output_dir: Directory to write output files to
+            fast: Use pydantic's model_dump_json for serialization
+        """
+        self.output_dir = Path(output_dir)
+        self.fast = fast
+
+    @abstractmethod
+    def write(self, published: PublishedContent, run_id: str) -> str:
+        """
+        Write published content for a run.
+
+        Args:
+            published: Published content to write
+            run_id: Unique identifier of the run
+
+        Returns:
+            str: Path of the written file
+        """
+
+
+class JSONSink(OutputSink):
+    """Write one pretty-printed JSON file per run."""
+
+    name = "json"
+
+    def write(self, published: PublishedContent, run_id: str) -> str:
+        """Write the run to its own JSON file atomically."""
+        file_path = self.output_dir / f"published_content_{run_id}.json"
+        atomic_write(file_path, serialize_published(published, self.fast).encode("utf-8"))
+        return str(file_path)
+
+
+class JSONLSink(OutputSink):
+    """Append one JSON record per run to a shared JSON Lines file."""
+
+    name = "jsonl"
+
+    # Serialises appends from threads of the same process; appends across
+    # processes rely on O_APPEND with a single write per record
+    _lock = threading.Lock()
+
+    def __init__(self, output_dir: str = "output", fast: bool = False, filename: str = "published_content.jsonl", compress: bool = False):
+        """
+        Initialize the sink.
+
+        Args:
+            output_dir: Directory to write output files to
+            fast: Use pydantic's model_dump_json for serialization
+            filename: Name of the JSON Lines file
+            compress: Append gzip members instead of plain text lines
+        """
+        super().__init__(output_dir, fast)
+        self.compress = compress
+        self.file_path = self.output_dir / (f"{filename}.gz" if compress else filename)
+
+    def write(self, published: PublishedContent, run_id: str) -> str:
+        """Append the run as a single JSON line."""
+        record = serialize_published(published, self.fast, indent=None)
+        line = f'{{"run_id":{json.dumps(run_id)},{record[1:]}\n'.encode("utf-8")
+        if self.compress:
+            # Each record is a complete gzip member; gzip readers concatenate them
+            line = gzip.compress(line)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd = os.open(self.file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        return str(self.file_path)
+
+
+class MarkdownSink(OutputSink):
+    """Write the formatted section as a Markdown document."""
+
+    name = "markdown"
+
+    def render(self, published: PublishedContent) -> str:
+        """Render published content as Markdown."""
+        formatted = published.formatted_content
+        lines = [f"# {formatted.get('section', 'Section')}", "", formatted.get("content", ""), ""]
+        citations = formatted.get("citations", [])
+        if citations:
+            lines.extend(["## Citations", ""])
+            lines.extend(f"- {c['text']} ({c['location']})" for c in citations)
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self, published: PublishedContent, run_id: str) -> str:
+        """Write the run to its own Markdown file atomically."""
+        file_path = self.output_dir / f"published_content_{run_id}.md"
+        atomic_write(file_path, self.render(published).encode("utf-8"))
+        return str(file_path)
+
+
+class LaTeXSink(OutputSink):
+    """Write the formatted section as a LaTeX fragment for templates/template.tex."""
+
+    name = "latex"
+
+    @staticmethod
+    def escape(text: str) -> str:
+        """Escape LaTeX special characters."""
+        return "".join(_LATEX_SPECIAL_CHARS.get(c, c) for c in text)
+
+    def render(self, published: PublishedContent) -> str:
+        """Render published content as a LaTeX section."""
+        formatted = published.formatted_content
+        paragraphs = [p.strip() for p in formatted.get("content", "").split("\n\n") if p.strip()]
+        body = "\n\n".join(self.escape(p) for p in paragraphs)
+        return f"\\section{{{self.escape(formatted.get('section', 'Section'))}}}\n\n{body}\n"
+
+    def write(self, published: PublishedContent, run_id: str) -> str:
+        """Write the run to its own .tex file atomically."""
+        file_path = self.output_dir / f"published_content_{run_id}.tex"
+        atomic_write(file_path, self.render(published).encode("utf-8"))
+        return str(file_path)
+
+
+SINKS = {sink.name: sink for sink in (JSONSink, JSONLSink, MarkdownSink, LaTeXSink)}
+
+
+def create_sinks(names: List[str], output_dir: str = "output", fast: bool = False, **options: Any) -> List[OutputSink]:
+    """
+    Create sinks by name.
+
+    Args:
+        names: Sink names (json, jsonl, markdown, latex)
+        output_dir: Directory to write output files to
+        fast: Use pydantic's model_dump_json for serialization
+        **options: Extra keyword arguments for the JSON Lines sink (filename, compress)
+
+    Returns:
+        List[OutputSink]: The created sinks
+    """
+    sinks = []
+    for name in names:
+        if name not in SINKS:
+            raise ValueError(f"Unknown output sink: {name}")
+        if name == JSONLSink.name:
+            sinks.append(JSONLSink(output_dir, fast, **options))
+        else:
+            sinks.append(SINKS[name](output_dir, fast))
+    return sinks
+
+
+def write_outputs(published: PublishedContent, sinks: List[OutputSink], run_id: Optional[str] = None) -> Dict[str, str]:
+    """
+    Write published content to several sinks concurrently.
+
+    Args:
+        published: Published content to write
+        sinks: Sinks to write to
+        run_id: Unique identifier of the run (default: a new run ID)
+
+    Returns:
+        Dict[str, str]: Written file path per sink name
+    """
+    run_id = run_id or new_run_id()
+    if len(sinks) == 1:
+        return {sinks[0].name: sinks[0].write(published, run_id)}
+
+    with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+        futures = {sink.name: executor.submit(sink.write, published, run_id) for sink in sinks}
+        return {name: future.result() for name, future in futures.items()}
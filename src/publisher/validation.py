@@ -0,0 +1,237 @@
+"""Validation engine for published content."""
+from typing import Callable, Dict, List, Any, Tuple
+import re
+
+from pydantic import BaseModel
+
+from ..citation_editor.models import CitedContent
+from .models import TextStats, ValidationResult
+
+# Word limit used when the section input does not provide one
+DEFAULT_WORD_LIMIT = 1000
+
+# Patterns are compiled once at import; word counting runs once per document
+_WORD_COUNT_MARKERS = [
+    re.compile(r'\*\*Word Count:.*?\*\*'),
+    re.compile(r'\[Word count:.*?\]'),
+    re.compile(r'Word Count:.*?\n'),
+    re.compile(r'\(\d+ words\)'),
+]
+_CONTRACTIONS = [
+    (re.compile(r'\'s\b'), ''),  # Remove possessive 's
+    (re.compile(r'\'t\b'), ' not'),  # Expand contractions
+    (re.compile(r'\'re\b'), ' are'),
+    (re.compile(r'\'ve\b'), ' have'),
+    (re.compile(r'\'m\b'), ' am'),
+    (re.compile(r'\'ll\b'), ' will'),
+    (re.compile(r'\'d\b'), ' would'),
+]
+_LINE_BREAKS = re.compile(r'[\n\r\t]')
+_SPECIAL_CHARS = re.compile(r'[^\w\s\'-]')
+_WHITESPACE = re.compile(r'\s+')
+_HYPHENATED = re.compile(r'(?<=[a-zA-Z])-(?=[a-zA-Z])')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'[.!?]+(?=\s|$)')
+_CITATION_SPAN = re.compile(r'\[[^\[\]]*\]')
+
+
+def calculate_word_count(text: str) -> int:
+    """Calculate word count properly by handling various edge cases."""
+    if not text:
+        return 0
+
+    # Remove Word Count markers
+    for pattern in _WORD_COUNT_MARKERS:
+        text = pattern.sub('', text)
+
+    # Replace line breaks and special characters with spaces
+    text = _LINE_BREAKS.sub(' ', text)
+
+    # Remove special characters except hyphens between words and apostrophes
+    text = _SPECIAL_CHARS.sub(' ', text)
+
+    # Replace multiple spaces with a single space and trim
+    text = _WHITESPACE.sub(' ', text).strip()
+
+    # Handle hyphenated words and contractions
+    text = _HYPHENATED.sub(' ', text)  # Split hyphenated words
+    for pattern, replacement in _CONTRACTIONS:
+        text = pattern.sub(replacement, text)
+
+    # Split into words and count non-empty words
+    words = [word for word in text.split() if word.strip() and any(c.isalnum() for c in word)]
+
+    return len(words)
+
+
+def compute_text_stats(text: str) -> TextStats:
+    """
+    Compute the statistics shared by all validators in a single pass over the text.
+
+    Args:
+        text: Text to analyse
+
+    Returns:
+        TextStats: Word, paragraph and sentence counts plus citation spans
+    """
+    paragraphs = [p for p in _PARAGRAPH_BREAK.split(text or "") if p.strip()]
+
+    return TextStats(
+        word_count=calculate_word_count(text),
+        paragraph_count=len(paragraphs),
+        sentence_count=len(_SENTENCE_END.findall(text or "")),
+        citation_spans=[match.span() for match in _CITATION_SPAN.finditer(text or "")]
+    )
+
+
+class ValidationContext(BaseModel):
+    """Model for everything a validator may inspect about a document."""
+    content: CitedContent
+    stats: TextStats
+    metadata: Dict[str, Any]
+    word_limit: int = DEFAULT_WORD_LIMIT
+
+
+Validator = Callable[[ValidationContext], List[str]]
+
+
+class ValidationEngine:
+    """Registry of validators run against a shared ValidationContext."""
+
+    def __init__(self):
+        """Initialize an empty validation engine."""
+        self._validators: List[Tuple[str, str, Validator]] = []
+
+    def register(self, name: str, severity: str = "issue") -> Callable[[Validator], Validator]:
+        """
+        Register a validator under a name.
+
+        Args:
+            name: Unique validator name
+            severity: "issue" to fail validation, "warning" to only report
+
+        Returns:
+            Callable: Decorator that registers the validator and returns it unchanged
+        """
+        if severity not in ("issue", "warning"):
+            raise ValueError(f"Unknown validator severity: {severity}")
+
+        def decorator(func: Validator) -> Validator:
+            self._validators = [v for v in self._validators if v[0] != name]
+            self._validators.append((name, severity, func))
+            return func
+
+        return decorator
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the registered validators, in registration order."""
+        return [name for name, _, _ in self._validators]
+
+    def run(self, context: ValidationContext) -> ValidationResult:
+        """
+        Run all registered validators against the context.
+
+        Args:
+            context: Shared validation context
+
+        Returns:
+            ValidationResult: Collected issues and warnings
+        """
+        issues = []
+        warnings = []
+
+        for _, severity, validator in self._validators:
+            messages = validator(context)
+            if severity == "issue":
+                issues.extend(messages)
+            else:
+                warnings.extend(messages)
+
+        return ValidationResult(
+            is_valid=len(issues) == 0,
+            issues=issues,
+            warnings=warnings
+        )
+
+
+# Engine used by ContentPublisher unless another one is provided
+default_engine = ValidationEngine()
+
+
+@default_engine.register("word_count")
+def validate_word_count(context: ValidationContext) -> List[str]:
+    """Validate the word count of the content."""
+    issues = []
+    target_count = context.word_limit
+    actual_count = context.stats.word_count
+
+    # Allow 10% margin above and require at least 85% of target
+    if actual_count > target_count * 1.1:
+        issues.append(f"Content exceeds word limit: {actual_count} words vs {target_count} limit")
+    elif actual_count < target_count * 0.85:
+        issues.append(f"Content is too short: {actual_count} words vs {target_count} target")
+    return issues
+
+
+@default_engine.register("citations")
+def validate_citations(context: ValidationContext) -> List[str]:
+    """Validate citation formatting and placement."""
+    issues = []
+    citations = context.content.citations
+    if len(citations) == 0:
+        issues.append("No citations found in the content")
+
+    # Check citation format
+    if not all('[' in cite.text and ']' in cite.text for cite in citations):
+        issues.append("Some citations are not properly formatted")
+
+    return issues
+
+
+@default_engine.register("structure")
+def validate_structure(context: ValidationContext) -> List[str]:
+    """Validate the structure of the content."""
+    issues = []
+
+    # Basic structure checks
+    if not context.content.cited_content.strip():
+        issues.append("Content is empty")
+    if not context.content.citations:
+        issues.append("No citations found")
+
+    return issues
+
+
+@default_engine.register("metadata")
+def validate_metadata(context: ValidationContext) -> List[str]:
+    """Validate metadata completeness."""
+    required_fields = ["author", "timestamp", "version"]
+    issues = []
+
+    for field in required_fields:
+        if field not in context.metadata:
+            issues.append(f"Missing required metadata field: {field}")
+
+    return issues
+
+
+@default_engine.register("citation_count", severity="warning")
+def warn_citation_count(context: ValidationContext) -> List[str]:
+    """Suggest more citations when there are only a few."""
+    if len(context.content.citations) < 3:
+        return ["Consider adding more citations for better academic rigor"]
+    return []
+
+
+@default_engine.register("word_count_target", severity="warning")
+def warn_word_count_target(context: ValidationContext) -> List[str]:
+    """Warn when the content drifts from the target word count."""
+    target_count = context.word_limit
+    word_count = context.stats.word_count
+
+    if word_count < target_count * 0.7:
+        return [f"Content is shorter than target: {word_count} words vs {target_count} target"]
+    if word_count > target_count * 1.1:
+        return [f"Content is longer than target: {word_count} words vs {target_count} target"]
+    return []
@@ -1,5 +1,17 @@
 """Reviewer module for evaluating content quality."""
-from .models import ReviewedContent, ReviewScore, ReviewCriteria
-from .reviewer import review_content
+from .models import ReviewedContent, ReviewScore, ReviewCriteria, ParagraphReview
 
-__all__ = ['review_content', 'ReviewedContent', 'ReviewScore', 'ReviewCriteria'] 
\ No newline at end of file
+def __getattr__(name):
+    """Import the reviewer, and with it the OpenAI client, only when it is used."""
+    if name in ('review_content', 'areview_content', 'score_content', 'ascore_content'):
+        from . import reviewer
+        return getattr(reviewer, name)
+    if name in ('review_map_reduce', 'areview_map_reduce'):
+        from . import map_reduce
+        return getattr(map_reduce, name)
+    if name in ('review_incremental', 'areview_incremental', 'ParagraphReviewCache'):
+        from . import incremental
+        return getattr(incremental, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['review_content', 'areview_content', 'score_content', 'ascore_content', 'review_incremental', 'areview_incremental', 'ParagraphReviewCache', 'review_map_reduce', 'areview_map_reduce', 'ReviewedContent', 'ReviewScore', 'ReviewCriteria', 'ParagraphReview'] 
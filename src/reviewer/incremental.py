@@ -0,0 +1,214 @@
+"""Paragraph-level review caching and incremental re-review."""
+from typing import Dict, List, Optional
+import hashlib
+import re
+import threading
+
+from .models import ReviewedContent, ReviewScore, ReviewCriteria, ParagraphReview
+from .reviewer import parse_scores, build_review, merge_weighted_scores
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, Stage, drive, adrive, response_text
+
+_PARAGRAPH_HEADER = re.compile(r'^\[Paragraph (\d+)\]\s*$', re.M)
+
+def split_paragraphs(content: str) -> List[str]:
+    """Split content into its non-empty paragraphs."""
+    return [paragraph.strip() for paragraph in content.split("\n\n") if paragraph.strip()]
+
+def paragraph_hash(paragraph: str) -> str:
+    """Hash a paragraph, ignoring differences in whitespace."""
+    return hashlib.sha256(" ".join(paragraph.split()).encode("utf-8")).hexdigest()
+
+class ParagraphReviewCache:
+    """
+    Per-paragraph review scores keyed by paragraph hash.
+
+    Paragraphs are scored on their own text, so a cached score does not see
+    changes to neighbouring paragraphs; coherence across paragraphs is only
+    re-assessed by a full review.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._reviews: Dict[str, ParagraphReview] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._reviews)
+
+    def get(self, paragraph: str) -> Optional[ParagraphReview]:
+        """Get the cached review of a paragraph, if any."""
+        with self._lock:
+            review = self._reviews.get(paragraph_hash(paragraph))
+            if review is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return review
+
+    def put(self, review: ParagraphReview):
+        """Cache a paragraph review."""
+        with self._lock:
+            self._reviews[review.paragraph_hash] = review
+
+    def seed(self, reviewed: ReviewedContent):
+        """
+        Cache the section-level scores of a full review for each of its paragraphs.
+
+        A later incremental review of a revision then only re-scores the
+        paragraphs the revision changed.
+
+        Args:
+            reviewed: Full review of a section
+        """
+        for paragraph in split_paragraphs(reviewed.content):
+            key = paragraph_hash(paragraph)
+            with self._lock:
+                if key not in self._reviews:
+                    self._reviews[key] = ParagraphReview(
+                        paragraph_hash=key,
+                        word_count=len(paragraph.split()),
+                        scores=reviewed.scores
+                    )
+
+def create_paragraph_prompt(paragraphs: List[str]) -> str:
+    """Create a prompt asking for per-paragraph scores."""
+    numbered = "\n\n".join(f"[Paragraph {i + 1}]\n{paragraph}" for i, paragraph in enumerate(paragraphs))
+    criteria = "\n".join(f"{criterion.value}: [X]/10 | Feedback: [specific feedback]" for criterion in ReviewCriteria)
+    return f"""Review each of these paragraphs from an academic text. Score every paragraph on each criterion from 1-10 (where 10 is excellent) and give brief, specific feedback.
+
+Criteria:
+- Clarity: clear, concise writing with well-explained concepts
+- Coherence: logical flow and smooth transitions within the paragraph
+- Academic Style: formal tone, appropriate vocabulary, objective presentation
+- Content Quality: accuracy, depth and balance
+- Structure: a clear topic sentence and logical progression
+
+Paragraphs:
+
+{numbered}
+
+Provide output in this exact format, one block per paragraph:
+
+PARAGRAPH SCORES:
+
+[Paragraph 1]
+{criteria}
+
+[Paragraph 2]
+...
+
+Note: Replace [X] with a numeric score between 1 and 10. For academic papers of this quality, scores should typically be in the 6-10 range unless there are significant issues."""
+
+def parse_paragraph_scores(response_text: str) -> Dict[int, Dict[str, ReviewScore]]:
+    """
+    Parse per-paragraph scores from a paragraph review response.
+
+    Args:
+        response_text: Text returned by the reviewer model
+
+    Returns:
+        Dict[int, Dict[str, ReviewScore]]: Scores keyed by criterion name, per 1-based paragraph number
+    """
+    parts = _PARAGRAPH_HEADER.split(response_text)
+    # parts alternates: preamble, number, block, number, block, ...
+    return {int(number): parse_scores(block) for number, block in zip(parts[1::2], parts[2::2])}
+
+def _score_paragraphs_steps(paragraphs: List[str]):
+    """Steps of scoring paragraphs in a single request, per model (see utils.stage)."""
+    messages = [
+        {"role": "system", "content": "You are an expert academic reviewer. Score each paragraph independently and consistently using the criteria given."},
+        {"role": "user", "content": create_paragraph_prompt(paragraphs)}
+    ]
+
+    def steps(model: str):
+        response = yield Request("review_content", messages, {"model": model})
+        parsed = parse_paragraph_scores(response_text(response))
+        reviews = []
+        complete = True
+        for i, paragraph in enumerate(paragraphs):
+            scores = parsed.get(i + 1, {})
+            complete = complete and len(scores) == len(ReviewCriteria)
+            for criterion in ReviewCriteria:
+                if criterion.name not in scores:
+                    scores[criterion.name] = ReviewScore(
+                        criterion=criterion,
+                        score=6.0,  # Default to 6.0 for missing scores
+                        feedback="No specific feedback provided for this criterion"
+                    )
+            reviews.append(ParagraphReview(
+                paragraph_hash=paragraph_hash(paragraph),
+                word_count=len(paragraph.split()),
+                scores=[scores[criterion.name] for criterion in ReviewCriteria]
+            ))
+        if not complete:
+            raise OutputRejected("not every paragraph score could be parsed", reviews)
+        return reviews
+
+    return steps
+
+def merge_paragraph_reviews(content: str, reviews: List[ParagraphReview], rescored: int) -> ReviewedContent:
+    """
+    Merge per-paragraph reviews into a review of the whole content.
+
+    Scores are merged by merge_weighted_scores: weighted by paragraph
+    length, with the feedback of the weakest paragraph.
+
+    Args:
+        content: The reviewed content
+        reviews: Reviews of its paragraphs, in order
+        rescored: Number of paragraphs scored by this review
+
+    Returns:
+        ReviewedContent: Review of the whole content
+    """
+    return merge_weighted_scores(
+        content,
+        [(review.scores, review.word_count) for review in reviews],
+        "Paragraph",
+        f"Re-scored {rescored} of {len(reviews)} paragraphs; the remaining scores were cached."
+    )
+
+def incremental_steps(content: str, cache: ParagraphReviewCache, model: Optional[str] = None):
+    """Steps of an incremental review (see utils.stage)."""
+    paragraphs = split_paragraphs(content)
+    if not paragraphs:
+        return build_review(content, {}, "No content to review")
+    reviews: List[Optional[ParagraphReview]] = [cache.get(paragraph) for paragraph in paragraphs]
+    changed = [i for i, review in enumerate(reviews) if review is None]
+
+    if changed:
+        scored = yield Stage("review_content", _score_paragraphs_steps([paragraphs[i] for i in changed]), model)
+        for i, review in zip(changed, scored):
+            cache.put(review)
+            reviews[i] = review
+
+    return merge_paragraph_reviews(content, reviews, len(changed))
+
+def review_incremental(content: str, api_key: str, cache: ParagraphReviewCache, model: Optional[str] = None) -> ReviewedContent:
+    """
+    Review content, re-scoring only the paragraphs not already in the cache.
+
+    Changed paragraphs are scored together in one request and added to the
+    cache; the result merges them with the cached paragraph scores. Seed the
+    cache with ParagraphReviewCache.seed() after a full review so that
+    reviewing a revision only costs its changed paragraphs.
+
+    Args:
+        content: Content to review
+        api_key: OpenAI API key
+        cache: Paragraph review cache, updated in place
+        model: Model to use, bypassing the model router (optional)
+
+    Returns:
+        ReviewedContent: Review of the whole content
+    """
+    return drive(incremental_steps(content, cache, model), chat_completion, api_key)
+
+async def areview_incremental(content: str, api_key: str, cache: ParagraphReviewCache,
+                              model: Optional[str] = None) -> ReviewedContent:
+    """Async counterpart of review_incremental."""
+    return await adrive(incremental_steps(content, cache, model), achat_completion, api_key)
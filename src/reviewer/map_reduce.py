@@ -0,0 +1,269 @@
+"""Map-reduce review of texts too long to review well in one prompt."""
+from typing import Dict, List, Optional, Tuple
+import re
+
+from .models import ReviewedContent, ReviewCriteria
+from .reviewer import merge_weighted_scores, review_steps
+from .incremental import split_paragraphs
+from .. import config
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, Stage, Calls, drive, adrive, run_stage, arun_stage, response_text
+from ..utils.tokens import estimate_tokens
+from ..citation_editor.claims import split_sentences
+
+# Reviews merged by one reduce call; more chunks are reduced in a tree
+REDUCE_FAN_IN = 8
+# Chunk reviews and reduce calls in flight at once for one draft
+MAX_CHUNK_WORKERS = 8
+
+_OVERALL = re.compile(r'^OVERALL FEEDBACK:\s*', re.M)
+
+def split_paragraph(paragraph: str, chunk_tokens: int) -> List[str]:
+    """
+    Cut a paragraph into pieces of at most chunk_tokens.
+
+    The paragraph is cut at sentence ends; a sentence longer than
+    chunk_tokens is cut into windows of whole words.
+
+    Args:
+        paragraph: Paragraph to cut
+        chunk_tokens: Largest estimated size of a piece
+
+    Returns:
+        List[str]: Pieces in text order
+    """
+    pieces = []
+    for sentence in split_sentences(paragraph):
+        tokens = estimate_tokens(sentence.text)
+        if tokens <= chunk_tokens:
+            pieces.append(sentence.text)
+            continue
+        words = sentence.text.split()
+        window = max(len(words) * chunk_tokens // tokens, 1)
+        pieces += [" ".join(words[i:i + window]) for i in range(0, len(words), window)]
+    return pieces
+
+def split_chunks(content: str, chunk_tokens: int) -> List[str]:
+    """
+    Group consecutive paragraphs into chunks of at most chunk_tokens.
+
+    A paragraph longer than chunk_tokens is cut by split_paragraph and its
+    pieces are grouped like paragraphs, so no chunk is much longer than
+    chunk_tokens however the text is laid out.
+
+    Args:
+        content: Content to split
+        chunk_tokens: Largest estimated size of a chunk
+
+    Returns:
+        List[str]: Chunks in text order
+    """
+    chunks: List[str] = []
+    size = 0
+    for paragraph in split_paragraphs(content):
+        tokens = estimate_tokens(paragraph)
+        pieces = [(paragraph, tokens)] if tokens <= chunk_tokens else [
+            (piece, estimate_tokens(piece)) for piece in split_paragraph(paragraph, chunk_tokens)
+        ]
+        for i, (piece, tokens) in enumerate(pieces):
+            if not chunks or size + tokens > chunk_tokens:
+                chunks.append(piece)
+                size = 0
+            else:
+                # Pieces of one paragraph stay in one paragraph
+                chunks[-1] += (" " if i else "\n\n") + piece
+            size += tokens
+    return chunks
+
+def merge_scores(content: str, parts: List[Tuple[ReviewedContent, int]]) -> ReviewedContent:
+    """
+    Merge reviews of parts of a text into a review of the whole text.
+
+    Scores are merged by merge_weighted_scores: weighted by part length,
+    with the feedback of the weakest part.
+
+    Args:
+        content: The whole text
+        parts: Reviews of its parts, in order, with their word counts
+
+    Returns:
+        ReviewedContent: Review of the whole text
+    """
+    return merge_weighted_scores(
+        content,
+        [(review.scores, words) for review, words in parts],
+        "Part",
+        " ".join(f"Part {i + 1}: {review.overall_feedback}" for i, (review, _) in enumerate(parts))
+    )
+
+def create_reduce_messages(parts: List[Tuple[ReviewedContent, int]]) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking to condense the feedback of part reviews.
+
+    Only the scores and feedback of the parts are sent, not their text.
+
+    Args:
+        parts: Reviews of the parts of a text, in order, with their word counts
+
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    blocks = []
+    for i, (review, words) in enumerate(parts):
+        lines = "\n".join(f"{score.criterion.value}: {score.score}/10 | {score.feedback}" for score in review.scores)
+        blocks.append(f"[Part {i + 1}, {words} words]\n{lines}\nOverall: {review.overall_feedback}")
+    feedback = "\n\n".join(blocks)
+    criteria = "\n".join(f"{criterion.value}: [feedback for the whole text]" for criterion in ReviewCriteria)
+
+    prompt = f"""These are reviews of consecutive parts of one academic text. Combine them into feedback for the whole text: keep the most important, specific points for each criterion and drop repetition.
+
+{feedback}
+
+Provide output in this exact format:
+
+MERGED FEEDBACK:
+{criteria}
+
+OVERALL FEEDBACK:
+[Strengths and the most important improvements for the whole text]"""
+
+    return [
+        {"role": "system", "content": "You are an expert academic reviewer. Merge reviews of parts of a text into concise feedback on the whole text."},
+        {"role": "user", "content": prompt}
+    ]
+
+def reduce_from_response(merged: ReviewedContent, response_text: str) -> ReviewedContent:
+    """
+    Replace the feedback of merged scores with the condensed feedback of a reduce response.
+
+    Args:
+        merged: Review with merged scores (see merge_scores)
+        response_text: Model output in the MERGED FEEDBACK / OVERALL FEEDBACK format
+
+    Returns:
+        ReviewedContent: The merged scores with condensed feedback
+
+    Raises:
+        OutputRejected: If feedback for some criterion is missing; carries the merged review
+    """
+    sections = _OVERALL.split(response_text, maxsplit=1)
+    overall = sections[1].strip() if len(sections) > 1 else ""
+    feedback = {}
+    for line in sections[0].split("\n"):
+        criterion, _, text = line.partition(":")
+        key = criterion.strip().upper().replace(" ", "_")
+        if key in ReviewCriteria.__members__ and text.strip():
+            feedback[key] = text.strip()
+    if len(feedback) < len(ReviewCriteria) or not overall:
+        raise OutputRejected(f"condensed feedback for {len(feedback)} of {len(ReviewCriteria)} criteria", merged)
+    return merged.model_copy(update={
+        "scores": [score.model_copy(update={"feedback": feedback[score.criterion.name]}) for score in merged.scores],
+        "overall_feedback": overall
+    })
+
+def reduce_steps(content: str, parts: List[Tuple[ReviewedContent, int]]):
+    """Steps of merging part reviews, per model (see utils.stage)."""
+    merged = merge_scores(content, parts)
+    messages = create_reduce_messages(parts)
+
+    def steps(model: str):
+        response = yield Request("reduce_reviews", messages, {"model": model})
+        return reduce_from_response(merged, response_text(response))
+
+    return steps
+
+def reduce_reviews(content: str, parts: List[Tuple[ReviewedContent, int]], api_key: str) -> ReviewedContent:
+    """
+    Merge part reviews: scores locally, feedback with one call to the cheap model.
+
+    Args:
+        content: Text the parts make up
+        parts: Reviews of the parts, in order, with their word counts
+        api_key: OpenAI API key
+
+    Returns:
+        ReviewedContent: Review of the whole text; feedback of the weakest
+            parts if the condensed feedback could not be parsed
+    """
+    return run_stage("reduce_reviews", reduce_steps(content, parts), chat_completion, api_key)
+
+async def areduce_reviews(content: str, parts: List[Tuple[ReviewedContent, int]], api_key: str) -> ReviewedContent:
+    """Async counterpart of reduce_reviews."""
+    return await arun_stage("reduce_reviews", reduce_steps(content, parts), achat_completion, api_key)
+
+def _reduce_groups(count: int, fan_in: int) -> List[range]:
+    """Indexes of the consecutive reviews merged by each reduce call of one tree level."""
+    return [range(i, min(i + fan_in, count)) for i in range(0, count, fan_in)]
+
+def _check_fan_in(fan_in: int):
+    """Reject fan-ins that would not shrink the reduce tree."""
+    if fan_in < 2:
+        raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+
+def _concurrently(calls: List[Stage]):
+    """Steps of running stages at most MAX_CHUNK_WORKERS at once, raising the first error."""
+    results = yield Calls(calls, MAX_CHUNK_WORKERS)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+def map_reduce_steps(content: str, chunk_tokens: Optional[int] = None, fan_in: int = REDUCE_FAN_IN,
+                     model: Optional[str] = None):
+    """Steps of a map-reduce review (see utils.stage and review_map_reduce)."""
+    chunks = split_chunks(content, chunk_tokens or config.REVIEW_CHUNK_TOKENS)
+    if len(chunks) <= 1:
+        return (yield Stage("review_content", review_steps(content), model))
+
+    reviews = yield from _concurrently([Stage("review_content", review_steps(chunk), model) for chunk in chunks])
+    parts = [(review, len(chunk.split())) for review, chunk in zip(reviews, chunks)]
+    texts = chunks
+
+    # Merge level by level until one reduce call can take the rest
+    while len(parts) > fan_in:
+        groups = _reduce_groups(len(parts), fan_in)
+        texts = ["\n\n".join(texts[i] for i in group) for group in groups]
+        reviews = yield from _concurrently([
+            Stage("reduce_reviews", reduce_steps(text, [parts[i] for i in group]))
+            for text, group in zip(texts, groups)
+        ])
+        parts = [(review, sum(parts[i][1] for i in group)) for review, group in zip(reviews, groups)]
+    return (yield Stage("reduce_reviews", reduce_steps(content, parts)))
+
+def review_map_reduce(content: str, api_key: str, chunk_tokens: Optional[int] = None,
+                      fan_in: int = REDUCE_FAN_IN, model: Optional[str] = None) -> ReviewedContent:
+    """
+    Review content of any length by reviewing chunks concurrently and merging the reviews.
+
+    Content that fits into one chunk gets a plain review_content. Longer
+    content is split into chunks (see split_chunks) that are reviewed at the
+    same time, at most MAX_CHUNK_WORKERS at once; their reviews are then
+    merged, fan_in at a time, by reduce_reviews. Review latency is about one
+    chunk review plus a short reduce call per level of the tree, however long
+    the content is.
+
+    Chunks are reviewed on their own text, so transitions between chunks are
+    not judged.
+
+    Args:
+        content: Content to review
+        api_key: OpenAI API key
+        chunk_tokens: Largest chunk reviewed in one prompt (default: config.REVIEW_CHUNK_TOKENS)
+        fan_in: Reviews merged by one reduce call
+        model: Model for the chunk reviews, bypassing the model router (optional)
+
+    Returns:
+        ReviewedContent: Review of the whole content
+
+    Raises:
+        ValueError: If fan_in is less than 2
+    """
+    _check_fan_in(fan_in)
+    return drive(map_reduce_steps(content, chunk_tokens, fan_in, model), chat_completion, api_key)
+
+async def areview_map_reduce(content: str, api_key: str, chunk_tokens: Optional[int] = None,
+                             fan_in: int = REDUCE_FAN_IN, model: Optional[str] = None) -> ReviewedContent:
+    """Async counterpart of review_map_reduce."""
+    _check_fan_in(fan_in)
+    return await adrive(map_reduce_steps(content, chunk_tokens, fan_in, model), achat_completion, api_key)
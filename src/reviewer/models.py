@@ -22,4 +22,10 @@ class ReviewedContent(BaseModel):
     content: str
     scores: List[ReviewScore]
     total_score: float
-    overall_feedback: str 
\ No newline at end of file
+    overall_feedback: str
+
+class ParagraphReview(BaseModel):
+    """Model for the cached review of a single paragraph."""
+    paragraph_hash: str
+    word_count: int
+    scores: List[ReviewScore]
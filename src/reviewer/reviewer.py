@@ -1,10 +1,14 @@
-from typing import List, Dict
-from openai import OpenAI
+from typing import List, Dict, Optional, Tuple
 from .models import ReviewedContent, ReviewScore, ReviewCriteria
-from .. import config
-from ..utils.cost_tracker import cost_tracker
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, Stage, drive, adrive, run_stage, arun_stage, response_text
+from ..utils.tokens import is_reasoning_model
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 def extract_score(score_text: str) -> float:
     """Extract numeric score from score text."""
     # Try to find X/10 pattern first
@@ -19,19 +23,146 @@ def extract_score(score_text: str) -> float:
     
     return 0.0
 
-def review_content(content: str, api_key: str) -> ReviewedContent:
+def parse_scores(scores_text: str) -> Dict[str, ReviewScore]:
     """
-    Review content for quality and academic standards.
+    Parse "Criterion: X/10 | Feedback: ..." lines.
     
     Args:
-        content: Content to review
-        api_key: OpenAI API key
+        scores_text: Score lines
         
     Returns:
-        ReviewedContent: Reviewed content with scores and feedback
+        Dict[str, ReviewScore]: Scores keyed by criterion name
+    """
+    scores = {}
+    for score_line in scores_text.split("\n"):
+        if ":" not in score_line or "|" not in score_line:
+            continue
+            
+        try:
+            # Split into criterion and rest
+            criterion, rest = score_line.split(":", 1)
+            criterion = criterion.strip()
+            
+            # Split rest into score and feedback
+            score_part, feedback_part = rest.split("|", 1)
+            
+            # Extract score using helper function
+            score = extract_score(score_part)
+            
+            # Extract feedback
+            feedback = feedback_part.replace("Feedback:", "").strip()
+            
+            # Convert criterion name to enum format
+            criterion_key = criterion.upper().replace(" ", "_")
+            if criterion_key in ReviewCriteria.__members__:
+                scores[criterion_key] = ReviewScore(
+                    criterion=ReviewCriteria[criterion_key],
+                    score=score,
+                    feedback=feedback
+                )
+        except (ValueError, KeyError, AttributeError) as e:
+            print(f"Warning: Could not parse score for {criterion}: {e}")
+            continue
+    return scores
+
+def parse_review(response_text: str) -> Tuple[Dict[str, ReviewScore], str]:
+    """
+    Parse the scores and overall feedback from a review response.
+    
+    Args:
+        response_text: Text returned by the reviewer model
+        
+    Returns:
+        Tuple[Dict[str, ReviewScore], str]: Scores keyed by criterion name, and overall feedback
     """
-    client = OpenAI(api_key=api_key)
+    sections = response_text.split("\n\n")
+    
+    # Initialize scores and feedback
+    scores = {}
+    overall_feedback = ""
+    
+    for section in sections:
+        if section.startswith("SCORES:"):
+            scores.update(parse_scores(section.replace("SCORES:", "").strip()))
+        elif section.startswith("OVERALL FEEDBACK:"):
+            overall_feedback = section.replace("OVERALL FEEDBACK:", "").strip()
+    
+    return scores, overall_feedback
+
+def build_review(content: str, scores: Dict[str, ReviewScore], overall_feedback: str) -> ReviewedContent:
+    """Build a ReviewedContent, filling in default scores for missing criteria."""
+    scores = dict(scores)
+    # Ensure we have all criteria with default scores
+    for criterion in ReviewCriteria:
+        if criterion.name not in scores:
+            scores[criterion.name] = ReviewScore(
+                criterion=criterion,
+                score=6.0,  # Default to 6.0 for missing scores
+                feedback="No specific feedback provided for this criterion"
+            )
+    
+    # Calculate total score (average of all scores)
+    total_score = sum(score.score for score in scores.values()) / len(scores) if scores else 6.0
     
+    return ReviewedContent(
+        content=content,
+        scores=list(scores.values()),
+        total_score=total_score,
+        overall_feedback=overall_feedback or "No overall feedback provided"
+    )
+
+def merge_weighted_scores(content: str, parts: List[Tuple[List[ReviewScore], int]], label: str,
+                          overall_feedback: str) -> ReviewedContent:
+    """
+    Merge the scores of consecutive parts of a text into a review of the whole text.
+
+    Each criterion is the average of the part scores weighted by part length;
+    its feedback is taken from the weakest part. The total score uses the
+    unrounded averages.
+
+    Args:
+        content: The whole text
+        parts: Scores of its parts, in order, with their word counts
+        label: Name of a part in the feedback, e.g. "Paragraph"
+        overall_feedback: Overall feedback of the merged review
+
+    Returns:
+        ReviewedContent: Review of the whole text
+    """
+    total_words = sum(max(words, 1) for _, words in parts)
+    scores = []
+    averages = []
+    for criterion in ReviewCriteria:
+        weighted = [
+            (i, next(s for s in part_scores if s.criterion == criterion), max(words, 1))
+            for i, (part_scores, words) in enumerate(parts)
+        ]
+        average = sum(score.score * words for _, score, words in weighted) / total_words
+        weakest_index, weakest, _ = min(weighted, key=lambda item: item[1].score)
+        averages.append(average)
+        scores.append(ReviewScore(
+            criterion=criterion,
+            score=round(average),
+            feedback=f"{label} {weakest_index + 1}: {weakest.feedback}"
+        ))
+
+    return ReviewedContent(
+        content=content,
+        scores=scores,
+        total_score=sum(averages) / len(averages),
+        overall_feedback=overall_feedback
+    )
+
+def create_review_messages(content: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking for a review of content.
+    
+    Args:
+        content: Content to review
+        
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
     prompt = f"""Review this academic text for quality. Score each criterion from 1-10 (where 10 is excellent) and provide specific feedback.
 
 Text to review:
@@ -113,84 +244,174 @@ OVERALL FEEDBACK:
 [Comprehensive feedback about strengths and specific areas for improvement]
 
 Note: Replace [X] with a numeric score between 1 and 10. Consider the score guidelines carefully when assigning scores. For academic papers of this quality, scores should typically be in the 6-10 range unless there are significant issues."""
+    
+    return [
+        {"role": "system", "content": "You are an expert academic reviewer with extensive experience in evaluating scientific papers. Evaluate the text thoroughly and provide detailed, constructive feedback. Be specific in your scoring and justify your ratings with examples from the text. Use the provided scoring guidelines to ensure consistent and fair evaluation. For academic papers of this quality, scores should typically be in the 6-10 range unless there are significant issues."},
+        {"role": "user", "content": prompt}
+    ]
 
-    response = client.chat.completions.create(
-        messages=[
-            {"role": "system", "content": "You are an expert academic reviewer with extensive experience in evaluating scientific papers. Evaluate the text thoroughly and provide detailed, constructive feedback. Be specific in your scoring and justify your ratings with examples from the text. Use the provided scoring guidelines to ensure consistent and fair evaluation. For academic papers of this quality, scores should typically be in the 6-10 range unless there are significant issues."},
-            {"role": "user", "content": prompt}
-        ],
-        model=config.MODEL_NAME,
-        temperature=config.TEMPERATURE,
-        max_tokens=config.MAX_TOKENS
-    )
+def review_from_response(content: str, response_text: str) -> ReviewedContent:
+    """
+    Parse a review response.
     
-    # Track costs
-    cost_tracker.add_call(
-        model=config.MODEL_NAME,
-        input_tokens=response.usage.prompt_tokens,
-        output_tokens=response.usage.completion_tokens,
-        operation="review_content"
-    )
+    Args:
+        content: Content that was reviewed
+        response_text: Model output in the SCORES / OVERALL FEEDBACK format
+        
+    Returns:
+        ReviewedContent: Reviewed content with scores and feedback
+        
+    Raises:
+        OutputRejected: If not every criterion could be parsed; carries the partial review
+    """
+    scores, overall_feedback = parse_review(response_text)
+    reviewed = build_review(content, scores, overall_feedback)
+    if len(scores) < len(ReviewCriteria):
+        raise OutputRejected(f"parsed {len(scores)} of {len(ReviewCriteria)} criteria", reviewed)
+    return reviewed
+
+def review_steps(content: str):
+    """Steps of a review of content, per model (see utils.stage)."""
+    messages = create_review_messages(content)
     
-    # Parse response
-    response_text = response.choices[0].message.content
-    sections = response_text.split("\n\n")
+    def steps(model: str):
+        response = yield Request("review_content", messages, {"model": model})
+        return review_from_response(content, response_text(response))
     
-    # Initialize scores and feedback
-    scores = {}
-    overall_feedback = ""
+    return steps
+
+def review_content(content: str, api_key: str, model: Optional[str] = None) -> ReviewedContent:
+    """
+    Review content for quality and academic standards.
     
-    for section in sections:
-        if section.startswith("SCORES:"):
-            scores_text = section.replace("SCORES:", "").strip()
-            for score_line in scores_text.split("\n"):
-                if ":" not in score_line or "|" not in score_line:
-                    continue
-                    
-                try:
-                    # Split into criterion and rest
-                    criterion, rest = score_line.split(":", 1)
-                    criterion = criterion.strip()
-                    
-                    # Split rest into score and feedback
-                    score_part, feedback_part = rest.split("|", 1)
-                    
-                    # Extract score using helper function
-                    score = extract_score(score_part)
-                    
-                    # Extract feedback
-                    feedback = feedback_part.replace("Feedback:", "").strip()
-                    
-                    # Convert criterion name to enum format
-                    criterion_key = criterion.upper().replace(" ", "_")
-                    if criterion_key in ReviewCriteria.__members__:
-                        scores[criterion_key] = ReviewScore(
-                            criterion=ReviewCriteria[criterion_key],
-                            score=score,
-                            feedback=feedback
-                        )
-                except (ValueError, KeyError, AttributeError) as e:
-                    print(f"Warning: Could not parse score for {criterion}: {e}")
-                    continue
-                    
-        elif section.startswith("OVERALL FEEDBACK:"):
-            overall_feedback = section.replace("OVERALL FEEDBACK:", "").strip()
+    Unless a model is given, the review comes from the model router and is
+    escalated to a stronger model when not every criterion could be parsed.
     
-    # Ensure we have all criteria with default scores
-    for criterion in ReviewCriteria:
-        if criterion.name not in scores:
-            scores[criterion.name] = ReviewScore(
-                criterion=criterion,
-                score=6.0,  # Default to 6.0 for missing scores
-                feedback="No specific feedback provided for this criterion"
+    Args:
+        content: Content to review
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+        
+    Returns:
+        ReviewedContent: Reviewed content with scores and feedback
+    """
+    return run_stage("review_content", review_steps(content), chat_completion, api_key, model)
+
+async def areview_content(content: str, api_key: str, model: Optional[str] = None) -> ReviewedContent:
+    """Async counterpart of review_content."""
+    return await arun_stage("review_content", review_steps(content), achat_completion, api_key, model)
+
+# Output cap of a ranking call: five "Criterion: N/10" lines and the heading
+RANKING_MAX_TOKENS = 60
+# Added to the cap for reasoning models, whose hidden reasoning counts as output
+REASONING_HEADROOM_TOKENS = 2000
+
+def ranking_max_tokens(model: str) -> int:
+    """Output cap of a ranking call to a model, with room for reasoning on reasoning models."""
+    return RANKING_MAX_TOKENS + (REASONING_HEADROOM_TOKENS if is_reasoning_model(model) else 0)
+
+def create_ranking_messages(content: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking for scores only, to rank drafts against each other.
+    
+    Args:
+        content: Content to score
+        
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    criteria = "\n".join(f"{criterion.value}: [X]/10" for criterion in ReviewCriteria)
+    prompt = f"""Score this academic text from 1-10 (where 10 is excellent) on each criterion:
+- Clarity: clear, concise writing and well-explained concepts
+- Coherence: logical flow and smooth transitions
+- Academic Style: formal tone and scholarly vocabulary
+- Content Quality: thorough, accurate and balanced coverage
+- Structure: well-organized paragraphs and logical progression
+
+Text to score:
+
+{content}
+
+Reply with the scores only, in this exact format and with no feedback:
+
+RANKING SCORES:
+{criteria}"""
+    
+    return [
+        {"role": "system", "content": "You are an expert academic reviewer. Score the text consistently against the criteria and reply with numbers only. For academic papers of this quality, scores should typically be in the 6-10 range unless there are significant issues."},
+        {"role": "user", "content": prompt}
+    ]
+
+def ranking_from_response(content: str, response_text: str) -> ReviewedContent:
+    """
+    Parse a scores-only ranking response.
+    
+    Args:
+        content: Content that was scored
+        response_text: Model output with "Criterion: X/10" lines
+        
+    Returns:
+        ReviewedContent: Scores without feedback
+        
+    Raises:
+        OutputRejected: If not every criterion could be parsed; carries the
+            partial review, or None when no criterion was parsed
+    """
+    scores = {}
+    for line in response_text.split("\n"):
+        if ":" not in line:
+            continue
+        criterion, rest = line.split(":", 1)
+        criterion_key = criterion.strip().upper().replace(" ", "_")
+        if criterion_key in ReviewCriteria.__members__:
+            scores[criterion_key] = ReviewScore(
+                criterion=ReviewCriteria[criterion_key],
+                score=extract_score(rest.split("|", 1)[0]),
+                feedback="Scored for ranking only"
             )
+    if not scores:
+        # Default scores would tie every draft, so there is nothing to rank on
+        raise OutputRejected("no criteria parsed", None)
+    reviewed = build_review(content, scores, "Scored for ranking only")
+    if len(scores) < len(ReviewCriteria):
+        raise OutputRejected(f"parsed {len(scores)} of {len(ReviewCriteria)} criteria", reviewed)
+    return reviewed
+
+def score_steps(content: str, model: Optional[str] = None):
+    """Steps of scoring content for ranking, with the fallback to a full review (see utils.stage)."""
+    messages = create_ranking_messages(content)
     
-    # Calculate total score (average of all scores)
-    total_score = sum(score.score for score in scores.values()) / len(scores) if scores else 6.0
+    def ranking(model: str):
+        response = yield Request("score_content", messages, {"model": model, "max_tokens": ranking_max_tokens(model)})
+        return ranking_from_response(content, response_text(response))
     
-    return ReviewedContent(
-        content=content,
-        scores=list(scores.values()),
-        total_score=total_score,
-        overall_feedback=overall_feedback or "No overall feedback provided"
-    ) 
\ No newline at end of file
+    reviewed = yield Stage("score_content", ranking, model)
+    if reviewed is None:
+        logger.warning("No ranking scores parsed; reviewing the draft in full instead")
+        reviewed = yield Stage("review_content", review_steps(content), model)
+    return reviewed
+
+def score_content(content: str, api_key: str, model: Optional[str] = None) -> ReviewedContent:
+    """
+    Score content on every criterion without feedback, for ranking drafts.
+    
+    The answer is a handful of tokens instead of a detailed review, so drafts
+    can be ranked cheaply and only the winner reviewed with review_content.
+    The output is capped by ranking_max_tokens, which also keeps the budget
+    reservation for the call small. When no score can be parsed even after
+    escalation, the content gets a full review_content instead, so it is
+    never ranked on default scores.
+    
+    Args:
+        content: Content to score
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+        
+    Returns:
+        ReviewedContent: Scores without feedback, or a full review
+    """
+    return drive(score_steps(content, model), chat_completion, api_key)
+
+async def ascore_content(content: str, api_key: str, model: Optional[str] = None) -> ReviewedContent:
+    """Async counterpart of score_content."""
+    return await adrive(score_steps(content, model), achat_completion, api_key)
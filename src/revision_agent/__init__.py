@@ -1,5 +1,11 @@
 """Revision agent module for improving content."""
 from .models import RevisionChange, RevisedContent
-from .agent import revise_content
 
-__all__ = ['revise_content', 'RevisionChange', 'RevisedContent'] 
\ No newline at end of file
+def __getattr__(name):
+    """Import the agent, and with it the OpenAI client, only when it is used."""
+    if name in ('revise_content', 'arevise_content'):
+        from . import agent
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['revise_content', 'arevise_content', 'RevisionChange', 'RevisedContent'] 
@@ -1,23 +1,20 @@
-from typing import List, Dict
-from openai import OpenAI
+from typing import List, Dict, Optional
 from .models import RevisionChange, RevisedContent
-from .. import config
-from ..utils.cost_tracker import cost_tracker
+from ..utils.llm import chat_completion, achat_completion
+from ..utils.model_router import OutputRejected
+from ..utils.stage import Request, run_stage, arun_stage, response_text
 import re
 
-def revise_content(content: str, api_key: str) -> RevisedContent:
+def create_revision_messages(content: str) -> List[Dict[str, str]]:
     """
-    Revise the content for clarity, coherence, and academic style.
+    Build the chat messages asking for a revision of content.
     
     Args:
         content: Content to revise
-        api_key: OpenAI API key
         
     Returns:
-        RevisedContent: Revised content with changes
+        List[Dict[str, str]]: System and user messages
     """
-    client = OpenAI(api_key=api_key)
-    
     # Calculate original word count
     word_count = len(re.findall(r'\b\w+\b', content))
     
@@ -62,27 +59,56 @@ Before submitting your response, you MUST:
    - All key points and arguments are preserved
    - Technical terms and concepts are accurately represented
    - Citations and references are preserved in their original form"""
+    
+    return [
+        {"role": "system", "content": "You are an expert academic editor. Focus on making meaningful improvements to clarity, coherence, and academic style while preserving the FULL content and EXACT word count. Do NOT truncate or shorten the text. Make targeted improvements while maintaining the same length and structure."},
+        {"role": "user", "content": prompt}
+    ]
 
-    response = client.chat.completions.create(
-        messages=[
-            {"role": "system", "content": "You are an expert academic editor. Focus on making meaningful improvements to clarity, coherence, and academic style while preserving the FULL content and EXACT word count. Do NOT truncate or shorten the text. Make targeted improvements while maintaining the same length and structure."},
-            {"role": "user", "content": prompt}
-        ],
-        model=config.MODEL_NAME,
-        temperature=config.TEMPERATURE,
-        max_tokens=config.MAX_TOKENS
-    )
+def parse_revision_changes(changes_text: str) -> List[RevisionChange]:
+    """
+    Parse numbered "Location: change" lines into revision changes.
     
-    # Track costs
-    cost_tracker.add_call(
-        model=config.MODEL_NAME,
-        input_tokens=response.usage.prompt_tokens,
-        output_tokens=response.usage.completion_tokens,
-        operation="revise_content"
-    )
+    Args:
+        changes_text: Lines listing the changes, without their heading
+        
+    Returns:
+        List[RevisionChange]: One change per well-formed line
+    """
+    revision_changes = []
+    for change in changes_text.strip().split("\n"):
+        if not change.strip() or ":" not in change:
+            continue
+        try:
+            # Extract location and change description
+            location, description = change.split(":", 1)
+            # Remove any numbering from the location
+            location = re.sub(r'^\d+\.\s*', '', location.strip())
+            description = description.strip()
+            
+            revision_changes.append(RevisionChange(
+                type="revision",
+                location=location,
+                change=description
+            ))
+        except ValueError:
+            continue
+    return revision_changes
+
+def revision_from_response(content: str, response_text: str) -> RevisedContent:
+    """
+    Parse a revision response.
     
-    # Parse response
-    response_text = response.choices[0].message.content
+    Args:
+        content: Content that was revised
+        response_text: Model output with "Revised content:" and "Revision changes:" sections
+        
+    Returns:
+        RevisedContent: Revised content with changes
+        
+    Raises:
+        OutputRejected: If no revised content was found; carries the original content
+    """
     sections = response_text.split("\n\n")
     
     revised_content = ""
@@ -92,24 +118,9 @@ Before submitting your response, you MUST:
         if section.startswith("Revised content:"):
             revised_content = section.replace("Revised content:", "").strip()
         elif section.startswith("Revision changes:"):
-            changes_text = section.replace("Revision changes:", "").strip()
-            for change in changes_text.split("\n"):
-                if not change.strip() or ":" not in change:
-                    continue
-                try:
-                    # Extract location and change description
-                    location, description = change.split(":", 1)
-                    # Remove any numbering from the location
-                    location = re.sub(r'^\d+\.\s*', '', location.strip())
-                    description = description.strip()
-                    
-                    revision_changes.append(RevisionChange(
-                        type="revision",
-                        location=location,
-                        change=description
-                    ))
-                except ValueError:
-                    continue
+            revision_changes = parse_revision_changes(section.replace("Revision changes:", ""))
+    
+    rejected = not revised_content.strip()
     
     # If no revised content was found or it's empty, use original content
     if not revised_content or not revised_content.strip():
@@ -123,9 +134,43 @@ Before submitting your response, you MUST:
             change="No specific changes were needed; the text was already well-written."
         ))
     
-    return RevisedContent(
+    result = RevisedContent(
         original_content=content,
         revised_content=revised_content,
         revision_changes=revision_changes,
         revision_summary=f"Made {len(revision_changes)} revisions to improve clarity, coherence, and style while preserving the full content."
-    ) 
\ No newline at end of file
+    )
+    if rejected:
+        raise OutputRejected("no revised content found", result)
+    return result
+
+def revision_steps(content: str):
+    """Steps of a revision of content, per model (see utils.stage)."""
+    messages = create_revision_messages(content)
+    
+    def steps(model: str):
+        response = yield Request("revise_content", messages, {"model": model})
+        return revision_from_response(content, response_text(response))
+    
+    return steps
+
+def revise_content(content: str, api_key: str, model: Optional[str] = None) -> RevisedContent:
+    """
+    Revise the content for clarity, coherence, and academic style.
+    
+    Unless a model is given, the revision comes from the model router and is
+    escalated to a stronger model when no revised content could be parsed.
+    
+    Args:
+        content: Content to revise
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+        
+    Returns:
+        RevisedContent: Revised content with changes
+    """
+    return run_stage("revise_content", revision_steps(content), chat_completion, api_key, model)
+
+async def arevise_content(content: str, api_key: str, model: Optional[str] = None) -> RevisedContent:
+    """Async counterpart of revise_content."""
+    return await arun_stage("revise_content", revision_steps(content), achat_completion, api_key, model)
@@ -0,0 +1,6 @@
+"""Service module for running pipeline jobs in a long-lived process."""
+from .models import Job, JobRequest, JobStatus
+from .jobs import JobManager
+from .server import ServiceServer, serve
+
+__all__ = ['Job', 'JobRequest', 'JobStatus', 'JobManager', 'ServiceServer', 'serve']
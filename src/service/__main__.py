@@ -0,0 +1,21 @@
+"""Run the service: python -m src.service --port 8080 --workers 4"""
+import argparse
+
+from .. import config
+from .server import serve
+
+
+def main():
+    """Parse arguments and serve."""
+    parser = argparse.ArgumentParser(description="Journal writer job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    config.validate_config()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Job queue and worker pool for the service."""
+from typing import Deque, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+import threading
+import uuid
+
+from .. import config
+from ..publisher.models import PublishedContent
+from ..utils.budget import Budget
+from ..utils.deadline import Deadline
+from .models import Job, JobRequest, JobStatus
+
+class JobNotFoundError(KeyError):
+    """Raised when a job ID is unknown."""
+
+class JobManager:
+    """
+    Queue jobs and run them on a shared worker pool.
+
+    Finished jobs and their results are kept until more than keep_finished
+    jobs have finished; the oldest are then forgotten, so a long-lived
+    service does not grow without bound.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, workers: int = 4, keep_finished: Optional[int] = None):
+        """
+        Initialize the job manager.
+
+        Args:
+            api_key: OpenAI API key (default: config.OPENAI_API_KEY)
+            workers: Number of jobs run at the same time
+            keep_finished: Finished jobs kept for status and result requests
+                (default: config.MAX_FINISHED_JOBS)
+        """
+        # Import the pipeline once so every job reuses the loaded stages and warm clients
+        from ..pipeline import run_section
+
+        self._run_section = run_section
+        self.api_key = api_key or config.OPENAI_API_KEY
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, Future] = {}
+        self._results: Dict[str, List[PublishedContent]] = {}
+        self._finished: Deque[str] = deque()
+        self.keep_finished = config.MAX_FINISHED_JOBS if keep_finished is None else keep_finished
+        self._lock = threading.Lock()
+
+    def submit(self, request: JobRequest) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            request: Sections to write and generation options
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(id=uuid.uuid4().hex, request=request, created_at=datetime.now().isoformat())
+        with self._lock:
+            self._jobs[job.id] = job
+            self._results[job.id] = []
+            self._futures[job.id] = self._executor.submit(self._run, job.id)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Get a job by ID."""
+        with self._lock:
+            if job_id not in self._jobs:
+                raise JobNotFoundError(job_id)
+            return self._jobs[job_id].model_copy()
+
+    def list(self) -> List[Job]:
+        """List all jobs."""
+        with self._lock:
+            return [job.model_copy() for job in self._jobs.values()]
+
+    def result(self, job_id: str) -> List[PublishedContent]:
+        """Get the sections published so far by a job."""
+        with self._lock:
+            if job_id not in self._results:
+                raise JobNotFoundError(job_id)
+            return list(self._results[job_id])
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a job.
+
+        Queued jobs are removed from the queue. Running jobs stop after the
+        section in progress; sections already published are kept.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Job: The job after the cancellation request
+        """
+        with self._lock:
+            if job_id not in self._jobs:
+                raise JobNotFoundError(job_id)
+            job = self._jobs[job_id]
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                job.cancel_requested = True
+                if self._futures[job_id].cancel():
+                    job.status = JobStatus.CANCELLED
+                    self._finish(job)
+            return job.model_copy()
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Job:
+        """Block until a job has finished and return it."""
+        with self._lock:
+            if job_id not in self._futures:
+                raise JobNotFoundError(job_id)
+            future = self._futures[job_id]
+        if not future.cancelled():
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and shut down the worker pool."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _finish(self, job: Job):
+        """Mark a job finished and forget the oldest finished jobs over the limit; call with the lock held."""
+        job.finished_at = datetime.now().isoformat()
+        self._finished.append(job.id)
+        while len(self._finished) > self.keep_finished:
+            job_id = self._finished.popleft()
+            del self._jobs[job_id], self._results[job_id], self._futures[job_id]
+
+    def _run(self, job_id: str):
+        """Run a job on a worker thread."""
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now().isoformat()
+
+        # Sections of a job share one budget and deadline, capped like a batch run
+        budget = Budget(config.MAX_COST_PER_RUN, config.MAX_TOKENS_PER_RUN, name=job.request.type)
+        deadline = Deadline(config.JOB_TIMEOUT, name=job.request.type)
+        try:
+            for section_input in job.request.sections:
+                if job.cancel_requested:
+                    break
+                published = self._run_section(section_input, self.api_key, job.request.num_versions,
+                                               budget=budget, deadline=deadline)
+                with self._lock:
+                    self._results[job_id].append(published)
+                    job.sections_completed += 1
+            status, error = (JobStatus.CANCELLED if job.cancel_requested else JobStatus.SUCCEEDED), None
+        except Exception as e:
+            status, error = JobStatus.FAILED, f"{type(e).__name__}: {e}"
+
+        with self._lock:
+            job.status = status
+            job.error = error
+            self._finish(job)
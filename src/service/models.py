@@ -0,0 +1,38 @@
+"""Models for service jobs."""
+from typing import List, Optional, Dict, Any
+from enum import Enum
+from pydantic import BaseModel, Field
+from ..input_handler.content_input import ContentInput
+
+class JobStatus(str, Enum):
+    """Enumeration of job states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobRequest(BaseModel):
+    """Model for a section or paper job submitted to the service."""
+    type: str = Field("section", description="Job type: section or paper")
+    sections: List[ContentInput] = Field(..., min_length=1, description="Sections to write, in paper order")
+    num_versions: int = Field(3, gt=0, description="Number of drafts to generate per section")
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "JobRequest":
+        """Create a request from a JSON body with either a section or a list of sections."""
+        if "section" in payload:
+            return cls(type="section", sections=[payload["section"]], num_versions=payload.get("num_versions", 3))
+        return cls(type="paper", sections=payload.get("sections", []), num_versions=payload.get("num_versions", 3))
+
+class Job(BaseModel):
+    """Model for the state of a submitted job."""
+    id: str
+    request: JobRequest
+    status: JobStatus = JobStatus.QUEUED
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    sections_completed: int = 0
+    cancel_requested: bool = False
+    error: Optional[str] = None
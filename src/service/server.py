@@ -0,0 +1,141 @@
+"""HTTP front end for the job manager.
+
+Endpoints:
+    GET    /health               Service status and queue size
+    GET    /metrics              Concurrency limit and hedging of API calls
+    POST   /jobs                 Submit {"section": {...}} or {"sections": [...]}
+    GET    /jobs                 List jobs
+    GET    /jobs/<id>            Job status
+    GET    /jobs/<id>/result     Sections published so far
+    DELETE /jobs/<id>            Cancel a job
+"""
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+
+from pydantic import ValidationError
+from .. import config
+from ..utils.concurrency import get_limiter
+from ..utils.hedging import hedger
+from .jobs import JobManager, JobNotFoundError
+from .models import JobRequest, JobStatus
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Route requests to the job manager."""
+
+    server: "ServiceServer"
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+    def _send_json(self, status: int, payload):
+        """Send a JSON response."""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _parts(self):
+        """Split the request path into its segments."""
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def do_GET(self):
+        """Handle status, listing and result requests."""
+        manager = self.server.manager
+        parts = self._parts()
+        try:
+            if parts == ["health"]:
+                jobs = manager.list()
+                queued = sum(job.status == JobStatus.QUEUED for job in jobs)
+                running = sum(job.status == JobStatus.RUNNING for job in jobs)
+                self._send_json(200, {"status": "ok", "queued": queued, "running": running})
+            elif parts == ["metrics"]:
+                self._send_json(200, {
+                    "concurrency": get_limiter().report() if config.ADAPTIVE_CONCURRENCY else None,
+                    "hedging": hedger.report()
+                })
+            elif parts == ["jobs"]:
+                self._send_json(200, [job.model_dump(mode="json", exclude={"request"}) for job in manager.list()])
+            elif len(parts) == 2 and parts[0] == "jobs":
+                self._send_json(200, manager.get(parts[1]).model_dump(mode="json"))
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                job = manager.get(parts[1])
+                results = [published.model_dump(mode="json") for published in manager.result(parts[1])]
+                self._send_json(200, {"status": job.status.value, "results": results})
+            else:
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+        except JobNotFoundError:
+            self._send_json(404, {"error": f"Unknown job {parts[1]}"})
+
+    def do_POST(self):
+        """Handle job submission."""
+        if self._parts() != ["jobs"]:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = JobRequest.from_payload(json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, ValidationError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(202, self.server.manager.submit(request).model_dump(mode="json"))
+
+    def do_DELETE(self):
+        """Handle job cancellation."""
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            self._send_json(200, self.server.manager.cancel(parts[1]).model_dump(mode="json"))
+        except JobNotFoundError:
+            self._send_json(404, {"error": f"Unknown job {parts[1]}"})
+
+
+class ServiceServer(ThreadingHTTPServer):
+    """HTTP server holding the shared job manager."""
+
+    daemon_threads = True
+
+    def __init__(self, manager: JobManager, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Initialize the server.
+
+        Args:
+            manager: Job manager that runs submitted jobs
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        super().__init__((host, port), _Handler)
+        self.manager = manager
+
+    @property
+    def url(self) -> str:
+        """Base URL of the service."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, workers: int = 4, api_key: Optional[str] = None):
+    """
+    Run the service until interrupted.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Number of jobs run at the same time
+        api_key: OpenAI API key (default: config.OPENAI_API_KEY)
+    """
+    manager = JobManager(api_key=api_key, workers=workers)
+    server = ServiceServer(manager, host, port)
+    print(f"Journal writer service listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.shutdown(wait=False)
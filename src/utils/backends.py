@@ -0,0 +1,258 @@
+"""Pluggable backends that serve the chat completions of every stage.
+
+The default backend sends requests to the OpenAI API. The recording backend
+wraps another backend and appends each request/response pair, with its
+latency, to a cassette file; the replay backend serves those pairs back
+without any network access, sleeping for the original (or scaled) latency.
+Together they make end-to-end pipeline runs repeatable offline.
+"""
+from typing import Dict, List, Optional, Any
+from collections import defaultdict, deque
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .. import config
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a request is not on the cassette."""
+
+# Parameters that change the response; others (max_tokens caps set by budgets,
+# timeouts) may differ between recording and replay
+KEY_PARAMS = ("model", "n", "temperature")
+
+def request_key(messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """
+    Identify a request by its messages and response-shaping parameters.
+
+    Args:
+        messages: Chat messages
+        params: Parameters for chat.completions.create
+
+    Returns:
+        str: SHA-256 of the canonical JSON of the request
+    """
+    params = {name: params.get(name) for name in KEY_PARAMS}
+    payload = json.dumps({"messages": messages, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMBackend:
+    """Base class for chat completion backends."""
+
+    name = "base"
+
+    def create(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """
+        Create a chat completion.
+
+        Args:
+            messages: Chat messages to send
+            api_key: OpenAI API key
+            **params: Parameters for chat.completions.create
+
+        Returns:
+            ChatCompletion: The response
+        """
+        raise NotImplementedError
+
+    async def acreate(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """
+        Create a chat completion without blocking the event loop.
+
+        Backends without native async support run create() on a worker thread.
+
+        Args:
+            messages: Chat messages to send
+            api_key: OpenAI API key
+            **params: Parameters for chat.completions.create
+
+        Returns:
+            ChatCompletion: The response
+        """
+        return await asyncio.to_thread(self.create, messages, api_key, **params)
+
+class OpenAIBackend(LLMBackend):
+    """Send requests to the OpenAI API (or config.OPENAI_BASE_URL)."""
+
+    name = "openai"
+
+    def create(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Create a chat completion with the shared OpenAI client."""
+        from .llm import get_client
+
+        return get_client(api_key).chat.completions.create(messages=messages, **params)
+
+    async def acreate(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Create a chat completion with the shared AsyncOpenAI client of the running loop."""
+        from .llm import get_async_client
+
+        return await get_async_client(api_key).chat.completions.create(messages=messages, **params)
+
+def live_backend() -> LLMBackend:
+    """The backend for real API calls: a client pool when config.LLM_ENDPOINTS is set."""
+    if config.LLM_ENDPOINTS:
+        from .client_pool import PooledBackend
+        return PooledBackend()
+    return OpenAIBackend()
+
+class RecordingBackend(LLMBackend):
+    """Pass requests to another backend and record each exchange on a cassette."""
+
+    name = "record"
+
+    def __init__(self, path: str, inner: Optional[LLMBackend] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Cassette file (JSON Lines); new exchanges are appended
+            inner: Backend that answers the requests (default: live_backend())
+        """
+        self.path = path
+        self.inner = inner or live_backend()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _record(self, messages: List[Dict[str, str]], params: Dict[str, Any], response, latency: float):
+        """Append an exchange to the cassette."""
+        # The API key is never written to the cassette
+        line = json.dumps({
+            "key": request_key(messages, params),
+            "request": {"messages": messages, "params": params},
+            "response": response.model_dump(mode="json"),
+            "latency": latency
+        }, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def create(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Create a chat completion and append the exchange to the cassette."""
+        start = time.perf_counter()
+        response = self.inner.create(messages, api_key, **params)
+        self._record(messages, params, response, time.perf_counter() - start)
+        return response
+
+    async def acreate(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Create a chat completion with the inner backend's async path and record it."""
+        start = time.perf_counter()
+        response = await self.inner.acreate(messages, api_key, **params)
+        self._record(messages, params, response, time.perf_counter() - start)
+        return response
+
+class ReplayBackend(LLMBackend):
+    """Serve recorded responses from a cassette without network access."""
+
+    name = "replay"
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        """
+        Initialize the backend.
+
+        Identical requests recorded several times (e.g. concurrent drafts of
+        one prompt) are replayed in recording order; once they run out the
+        last response is repeated.
+
+        Args:
+            path: Cassette file written by RecordingBackend
+            latency_scale: Multiplier for the recorded latencies (0 replays instantly)
+        """
+        self.path = path
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self._exchanges: Dict[str, deque] = defaultdict(deque)
+        self._last: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    exchange = json.loads(line)
+                    self._exchanges[exchange["key"]].append(exchange)
+
+    def __len__(self) -> int:
+        """Number of exchanges not yet replayed."""
+        return sum(len(queue) for queue in self._exchanges.values())
+
+    def create(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Serve the recorded response to a request."""
+        from openai.types.chat import ChatCompletion
+
+        key = request_key(messages, params)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if queue:
+                exchange = self._last[key] = queue.popleft()
+            elif key in self._last:
+                exchange = self._last[key]
+            else:
+                raise CassetteMiss(f"No recorded response for request {key[:12]} in {self.path}")
+            self.hits += 1
+
+        if self.latency_scale:
+            delay = exchange["latency"] * self.latency_scale
+            timeout = params.get("timeout")
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"Replayed request {key[:12]} timed out after {timeout:.2f}s")
+            time.sleep(delay)
+        return ChatCompletion.model_validate(exchange["response"])
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+def create_backend(mode: Optional[str] = None, cassette: Optional[str] = None,
+                   latency_scale: Optional[float] = None) -> LLMBackend:
+    """
+    Create a backend from a mode name.
+
+    Args:
+        mode: "openai", "record" or "replay" (default: config.LLM_BACKEND)
+        cassette: Cassette file for record and replay (default: config.CASSETTE_PATH)
+        latency_scale: Replay latency multiplier (default: config.REPLAY_LATENCY_SCALE)
+
+    Returns:
+        LLMBackend: The backend
+
+    Raises:
+        ValueError: If the mode is unknown or a cassette is needed but missing
+    """
+    mode = mode or config.LLM_BACKEND
+    if mode == "openai":
+        return live_backend()
+    cassette = cassette or config.CASSETTE_PATH
+    if not cassette:
+        raise ValueError(f"The {mode} backend needs a cassette file (CASSETTE_PATH)")
+    if mode == "record":
+        return RecordingBackend(cassette)
+    if mode == "replay":
+        scale = config.REPLAY_LATENCY_SCALE if latency_scale is None else latency_scale
+        return ReplayBackend(cassette, scale)
+    raise ValueError(f"Unknown LLM backend '{mode}'. Available: openai, record, replay")
+
+def get_backend() -> LLMBackend:
+    """Get the backend used by chat_completion, creating it from the config on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+def set_backend(backend: Optional[LLMBackend]) -> Optional[LLMBackend]:
+    """
+    Replace the backend used by chat_completion.
+
+    Args:
+        backend: New backend (None to recreate it from the config on next use)
+
+    Returns:
+        Optional[LLMBackend]: The previous backend
+    """
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    return previous
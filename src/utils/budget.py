@@ -0,0 +1,227 @@
+"""Hard cost and token budgets enforced before each API call."""
+from typing import Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+
+from .. import config
+from .cost_tracker import cost_tracker
+from .tokens import estimate_message_tokens
+
+# Output tokens reserved for a call when its prompt is shorter than this; most
+# stages answer with about as much text as they are given
+MIN_OUTPUT_RESERVE = 1000
+
+logger = logging.getLogger(__name__)
+
+_active_budget: ContextVar[Optional["Budget"]] = ContextVar("budget", default=None)
+
+class BudgetExceeded(Exception):
+    """Raised when a call would take a budget over its cost or token cap."""
+
+    def __init__(self, budget: "Budget", cost: float, tokens: int):
+        """
+        Initialize the exception.
+
+        Args:
+            budget: The budget whose cap would be exceeded
+            cost: Estimated cost of the refused call in USD
+            tokens: Estimated tokens of the refused call
+        """
+        super().__init__(
+            f"{budget.name} budget exceeded: call needs ~${cost:.4f} / ~{tokens} tokens, "
+            f"${budget.remaining_cost():.4f} / {budget.remaining_tokens()} tokens left"
+        )
+        self.budget = budget
+        self.cost = cost
+        self.tokens = tokens
+
+def estimate_output_tokens(input_tokens: int, max_tokens: int) -> int:
+    """Estimate the completion tokens to reserve for a prompt of a given size."""
+    return min(max_tokens, max(input_tokens, MIN_OUTPUT_RESERVE))
+
+class Budget:
+    """
+    A cost and token cap shared by the calls of a section, paper or batch.
+
+    Budgets nest: a section budget can have a paper or batch budget as its
+    parent, and a call must fit into every budget up the chain. Calls reserve
+    their estimated cost before they are sent and settle the actual cost
+    afterwards, so concurrent calls cannot overshoot the cap together.
+    """
+
+    def __init__(self, max_cost: Optional[float] = None, max_tokens: Optional[int] = None,
+                 name: str = "run", parent: Optional["Budget"] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            max_cost: Cap in USD (None for no cap)
+            max_tokens: Cap on input plus output tokens (None for no cap)
+            name: Name used in error messages and reports
+            parent: Enclosing budget the same calls also count against
+        """
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.name = name
+        self.parent = parent
+        self.spent_cost = 0.0
+        self.spent_tokens = 0
+        self.reserved_cost = 0.0
+        self.reserved_tokens = 0
+        self.downgrades = 0
+        self._lock = threading.Lock()
+
+    def _chain(self) -> List["Budget"]:
+        """This budget and its ancestors."""
+        chain, budget = [], self
+        while budget is not None:
+            chain.append(budget)
+            budget = budget.parent
+        return chain
+
+    def remaining_cost(self) -> Optional[float]:
+        """USD left before the tightest cost cap in the chain (None if uncapped)."""
+        remaining = [
+            budget.max_cost - budget.spent_cost - budget.reserved_cost
+            for budget in self._chain() if budget.max_cost is not None
+        ]
+        return max(0.0, min(remaining)) if remaining else None
+
+    def remaining_tokens(self) -> Optional[int]:
+        """Tokens left before the tightest token cap in the chain (None if uncapped)."""
+        remaining = [
+            budget.max_tokens - budget.spent_tokens - budget.reserved_tokens
+            for budget in self._chain() if budget.max_tokens is not None
+        ]
+        return max(0, min(remaining)) if remaining else None
+
+    def fits(self, cost: float, tokens: int) -> bool:
+        """Check whether a call of the given size fits into every budget in the chain."""
+        remaining_cost, remaining_tokens = self.remaining_cost(), self.remaining_tokens()
+        return ((remaining_cost is None or cost <= remaining_cost)
+                and (remaining_tokens is None or tokens <= remaining_tokens))
+
+    def reserve(self, cost: float, tokens: int, downgraded: bool = False) -> Tuple[float, int]:
+        """
+        Reserve budget for a call.
+
+        Args:
+            cost: Estimated cost in USD
+            tokens: Estimated input plus output tokens
+            downgraded: Count the call as downgraded to the cheap model
+
+        Returns:
+            Tuple[float, int]: The reservation, to pass to settle()
+
+        Raises:
+            BudgetExceeded: If the call does not fit into the budget
+        """
+        chain = self._chain()
+        for budget in reversed(chain):
+            budget._lock.acquire()
+        try:
+            if not self.fits(cost, tokens):
+                raise BudgetExceeded(self, cost, tokens)
+            for budget in chain:
+                budget.reserved_cost += cost
+                budget.reserved_tokens += tokens
+            if downgraded:
+                self.downgrades += 1
+        finally:
+            for budget in chain:
+                budget._lock.release()
+        return cost, tokens
+
+    def settle(self, reservation: Tuple[float, int], cost: float = 0.0, tokens: int = 0):
+        """
+        Release a reservation and charge the actual cost of the call.
+
+        Args:
+            reservation: Value returned by reserve()
+            cost: Actual cost in USD (0 if the call failed)
+            tokens: Actual input plus output tokens
+        """
+        reserved_cost, reserved_tokens = reservation
+        for budget in self._chain():
+            with budget._lock:
+                budget.reserved_cost -= reserved_cost
+                budget.reserved_tokens -= reserved_tokens
+                budget.spent_cost += cost
+                budget.spent_tokens += tokens
+
+    def report(self) -> Dict:
+        """Spend and caps of this budget, for run metadata."""
+        return {
+            "name": self.name,
+            "max_cost": self.max_cost,
+            "max_tokens": self.max_tokens,
+            "spent_cost": self.spent_cost,
+            "spent_tokens": self.spent_tokens,
+            "remaining_cost": self.remaining_cost(),
+            "remaining_tokens": self.remaining_tokens(),
+            "downgrades": self.downgrades
+        }
+
+def current_budget() -> Optional[Budget]:
+    """The budget calls in the current context are charged to, if any."""
+    return _active_budget.get()
+
+@contextmanager
+def use_budget(budget: Budget) -> Iterator[Budget]:
+    """
+    Charge the calls made in the current context to a budget.
+
+    Threads only see the budget when they run in a copy of this context
+    (contextvars.copy_context).
+    """
+    token = _active_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _active_budget.reset(token)
+
+def reserve_call(budget: Budget, messages: List[Dict[str, str]], params: Dict,
+                 input_tokens: Optional[int] = None) -> Tuple[float, int]:
+    """
+    Reserve budget for a chat completion, adjusting its parameters to fit.
+
+    The prompt is estimated locally and the completion is assumed to be about
+    as long as the prompt. If the call does not fit on the requested model it
+    is downgraded to config.CHEAP_MODEL_NAME, and max_tokens is capped so a
+    token budget cannot be overrun by a long completion.
+
+    Args:
+        budget: Budget to charge
+        messages: Chat messages to send
+        params: Parameters for chat.completions.create; model and max_tokens
+            are updated in place
+        input_tokens: Estimated prompt tokens, if already known
+
+    Returns:
+        Tuple[float, int]: The reservation, to pass to Budget.settle()
+
+    Raises:
+        BudgetExceeded: If the call does not fit even on the cheap model
+    """
+    choices = params.get("n", 1)
+    if input_tokens is None:
+        input_tokens = estimate_message_tokens(messages, params["model"])
+    remaining_tokens = budget.remaining_tokens()
+    if remaining_tokens is not None:
+        params["max_tokens"] = max(1, min(params["max_tokens"], (remaining_tokens - input_tokens) // choices))
+    output_tokens = estimate_output_tokens(input_tokens, params["max_tokens"]) * choices
+    tokens = input_tokens + output_tokens
+
+    cost = cost_tracker.calculate_cost(params["model"], input_tokens, output_tokens)
+    if budget.fits(cost, tokens):
+        return budget.reserve(cost, tokens)
+    cheap_model = config.CHEAP_MODEL_NAME
+    cheap_cost = cost_tracker.calculate_cost(cheap_model, input_tokens, output_tokens)
+    if cheap_model == params["model"] or cheap_cost >= cost or not budget.fits(cheap_cost, tokens):
+        return budget.reserve(cost, tokens)
+    reservation = budget.reserve(cheap_cost, tokens, downgraded=True)
+    logger.warning("%s budget low; downgrading call from %s to %s", budget.name, params["model"], cheap_model)
+    params["model"] = cheap_model
+    return reservation
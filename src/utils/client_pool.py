@@ -0,0 +1,248 @@
+"""Spread requests over several API endpoints and keys, avoiding unhealthy ones.
+
+Each endpoint is a (base_url, api_key) pair, for example several OpenAI keys
+or a proxy deployment next to the OpenAI API. Requests go to the endpoint
+with the fewest requests in flight relative to its weight, so rate limits add
+up across keys. Endpoints that keep failing have their circuit opened and are
+skipped for a cooldown, after which a single probe request decides whether
+they are used again.
+"""
+from typing import Any, Dict, List, Optional
+import threading
+import time
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from .. import config
+from .backends import LLMBackend
+from .deadline import current_deadline
+
+# Errors that say something about the endpoint rather than the request
+ENDPOINT_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+class NoHealthyEndpoint(RuntimeError):
+    """Raised when every endpoint of a pool has its circuit open."""
+
+class Endpoint:
+    """An API endpoint and key, with its load and health."""
+
+    def __init__(self, base_url: Optional[str], api_key: str, weight: float = 1.0):
+        """
+        Initialize the endpoint.
+
+        Args:
+            base_url: API endpoint (None for the OpenAI default)
+            api_key: API key for the endpoint
+            weight: Relative share of the traffic the endpoint can take
+
+        Raises:
+            ValueError: If the weight is not positive
+        """
+        if not weight > 0:
+            raise ValueError(f"Endpoint weight must be positive, got {weight}")
+        self.base_url = base_url
+        self.api_key = api_key
+        self.weight = weight
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._client = None
+
+    @property
+    def name(self) -> str:
+        """Endpoint URL and the last characters of its key, safe to log."""
+        return f"{self.base_url or 'openai'} (...{self.api_key[-4:]})"
+
+    @property
+    def client(self):
+        """Shared client for the endpoint; failures are retried on other endpoints instead."""
+        if self._client is None:
+            from .llm import get_client
+            self._client = get_client(self.api_key, self.base_url).with_options(max_retries=0)
+        return self._client
+
+    def report(self) -> Dict:
+        """Load and health of the endpoint, for run metadata."""
+        return {
+            "endpoint": self.name,
+            "weight": self.weight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "outstanding": self.outstanding,
+            "circuit_open": self.opened_at is not None
+        }
+
+def parse_endpoints(spec: str) -> List[Endpoint]:
+    """
+    Parse endpoints from a comma-separated list of "base_url|api_key|weight".
+
+    The base URL may be empty for the OpenAI default and the weight may be
+    left out, e.g. "|sk-one,|sk-two,https://proxy.example/v1|sk-three|2".
+
+    Args:
+        spec: Endpoint list, as in config.LLM_ENDPOINTS
+
+    Returns:
+        List[Endpoint]: The endpoints
+
+    Raises:
+        ValueError: If an entry has no API key or a weight that is not positive
+    """
+    endpoints = []
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        parts = [part.strip() for part in entry.split("|")]
+        if len(parts) < 2 or not parts[1]:
+            raise ValueError(f"Endpoint '{entry}' needs an API key: base_url|api_key|weight")
+        weight = float(parts[2]) if len(parts) > 2 and parts[2] else 1.0
+        endpoints.append(Endpoint(parts[0] or None, parts[1], weight))
+    return endpoints
+
+class ClientPool:
+    """Least-outstanding-requests balancing, weighted, with a circuit breaker per endpoint."""
+
+    def __init__(self, endpoints: List[Endpoint], failure_threshold: Optional[int] = None,
+                 cooldown: Optional[float] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            endpoints: Endpoints to spread requests over
+            failure_threshold: Consecutive failures that open an endpoint's circuit
+                (default: config.ENDPOINT_FAILURE_THRESHOLD)
+            cooldown: Seconds an open circuit is skipped before it is probed
+                (default: config.ENDPOINT_COOLDOWN)
+
+        Raises:
+            ValueError: If no endpoints are given
+        """
+        if not endpoints:
+            raise ValueError("A client pool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.failure_threshold = failure_threshold if failure_threshold is not None else config.ENDPOINT_FAILURE_THRESHOLD
+        self.cooldown = cooldown if cooldown is not None else config.ENDPOINT_COOLDOWN
+        self._lock = threading.Lock()
+
+    def _available(self, endpoint: Endpoint, now: float) -> bool:
+        """Check whether an endpoint may take a request (closed, or half-open and not yet probed)."""
+        if endpoint.opened_at is None:
+            return True
+        return now - endpoint.opened_at >= self.cooldown and not endpoint.probing
+
+    def acquire(self, exclude: Optional[List[Endpoint]] = None) -> Endpoint:
+        """
+        Pick the endpoint for a request and count it as outstanding.
+
+        Args:
+            exclude: Endpoints already tried for this request
+
+        Returns:
+            Endpoint: The least loaded available endpoint, relative to its weight
+
+        Raises:
+            NoHealthyEndpoint: If every endpoint not excluded has its circuit open
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                endpoint for endpoint in self.endpoints
+                if endpoint not in (exclude or []) and self._available(endpoint, now)
+            ]
+            if not candidates:
+                raise NoHealthyEndpoint(f"No healthy endpoint among {len(self.endpoints)}")
+            # Least outstanding requests per weight; ties go weighted round-robin by requests served
+            endpoint = min(candidates, key=lambda e: (e.outstanding / e.weight, e.requests / e.weight))
+            if endpoint.opened_at is not None:
+                endpoint.probing = True
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, healthy: bool):
+        """
+        Finish a request and update the endpoint's circuit.
+
+        Args:
+            endpoint: Endpoint returned by acquire()
+            healthy: False if the request failed because of the endpoint
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.probing = False
+            if healthy:
+                endpoint.consecutive_failures = 0
+                endpoint.opened_at = None
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.opened_at is not None or endpoint.consecutive_failures >= self.failure_threshold:
+                if endpoint.opened_at is None:
+                    print(f"Warning: opening circuit for {endpoint.name} after {endpoint.consecutive_failures} failures")
+                endpoint.opened_at = time.monotonic()
+
+    def create(self, messages: List[Dict[str, str]], **params: Any):
+        """
+        Create a chat completion, failing over to other endpoints on endpoint errors.
+
+        Args:
+            messages: Chat messages to send
+            **params: Parameters for chat.completions.create
+
+        Returns:
+            ChatCompletion: The response of the first endpoint that answered
+
+        Raises:
+            NoHealthyEndpoint: If no endpoint is available
+        """
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                endpoint = self.acquire(tried)
+            except NoHealthyEndpoint:
+                if tried:
+                    raise last_error
+                raise
+            tried.append(endpoint)
+            try:
+                response = endpoint.client.chat.completions.create(messages=messages, **params)
+            except ENDPOINT_ERRORS as e:
+                self.release(endpoint, healthy=False)
+                # A request cut off by its deadline has no time left for another endpoint
+                deadline = current_deadline()
+                if isinstance(e, APITimeoutError) and deadline and deadline.expired():
+                    raise
+                last_error = e
+                continue
+            except Exception:
+                self.release(endpoint, healthy=True)
+                raise
+            self.release(endpoint, healthy=True)
+            return response
+
+    def report(self) -> List[Dict]:
+        """Load and health of every endpoint."""
+        with self._lock:
+            return [endpoint.report() for endpoint in self.endpoints]
+
+class PooledBackend(LLMBackend):
+    """Send requests to the OpenAI API through a client pool."""
+
+    name = "pool"
+
+    def __init__(self, pool: Optional[ClientPool] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            pool: Client pool (default: built from config.LLM_ENDPOINTS)
+        """
+        self.pool = pool or ClientPool(parse_endpoints(config.LLM_ENDPOINTS))
+
+    def create(self, messages: List[Dict[str, str]], api_key: str, **params: Any):
+        """Create a chat completion on the least loaded healthy endpoint; the pool's keys replace api_key."""
+        return self.pool.create(messages, **params)
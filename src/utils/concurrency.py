@@ -0,0 +1,235 @@
+"""Adaptive limit on the number of API calls in flight (AIMD)."""
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import threading
+import time
+
+from .. import config
+from .deadline import current_deadline, DeadlineExceeded
+
+# Weight of each new latency in the running baseline
+BASELINE_RATE = 0.1
+# Slow-downs shorter than this are jitter, not a spike
+MIN_SPIKE_SECONDS = 0.05
+
+class CallSlot:
+    """Permission for one call to be in flight; reports how the call went."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.started_at = time.monotonic()
+        self.outcome: Optional[str] = None
+
+    def overloaded(self):
+        """Report that the provider pushed back (429) on this call."""
+        self.outcome = "overloaded"
+
+class AdaptiveLimiter:
+    """
+    Additive-increase, multiplicative-decrease limit on concurrent calls.
+
+    Each call that returns in normal time raises the limit by increase/limit,
+    so the limit grows by about `increase` per round of calls. A 429 or a
+    latency spike (latency_factor times the baseline latency of the same kind
+    of call) multiplies it by `decrease`. Calls that started before the last
+    cut do not cut again, so a burst of 429s from one round only counts once.
+    """
+
+    def __init__(self, initial: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, increase: float = 1.0, decrease: float = 0.5,
+                 latency_factor: float = 2.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial: Starting limit (default: config.CONCURRENCY_INITIAL)
+            min_limit: Lowest limit (default: config.CONCURRENCY_MIN)
+            max_limit: Highest limit (default: config.CONCURRENCY_MAX)
+            increase: Limit added per round of successful calls
+            decrease: Factor the limit is multiplied by on overload
+            latency_factor: Latency, relative to the baseline, counted as a spike
+        """
+        self.min_limit = min_limit if min_limit is not None else config.CONCURRENCY_MIN
+        self.max_limit = max_limit if max_limit is not None else config.CONCURRENCY_MAX
+        initial = initial if initial is not None else config.CONCURRENCY_INITIAL
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.baseline_latency: Dict[str, float] = {}
+        self.in_flight = 0
+        self.peak_limit = int(self._limit)
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # Coroutines waiting for a slot, woken through their event loop
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    def _decrease(self, slot: CallSlot):
+        """Cut the limit, unless the call was sent before the last cut."""
+        if slot.started_at < self._last_decrease:
+            return
+        self._limit = max(float(self.min_limit), self._limit * self.decrease)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+
+    def _observe(self, slot: CallSlot, latency: float) -> bool:
+        """Fold a latency into the baseline of its kind of call; True if it was a spike."""
+        baseline = self.baseline_latency.get(slot.key)
+        self.baseline_latency[slot.key] = latency if baseline is None else (
+            (1 - BASELINE_RATE) * baseline + BASELINE_RATE * latency
+        )
+        return (baseline is not None and latency > self.latency_factor * baseline
+                and latency - baseline > MIN_SPIKE_SECONDS)
+
+    def _increase(self):
+        """Raise the limit by one step."""
+        self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+
+    def _release(self, slot: CallSlot):
+        """Free a slot, adjust the limit by how its call went and wake the waiting calls."""
+        latency = time.monotonic() - slot.started_at
+        with self._condition:
+            self.in_flight -= 1
+            if slot.outcome == "overloaded":
+                self._decrease(slot)
+            elif slot.outcome is None:
+                if self._observe(slot, latency):
+                    self._decrease(slot)
+                else:
+                    self._increase()
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop has closed
+                pass
+
+    @contextmanager
+    def slot(self, key: str = "call") -> Iterator[CallSlot]:
+        """
+        Wait until a call may be sent, then hold its place while it runs.
+
+        Args:
+            key: Kind of call (e.g. stage and model) whose latencies are comparable
+
+        Yields:
+            CallSlot: Call with overloaded() to report a 429
+
+        Raises:
+            DeadlineExceeded: If the active deadline passes while waiting
+        """
+        deadline = current_deadline()
+        with self._condition:
+            while self.in_flight >= self.limit:
+                remaining = deadline.remaining() if deadline else None
+                if remaining == 0:
+                    raise DeadlineExceeded(deadline)
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+        slot = CallSlot(key)
+        try:
+            yield slot
+        except Exception:
+            if slot.outcome is None:
+                slot.outcome = "failed"
+            raise
+        finally:
+            self._release(slot)
+
+    @asynccontextmanager
+    async def aslot(self, key: str = "call") -> AsyncIterator[CallSlot]:
+        """
+        Async counterpart of slot: waits on the event loop instead of blocking it.
+
+        Async and threaded calls share the same limit.
+
+        Args:
+            key: Kind of call (e.g. stage and model) whose latencies are comparable
+
+        Yields:
+            CallSlot: Call with overloaded() to report a 429
+
+        Raises:
+            DeadlineExceeded: If the active deadline passes while waiting
+        """
+        deadline = current_deadline()
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            remaining = deadline.remaining() if deadline else None
+            if remaining == 0:
+                raise DeadlineExceeded(deadline)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+
+        slot = CallSlot(key)
+        try:
+            yield slot
+        except BaseException:
+            # Cancelled calls count as failed too, not as fast successes
+            if slot.outcome is None:
+                slot.outcome = "failed"
+            raise
+        finally:
+            self._release(slot)
+
+    def report(self) -> Dict:
+        """Current limit and activity, for metrics."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "peak_limit": self.peak_limit,
+                "decreases": self.decreases,
+                "baseline_latency": dict(self.baseline_latency)
+            }
+
+def _wake(waiter: asyncio.Future):
+    """Wake a coroutine waiting for a slot, unless it stopped waiting."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+_limiter: Optional[AdaptiveLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_limiter() -> AdaptiveLimiter:
+    """The shared limiter, created from the configuration on first use."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = AdaptiveLimiter()
+    return _limiter
+
+def set_limiter(limiter: Optional[AdaptiveLimiter]) -> Optional[AdaptiveLimiter]:
+    """
+    Replace the shared limiter.
+
+    Args:
+        limiter: New limiter, or None to create one from the configuration on next use
+
+    Returns:
+        Optional[AdaptiveLimiter]: The previous limiter
+    """
+    global _limiter
+    with _limiter_lock:
+        previous, _limiter = _limiter, limiter
+    return previous
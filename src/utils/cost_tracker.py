@@ -1,6 +1,13 @@
 """Utility for tracking OpenAI API costs."""
-from typing import Dict
+from typing import Dict, List, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+import json
+import threading
+
+# Call lists collecting the calls made in the current context (see CostTracker.track_calls)
+_active_scopes: ContextVar[Tuple[List[Dict], ...]] = ContextVar("cost_scopes", default=())
 
 class CostTracker:
     """Track costs of OpenAI API calls."""
@@ -10,6 +17,7 @@ class CostTracker:
         "gpt-4": {"input": 0.03, "output": 0.06},
         "gpt-4-0613": {"input": 0.03, "output": 0.06},
         "gpt-4o": {"input": 0.03, "output": 0.06},  # Using gpt-4 rates
+        "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
         "gpt-3.5-turbo": {"input": 0.001, "output": 0.002},
         "o1-2024-12-17": {"input": 0.015, "output": 0.06}
     }
@@ -18,37 +26,112 @@ class CostTracker:
         """Initialize the cost tracker."""
         self.total_cost = 0.0
         self.calls_history = []
+        self.hedge_count = 0
+        self.hedge_cost = 0.0
+        self._lock = threading.Lock()
     
-    def add_call(self, model: str, input_tokens: int, output_tokens: int, operation: str):
+    def calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """
-        Add an API call to the tracker.
+        Calculate the cost of a call.
         
         Args:
             model: The model used (e.g., "gpt-4")
             input_tokens: Number of input tokens
             output_tokens: Number of output tokens
-            operation: Type of operation (e.g., "generate", "revise", etc.)
+            
+        Returns:
+            float: Cost in USD
         """
-        # Get costs for the model
         model_costs = self.COST_PER_1K_TOKENS.get(model, self.COST_PER_1K_TOKENS["gpt-4"])
+        return (input_tokens / 1000) * model_costs["input"] + (output_tokens / 1000) * model_costs["output"]
+    
+    def add_call(self, model: str, input_tokens: int, output_tokens: int, operation: str, latency: Optional[float] = None,
+                 hedge: bool = False):
+        """
+        Add an API call to the tracker.
         
-        # Calculate costs
-        input_cost = (input_tokens / 1000) * model_costs["input"]
-        output_cost = (output_tokens / 1000) * model_costs["output"]
-        total_cost = input_cost + output_cost
-        
-        # Update total
-        self.total_cost += total_cost
-        
-        # Record call
-        self.calls_history.append({
+        Args:
+            model: The model used (e.g., "gpt-4")
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            operation: Type of operation (e.g., "generate", "revise", etc.)
+            latency: Seconds the API call took (optional)
+            hedge: Whether the call duplicated a slow request (see utils.hedging)
+        """
+        total_cost = self.calculate_cost(model, input_tokens, output_tokens)
+        call = {
             "timestamp": datetime.now().isoformat(),
             "operation": operation,
             "model": model,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
-            "cost": total_cost
-        })
+            "cost": total_cost,
+            "latency": latency,
+            "hedge": hedge
+        }
+        
+        # Update total and record call
+        with self._lock:
+            self.total_cost += total_cost
+            self.calls_history.append(call)
+            if hedge:
+                self.hedge_count += 1
+                self.hedge_cost += total_cost
+        for scope in _active_scopes.get():
+            scope.append(call)
+    
+    @contextmanager
+    def track_calls(self) -> Iterator[List[Dict]]:
+        """
+        Collect the calls made in the current context, e.g. by one pipeline run.
+        
+        Calls made from threads only count when the thread runs in a copy of
+        this context (contextvars.copy_context).
+        
+        Yields:
+            List[Dict]: Call records, filled in as calls are added
+        """
+        calls: List[Dict] = []
+        token = _active_scopes.set(_active_scopes.get() + (calls,))
+        try:
+            yield calls
+        finally:
+            _active_scopes.reset(token)
+    
+    def estimate_savings(self, baseline_model: str, calls: Optional[List[Dict]] = None) -> Dict[str, float]:
+        """
+        Compare the cost of calls with what they would have cost on one model.
+        
+        Args:
+            baseline_model: Model every call would otherwise have used
+            calls: Call records to compare (default: the whole history)
+            
+        Returns:
+            Dict[str, float]: Actual cost, baseline cost and savings in USD
+        """
+        calls = self.calls_history if calls is None else calls
+        actual = sum(call["cost"] for call in calls)
+        baseline = sum(
+            self.calculate_cost(baseline_model, call["input_tokens"], call["output_tokens"])
+            for call in calls
+        )
+        return {"cost": actual, "baseline_cost": baseline, "savings": baseline - actual}
+    
+    def hedge_summary(self, calls: Optional[List[Dict]] = None) -> Dict[str, float]:
+        """
+        Summarise the duplicate requests sent for slow calls.
+        
+        Args:
+            calls: Call records to summarise (default: the whole history)
+            
+        Returns:
+            Dict[str, float]: Number of hedged calls, their cost and their share of the total cost
+        """
+        calls = self.calls_history if calls is None else calls
+        hedges = [call for call in calls if call.get("hedge")]
+        total = sum(call["cost"] for call in calls)
+        cost = sum(call["cost"] for call in hedges)
+        return {"hedges": len(hedges), "hedge_cost": cost, "hedge_cost_share": cost / total if total else 0.0}
     
     def get_total_cost(self) -> float:
         """Get the total cost of all API calls."""
@@ -64,6 +147,38 @@ class CostTracker:
             breakdown[op] += call["cost"]
         return breakdown
     
+    def save(self, path: str):
+        """
+        Save the call history to a JSON file.
+        
+        Args:
+            path: File to write
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"total_cost": self.total_cost, "calls": self.calls_history}, f, indent=2)
+    
+    @classmethod
+    def load(cls, paths: List[str]) -> "CostTracker":
+        """
+        Create a tracker from call histories saved with save().
+        
+        Args:
+            paths: Files to read; their histories are combined
+            
+        Returns:
+            CostTracker: Tracker containing every saved call
+        """
+        tracker = cls()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                calls = json.load(f)["calls"]
+            tracker.calls_history.extend(calls)
+            tracker.total_cost += sum(call["cost"] for call in calls)
+            hedges = [call for call in calls if call.get("hedge")]
+            tracker.hedge_count += len(hedges)
+            tracker.hedge_cost += sum(call["cost"] for call in hedges)
+        return tracker
+    
     def print_summary(self):
         """Print a summary of all costs."""
         print("\nOpenAI API Cost Summary:")
@@ -72,6 +187,8 @@ class CostTracker:
         for op, cost in self.get_cost_breakdown().items():
             print(f"- {op}: ${cost:.4f}")
         print(f"\nTotal API calls: {len(self.calls_history)}")
+        if self.hedge_count:
+            print(f"Hedged calls: {self.hedge_count} (${self.hedge_cost:.4f})")
 
 # Global cost tracker instance
 cost_tracker = CostTracker() 
\ No newline at end of file
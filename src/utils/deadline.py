@@ -0,0 +1,114 @@
+"""Deadlines passed down from jobs to stages and the HTTP calls they make."""
+from typing import Dict, Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+_active_deadline: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """Raised when a call is started or still running after its deadline."""
+
+    def __init__(self, deadline: "Deadline", operation: Optional[str] = None):
+        """
+        Initialize the exception.
+
+        Args:
+            deadline: The deadline that expired
+            operation: Stage whose call was stopped (optional)
+        """
+        where = f" during {operation}" if operation else ""
+        super().__init__(f"{deadline.name} deadline of {deadline.timeout:.1f}s exceeded{where}")
+        self.deadline = deadline
+        self.operation = operation
+
+class Deadline:
+    """
+    A point in time by which a job, section or stage must finish.
+
+    Deadlines nest: a stage deadline never ends after the section deadline
+    it was carved from, so the tightest limit always wins.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, name: str = "run", parent: Optional["Deadline"] = None):
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout: Seconds from now (None for no limit of its own)
+            name: Name used in error messages and reports
+            parent: Enclosing deadline that also applies
+        """
+        self.name = name
+        self.parent = parent
+        self.started_at = time.monotonic()
+        expires = [self.started_at + timeout] if timeout is not None else []
+        if parent is not None and parent.expires_at is not None:
+            expires.append(parent.expires_at)
+        self.expires_at: Optional[float] = min(expires) if expires else None
+        self.timeout = self.expires_at - self.started_at if self.expires_at is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None if there is no limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed."""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, operation: Optional[str] = None):
+        """
+        Stop work that would start after the deadline.
+
+        Args:
+            operation: Stage about to start a call (optional)
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.expired():
+            raise DeadlineExceeded(self, operation)
+
+    def child(self, share: float, name: str) -> "Deadline":
+        """
+        Carve a share of the remaining time out of this deadline.
+
+        Args:
+            share: Fraction of the remaining time (1 for all of it)
+            name: Name of the new deadline
+
+        Returns:
+            Deadline: Deadline ending after the share, and never after this one
+        """
+        remaining = self.remaining()
+        return Deadline(remaining * share if remaining is not None else None, name=name, parent=self)
+
+    def report(self) -> Dict:
+        """Limit and time used, for run metadata."""
+        return {
+            "name": self.name,
+            "timeout": self.timeout,
+            "elapsed": time.monotonic() - self.started_at,
+            "remaining": self.remaining(),
+            "expired": self.expired()
+        }
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline calls in the current context must meet, if any."""
+    return _active_deadline.get()
+
+@contextmanager
+def use_deadline(deadline: Deadline) -> Iterator[Deadline]:
+    """
+    Apply a deadline to the calls made in the current context.
+
+    Threads only see the deadline when they run in a copy of this context
+    (contextvars.copy_context).
+    """
+    token = _active_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _active_deadline.reset(token)
@@ -0,0 +1,223 @@
+"""Hedged requests: send a duplicate when a call runs past its usual latency."""
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from collections import deque
+import asyncio
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+import contextvars
+import statistics
+import threading
+
+from .. import config
+
+T = TypeVar("T")
+
+# Recent latencies kept per stage and model
+LATENCY_WINDOW = 200
+# Duplicates in flight at once; past this, slow calls are not hedged
+MAX_HEDGES_IN_FLIGHT = 16
+
+def _check_percentile(percentile: float) -> float:
+    """Return the percentile if statistics.quantiles(n=100) has a cut point for it."""
+    if not 1 <= percentile <= 99:
+        raise ValueError(f"hedge percentile must be between 1 and 99, got {percentile}")
+    return percentile
+
+class Hedger:
+    """
+    Race a duplicate request against calls that are slower than usual.
+
+    Latencies are tracked per (stage, model). Once enough calls have been
+    seen, a call still running after the configured percentile of that
+    latency gets a duplicate, and whichever response arrives first is used.
+    The number of duplicates is capped as a fraction of all calls, and at
+    MAX_HEDGES_IN_FLIGHT at any one time.
+
+    Each request runs on a thread of its own that starts with it, so calls
+    never queue behind each other and the hedge threshold counts from the
+    moment the request is sent.
+    """
+
+    def __init__(self, percentile: Optional[float] = None, max_fraction: Optional[float] = None,
+                 min_samples: Optional[int] = None):
+        """
+        Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile after which a call is hedged
+                (default: config.HEDGE_PERCENTILE)
+            max_fraction: Largest share of calls that may be hedged
+                (default: config.HEDGE_MAX_FRACTION)
+            min_samples: Latencies needed per stage and model before hedging
+                (default: config.HEDGE_MIN_SAMPLES)
+
+        Raises:
+            ValueError: If percentile is outside 1-99
+        """
+        self._percentile = _check_percentile(percentile) if percentile is not None else None
+        self._max_fraction = max_fraction
+        self._min_samples = min_samples
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(MAX_HEDGES_IN_FLIGHT)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def percentile(self) -> float:
+        return self._percentile if self._percentile is not None else _check_percentile(config.HEDGE_PERCENTILE)
+
+    @property
+    def max_fraction(self) -> float:
+        return self._max_fraction if self._max_fraction is not None else config.HEDGE_MAX_FRACTION
+
+    @property
+    def min_samples(self) -> int:
+        return self._min_samples if self._min_samples is not None else config.HEDGE_MIN_SAMPLES
+
+    def observe(self, operation: str, model: str, latency: float):
+        """Record the latency of a finished call."""
+        with self._lock:
+            self._latencies.setdefault((operation, model), deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def threshold(self, operation: str, model: str) -> Optional[float]:
+        """
+        Seconds after which a call to a stage and model is hedged.
+
+        Args:
+            operation: Stage name
+            model: Model name
+
+        Returns:
+            Optional[float]: The latency percentile, or None until enough calls were seen
+        """
+        with self._lock:
+            latencies = list(self._latencies.get((operation, model), ()))
+        if len(latencies) < max(self.min_samples, 2):
+            return None
+        return statistics.quantiles(latencies, n=100, method="inclusive")[int(self.percentile) - 1]
+
+    def _take_hedge(self) -> bool:
+        """Claim a hedge if the fraction cap allows one more and a duplicate slot is free."""
+        if not self._hedge_slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            if self.hedges + 1 <= self.max_fraction * self.calls:
+                self.hedges += 1
+                return True
+        self._hedge_slots.release()
+        return False
+
+    def _start(self, send: Callable[[bool], T], hedge: bool) -> "Future[T]":
+        """Send a request on a new thread, in a copy of the caller's context."""
+        future: "Future[T]" = Future()
+        context = contextvars.copy_context()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(context.run(send, hedge))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                if hedge:
+                    self._hedge_slots.release()
+
+        threading.Thread(target=run, name="hedge" if hedge else "hedged-call").start()
+        return future
+
+    def call(self, operation: str, model: str, send: Callable[[bool], T]) -> T:
+        """
+        Send a request, racing a duplicate against it if it is slow.
+
+        Args:
+            operation: Stage name
+            model: Model name
+            send: Sends the request; its argument is True for the duplicate
+
+        Returns:
+            T: The first successful response
+        """
+        with self._lock:
+            self.calls += 1
+        threshold = self.threshold(operation, model)
+        if threshold is None:
+            return send(False)
+
+        primary = self._start(send, False)
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._take_hedge():
+            return primary.result()
+
+        duplicate = self._start(send, True)
+        pending = {primary, duplicate}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded:
+                if duplicate in succeeded and primary not in succeeded:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return succeeded[0].result()
+        # Both requests failed
+        return primary.result()
+
+    async def acall(self, operation: str, model: str, send: Callable[[bool], Awaitable[T]]) -> T:
+        """
+        Async counterpart of call: the request and its duplicate run as tasks.
+
+        The slower request is left to finish in the background, so its usage
+        is recorded as in call.
+
+        Args:
+            operation: Stage name
+            model: Model name
+            send: Sends the request; its argument is True for the duplicate
+
+        Returns:
+            T: The first successful response
+        """
+        with self._lock:
+            self.calls += 1
+        threshold = self.threshold(operation, model)
+        if threshold is None:
+            return await send(False)
+
+        primary = asyncio.ensure_future(send(False))
+        done, _ = await asyncio.wait([primary], timeout=threshold)
+        if done or not self._take_hedge():
+            return await primary
+
+        duplicate = asyncio.ensure_future(send(True))
+        duplicate.add_done_callback(lambda _: self._hedge_slots.release())
+        pending = {primary, duplicate}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                if duplicate in succeeded and primary not in succeeded:
+                    with self._lock:
+                        self.hedge_wins += 1
+                for task in pending:
+                    task.add_done_callback(_retrieve)
+                return succeeded[0].result()
+        # Both requests failed
+        return primary.result()
+
+    def report(self) -> Dict[str, float]:
+        """Calls seen, hedges sent and how many hedges answered first."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / self.calls if self.calls else 0.0
+            }
+
+def _retrieve(task: "asyncio.Task"):
+    """Consume the outcome of a request nobody waits for, so its failure is not logged as unhandled."""
+    if not task.cancelled():
+        task.exception()
+
+# Global hedger instance
+hedger = Hedger()
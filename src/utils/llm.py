@@ -0,0 +1,284 @@
+"""Shared call path for OpenAI chat completions."""
+from typing import Dict, List, Optional, Tuple, Any
+import asyncio
+import threading
+import time
+import weakref
+
+from openai import OpenAI, AsyncOpenAI, RateLimitError
+from .. import config
+from .cost_tracker import cost_tracker
+from .backends import get_backend
+from .budget import current_budget, reserve_call
+from .tokens import estimate_message_tokens, estimate_tokens, token_estimator
+from .hedging import hedger
+from .deadline import current_deadline, DeadlineExceeded
+from .concurrency import get_limiter
+
+_clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+def get_client(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Get a shared OpenAI client for an API key and endpoint.
+
+    Clients are created once and reused, so their HTTP connection pools stay
+    warm across calls and threads.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: API endpoint (default: config.OPENAI_BASE_URL, then the OpenAI default)
+
+    Returns:
+        OpenAI: The shared client
+    """
+    base_url = base_url or config.OPENAI_BASE_URL
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = OpenAI(api_key=api_key, base_url=base_url)
+                _clients[key] = client
+    return client
+
+# Async clients per event loop, dropped with their loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str]], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+def get_async_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get a shared AsyncOpenAI client for an API key and endpoint.
+
+    Async connection pools belong to one event loop, so clients are shared
+    by the calls of the running loop only.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: API endpoint (default: config.OPENAI_BASE_URL, then the OpenAI default)
+
+    Returns:
+        AsyncOpenAI: The shared client
+    """
+    base_url = base_url or config.OPENAI_BASE_URL
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((api_key, base_url))
+    if client is None:
+        client = clients[(api_key, base_url)] = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    return client
+
+def split_usage(response) -> List[Tuple[int, int]]:
+    """
+    Split the usage of a multi-choice response across its choices.
+
+    The prompt is billed once, so its tokens are divided evenly; completion
+    tokens are attributed in proportion to the length of each choice. The
+    parts always add up to the reported totals.
+
+    Args:
+        response: ChatCompletion with one or more choices
+
+    Returns:
+        List[Tuple[int, int]]: (input_tokens, output_tokens) per choice
+    """
+    usage = response.usage
+    count = len(response.choices)
+    if count <= 1:
+        return [(usage.prompt_tokens, usage.completion_tokens)]
+
+    weights = [len(choice.message.content or "") for choice in response.choices]
+    if not any(weights):
+        weights = [1] * count
+    input_split = [usage.prompt_tokens // count] * count
+    input_split[0] += usage.prompt_tokens - sum(input_split)
+    output_split = [usage.completion_tokens * weight // sum(weights) for weight in weights]
+    output_split[0] += usage.completion_tokens - sum(output_split)
+    return list(zip(input_split, output_split))
+
+def record_usage(response, model: str, operation: str, latency: Optional[float] = None, hedge: bool = False):
+    """Record the cost and latency of a response, one entry per choice."""
+    for input_tokens, output_tokens in split_usage(response):
+        cost_tracker.add_call(
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            operation=operation,
+            latency=latency,
+            hedge=hedge
+        )
+
+def observe_usage(response, model: str, prompt_estimate: int):
+    """Compare the local token estimates of a call with the usage the API reported."""
+    usage = response.usage
+    token_estimator.observe(model, prompt_estimate, usage.prompt_tokens, "prompt")
+    # Reasoning tokens are billed as output but never appear in the text
+    details = getattr(usage, "completion_tokens_details", None)
+    reasoning_tokens = getattr(details, "reasoning_tokens", None) or 0
+    completion_estimate = sum(estimate_tokens(choice.message.content or "", model) for choice in response.choices)
+    if isinstance(usage.completion_tokens, int) and isinstance(reasoning_tokens, int):
+        token_estimator.observe(model, completion_estimate, usage.completion_tokens - reasoning_tokens, "completion")
+
+def _create(messages: List[Dict[str, str]], api_key: str, operation: str, params: Dict[str, Any]) -> Tuple[Any, float]:
+    """Send a request to the backend, in a slot from the adaptive limiter when it is enabled, and time it."""
+    if not config.ADAPTIVE_CONCURRENCY:
+        start = time.perf_counter()
+        return get_backend().create(messages, api_key, **params), time.perf_counter() - start
+    with get_limiter().slot(f"{operation}:{params['model']}") as slot:
+        start = time.perf_counter()
+        try:
+            response = get_backend().create(messages, api_key, **params)
+        except RateLimitError:
+            slot.overloaded()
+            raise
+        return response, time.perf_counter() - start
+
+async def _acreate(messages: List[Dict[str, str]], api_key: str, operation: str, params: Dict[str, Any]) -> Tuple[Any, float]:
+    """Async counterpart of _create, waiting for a limiter slot on the event loop."""
+    if not config.ADAPTIVE_CONCURRENCY:
+        start = time.perf_counter()
+        return await get_backend().acreate(messages, api_key, **params), time.perf_counter() - start
+    async with get_limiter().aslot(f"{operation}:{params['model']}") as slot:
+        start = time.perf_counter()
+        try:
+            response = await get_backend().acreate(messages, api_key, **params)
+        except RateLimitError:
+            slot.overloaded()
+            raise
+        return response, time.perf_counter() - start
+
+def _prepare(messages: List[Dict[str, str]], operation: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, Any, Any, int]:
+    """
+    Apply the active deadline and budget to a request before it is sent.
+
+    Returns:
+        Tuple: The request parameters, deadline, budget, budget reservation and
+            prompt token estimate
+    """
+    params = dict(params)
+    deadline = current_deadline()
+    if deadline:
+        deadline.check(operation)
+        remaining = deadline.remaining()
+        if remaining is not None:
+            params["timeout"] = min(remaining, params.get("timeout") or remaining)
+    prompt_estimate = estimate_message_tokens(messages, params["model"])
+    budget = current_budget()
+    reservation = reserve_call(budget, messages, params, prompt_estimate) if budget else None
+    return params, deadline, budget, reservation, prompt_estimate
+
+def _failed(error: Exception, operation: str, deadline, budget, reservation):
+    """Release the budget of a failed request and raise the error to report."""
+    if budget:
+        budget.settle(reservation)
+    # A call cut off by its deadline's timeout is reported as the deadline expiring
+    if deadline and deadline.expired() and not isinstance(error, DeadlineExceeded):
+        raise DeadlineExceeded(deadline, operation) from error
+    raise error
+
+def _finish(response, latency: float, operation: str, params: Dict[str, Any], budget, reservation,
+            prompt_estimate: int, hedge: bool = False):
+    """Charge the budget with the actual usage of a response and record its cost and latency."""
+    if budget:
+        usage = response.usage
+        budget.settle(
+            reservation,
+            cost_tracker.calculate_cost(params["model"], usage.prompt_tokens, usage.completion_tokens),
+            usage.prompt_tokens + usage.completion_tokens
+        )
+
+    # Track costs, latency and estimation error
+    record_usage(response, params["model"], operation, latency, hedge)
+    observe_usage(response, params["model"], prompt_estimate)
+    hedger.observe(operation, params["model"], latency)
+
+def _send(messages: List[Dict[str, str]], api_key: str, operation: str, params: Dict[str, Any], hedge: bool = False):
+    """Send one request through the backend, charging its budget and recording its usage."""
+    params, deadline, budget, reservation, prompt_estimate = _prepare(messages, operation, params)
+    try:
+        response, latency = _create(messages, api_key, operation, params)
+    except Exception as e:
+        _failed(e, operation, deadline, budget, reservation)
+    _finish(response, latency, operation, params, budget, reservation, prompt_estimate, hedge)
+    return response
+
+async def _asend(messages: List[Dict[str, str]], api_key: str, operation: str, params: Dict[str, Any], hedge: bool = False):
+    """Async counterpart of _send."""
+    params, deadline, budget, reservation, prompt_estimate = _prepare(messages, operation, params)
+    try:
+        response, latency = await _acreate(messages, api_key, operation, params)
+    except Exception as e:
+        _failed(e, operation, deadline, budget, reservation)
+    _finish(response, latency, operation, params, budget, reservation, prompt_estimate, hedge)
+    return response
+
+def _with_defaults(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the configured model, temperature, max_tokens and request timeout."""
+    params.setdefault("model", config.MODEL_NAME)
+    params.setdefault("temperature", config.TEMPERATURE)
+    params.setdefault("max_tokens", config.MAX_TOKENS)
+    if config.REQUEST_TIMEOUT:
+        params.setdefault("timeout", config.REQUEST_TIMEOUT)
+    return params
+
+def chat_completion(messages: List[Dict[str, str]], api_key: str, operation: str, **params: Any):
+    """
+    Create a chat completion and record its cost.
+
+    The request is served by the configured backend (see utils.backends):
+    the OpenAI API, or a cassette in record or replay mode.
+
+    When a budget is active (see utils.budget.use_budget) the call reserves
+    its estimated cost first, and may be downgraded to the cheap model or
+    refused with BudgetExceeded.
+
+    When a deadline is active (see utils.deadline.use_deadline) the time left
+    is passed to the HTTP request as its timeout, and a call started or cut
+    off after the deadline raises DeadlineExceeded.
+
+    With config.ADAPTIVE_CONCURRENCY, calls wait for a slot from the shared
+    AIMD limiter (see utils.concurrency), which backs off on 429s and
+    latency spikes.
+
+    With config.HEDGE_REQUESTS, a call that runs past the usual latency of
+    its stage and model is duplicated and the first response is used (see
+    utils.hedging); duplicates are recorded as hedges in the cost tracker.
+
+    Args:
+        messages: Chat messages to send
+        api_key: OpenAI API key
+        operation: Name of the calling stage, used for cost tracking
+        **params: Extra parameters for chat.completions.create; model,
+            temperature and max_tokens default to the configured values
+
+    Returns:
+        ChatCompletion: The API response
+    """
+    params = _with_defaults(params)
+    if not config.HEDGE_REQUESTS:
+        return _send(messages, api_key, operation, params)
+    return hedger.call(operation, params["model"], lambda hedge: _send(messages, api_key, operation, params, hedge))
+
+async def achat_completion(messages: List[Dict[str, str]], api_key: str, operation: str, **params: Any):
+    """
+    Create a chat completion without blocking the event loop, and record its cost.
+
+    Budgets, deadlines, cost tracking, the adaptive limiter and request
+    hedging apply as in chat_completion; the backend's acreate() serves the
+    request (AsyncOpenAI for the OpenAI API). Waiting for a limiter slot or a
+    hedge does not block the event loop, and async and threaded calls share
+    one limit.
+
+    Args:
+        messages: Chat messages to send
+        api_key: OpenAI API key
+        operation: Name of the calling stage, used for cost tracking
+        **params: Extra parameters for chat.completions.create; model,
+            temperature and max_tokens default to the configured values
+
+    Returns:
+        ChatCompletion: The API response
+    """
+    params = _with_defaults(params)
+    if not config.HEDGE_REQUESTS:
+        return await _asend(messages, api_key, operation, params)
+    return await hedger.acall(operation, params["model"], lambda hedge: _asend(messages, api_key, operation, params, hedge))
@@ -0,0 +1,119 @@
+"""Per-stage model routing with escalation to stronger models."""
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar, Any
+
+from .. import config
+
+T = TypeVar("T")
+
+# Model tiers tried in order for each stage. Drafts, screening reviews and
+# citation reasons start on the cheap model; the final revision, alone or
+# fused with the citations, goes straight to the expensive one.
+DEFAULT_ROUTES: Dict[str, List[str]] = {
+    "generate_content": ["cheap", "expensive"],
+    "review_content": ["cheap", "expensive"],
+    "score_content": ["cheap", "expensive"],
+    "reduce_reviews": ["cheap", "expensive"],
+    "revise_content": ["expensive"],
+    "add_citations": ["cheap", "expensive"],
+    "cite_claims": ["cheap", "expensive"],
+    "revise_and_cite": ["expensive"],
+}
+
+class OutputRejected(Exception):
+    """Raised by a stage attempt when the model's output fails validation or parsing."""
+
+    def __init__(self, reason: str, result: Any = None):
+        """
+        Initialize the exception.
+
+        Args:
+            reason: Why the output was rejected
+            result: Best-effort result, returned if no stronger model is left
+        """
+        super().__init__(reason)
+        self.reason = reason
+        self.result = result
+
+class ModelRouter:
+    """Choose the model for each stage and escalate when output is rejected."""
+
+    def __init__(self, routes: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the router.
+
+        Args:
+            routes: Model tiers ("cheap", "expensive") or model names tried per stage
+        """
+        self.routes = routes or DEFAULT_ROUTES
+
+    def _resolve(self, tier: str) -> str:
+        """Turn a tier name into a model name."""
+        if tier == "cheap":
+            return config.CHEAP_MODEL_NAME
+        if tier == "expensive":
+            return config.MODEL_NAME
+        return tier
+
+    def models_for(self, stage: str) -> List[str]:
+        """
+        Models to try for a stage, cheapest first.
+
+        Args:
+            stage: Stage (operation) name
+
+        Returns:
+            List[str]: Model names; just config.MODEL_NAME when routing is disabled
+        """
+        if not config.MODEL_ROUTING:
+            return [config.MODEL_NAME]
+        models = []
+        for tier in self.routes.get(stage, ["expensive"]):
+            model = self._resolve(tier)
+            if model not in models:
+                models.append(model)
+        return models
+
+    def run(self, stage: str, attempt: Callable[[str], T]) -> T:
+        """
+        Run a stage attempt, escalating to the next model when its output is rejected.
+
+        Args:
+            stage: Stage (operation) name
+            attempt: Calls the model given by name and parses its output;
+                raises OutputRejected when the output is unusable
+
+        Returns:
+            T: Result of the first accepted attempt, or the last best-effort result
+        """
+        models = self.models_for(stage)
+        for i, model in enumerate(models):
+            try:
+                return attempt(model)
+            except OutputRejected as e:
+                if i == len(models) - 1:
+                    return e.result
+                print(f"Warning: {stage} output from {model} rejected ({e.reason}); escalating to {models[i + 1]}")
+
+    async def arun(self, stage: str, attempt: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Async counterpart of run(), for attempts that await their model call.
+
+        Args:
+            stage: Stage (operation) name
+            attempt: Coroutine function calling the model given by name and
+                parsing its output; raises OutputRejected when the output is unusable
+
+        Returns:
+            T: Result of the first accepted attempt, or the last best-effort result
+        """
+        models = self.models_for(stage)
+        for i, model in enumerate(models):
+            try:
+                return await attempt(model)
+            except OutputRejected as e:
+                if i == len(models) - 1:
+                    return e.result
+                print(f"Warning: {stage} output from {model} rejected ({e.reason}); escalating to {models[i + 1]}")
+
+# Global model router instance
+model_router = ModelRouter()
@@ -0,0 +1,183 @@
+"""One implementation of each stage for sync and async callers.
+
+A stage is written once as a generator of steps: it yields the requests it
+needs and receives their responses, and keeps message building, fallbacks,
+parsing and rejection to itself. drive() sends the requests with
+chat_completion on threads, adrive() with achat_completion on the event loop,
+so sync stage functions and their async counterparts are thin wrappers.
+
+A step may yield:
+
+- a Request: the chat completion response is sent back, and an error is
+  raised inside the generator where it yielded;
+- a Stage: another stage, run through the model router unless it names a
+  model; its result is sent back;
+- Calls: requests and stages sent at the same time; a list of their results
+  is sent back, with the exception in place of any that failed.
+"""
+from typing import Any, Awaitable, Callable, Dict, Generator, List, NamedTuple, Optional, TypeVar, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+
+from .model_router import model_router, OutputRejected
+
+T = TypeVar("T")
+
+class Request(NamedTuple):
+    """One chat completion request of a stage."""
+    operation: str
+    messages: List[Dict[str, str]]
+    params: Dict[str, Any]
+
+class Stage(NamedTuple):
+    """A stage run as one step of another: its steps per model, and an optional fixed model."""
+    operation: str
+    steps: Callable[[str], Generator]
+    model: Optional[str] = None
+
+class Calls(NamedTuple):
+    """Requests and stages sent at the same time, at most limit at once (None for all)."""
+    calls: List[Union[Request, Stage]]
+    limit: Optional[int] = None
+
+Steps = Generator[Union[Request, Stage, Calls], Any, T]
+
+def response_text(response) -> str:
+    """Text of the first choice of a response."""
+    return response.choices[0].message.content
+
+def _send(call: Union[Request, Stage], complete: Callable, api_key: str):
+    """Send one request, or run one stage, synchronously."""
+    if isinstance(call, Stage):
+        return run_stage(call.operation, call.steps, complete, api_key, call.model)
+    return complete(messages=call.messages, api_key=api_key, operation=call.operation, **call.params)
+
+def _send_all(calls: Calls, complete: Callable, api_key: str) -> List[Any]:
+    """Send calls on threads, each in a copy of the caller's context, and collect results or errors."""
+    if len(calls.calls) <= 1:
+        results = []
+        for call in calls.calls:
+            try:
+                results.append(_send(call, complete, api_key))
+            except Exception as e:
+                results.append(e)
+        return results
+    with ThreadPoolExecutor(max_workers=min(len(calls.calls), calls.limit or len(calls.calls))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, _send, call, complete, api_key)
+            for call in calls.calls
+        ]
+        return [future.exception() or future.result() for future in futures]
+
+def drive(steps: Steps[T], complete: Callable, api_key: str) -> T:
+    """
+    Run the steps of a stage, sending its requests with a sync completion function.
+
+    Args:
+        steps: Generator of steps (see the module docstring)
+        complete: chat_completion, or a function with its signature
+        api_key: OpenAI API key
+
+    Returns:
+        T: The result the steps return
+    """
+    try:
+        step = next(steps)
+        while True:
+            if isinstance(step, Calls):
+                step = steps.send(_send_all(step, complete, api_key))
+                continue
+            try:
+                result = _send(step, complete, api_key)
+            except Exception as e:
+                step = steps.throw(e)
+            else:
+                step = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+async def _asend(call: Union[Request, Stage], complete: Callable[..., Awaitable], api_key: str):
+    """Send one request, or run one stage, on the event loop."""
+    if isinstance(call, Stage):
+        return await arun_stage(call.operation, call.steps, complete, api_key, call.model)
+    return await complete(messages=call.messages, api_key=api_key, operation=call.operation, **call.params)
+
+async def _asend_all(calls: Calls, complete: Callable[..., Awaitable], api_key: str) -> List[Any]:
+    """Send calls as tasks, at most calls.limit at once, and collect results or errors."""
+    limit = asyncio.Semaphore(calls.limit or max(len(calls.calls), 1))
+
+    async def send(call):
+        async with limit:
+            return await _asend(call, complete, api_key)
+
+    return list(await asyncio.gather(*(send(call) for call in calls.calls), return_exceptions=True))
+
+async def adrive(steps: Steps[T], complete: Callable[..., Awaitable], api_key: str) -> T:
+    """
+    Async counterpart of drive.
+
+    Args:
+        steps: Generator of steps (see the module docstring)
+        complete: achat_completion, or a coroutine function with its signature
+        api_key: OpenAI API key
+
+    Returns:
+        T: The result the steps return
+    """
+    try:
+        step = next(steps)
+        while True:
+            if isinstance(step, Calls):
+                step = steps.send(await _asend_all(step, complete, api_key))
+                continue
+            try:
+                result = await _asend(step, complete, api_key)
+            except Exception as e:
+                step = steps.throw(e)
+            else:
+                step = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+def run_stage(operation: str, steps: Callable[[str], Steps[T]], complete: Callable, api_key: str,
+              model: Optional[str] = None) -> T:
+    """
+    Run a stage on a given model, or on the models of the router.
+
+    Unless a model is given, the stage starts on the first model the router
+    lists for the operation and is escalated when its steps raise
+    OutputRejected. With a model, a rejected output is returned as it is.
+
+    Args:
+        operation: Stage name, used for routing
+        steps: Steps of the stage for a model name
+        complete: chat_completion, or a function with its signature
+        api_key: OpenAI API key
+        model: Model to use, bypassing the model router (optional)
+
+    Returns:
+        T: Result of the stage
+    """
+    def attempt(model: str) -> T:
+        return drive(steps(model), complete, api_key)
+
+    if model:
+        try:
+            return attempt(model)
+        except OutputRejected as e:
+            return e.result
+    return model_router.run(operation, attempt)
+
+async def arun_stage(operation: str, steps: Callable[[str], Steps[T]], complete: Callable[..., Awaitable],
+                     api_key: str, model: Optional[str] = None) -> T:
+    """Async counterpart of run_stage."""
+    async def attempt(model: str) -> T:
+        return await adrive(steps(model), complete, api_key)
+
+    if model:
+        try:
+            return await attempt(model)
+        except OutputRejected as e:
+            return e.result
+    return await model_router.arun(operation, attempt)
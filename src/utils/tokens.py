@@ -0,0 +1,196 @@
+"""Offline token estimation for prompts and outputs.
+
+Token counts are needed before a call is made (budgets, max_tokens sizing),
+but the API only reports them afterwards. This module estimates them locally
+with a heuristic tuned per tokenizer family, and keeps itself honest by
+comparing each estimate with the usage the API returns: the error is tracked
+per model and a running correction factor is applied to later estimates.
+"""
+from typing import Dict, List, NamedTuple, Optional
+import math
+import re
+import threading
+
+class TokenizerProfile(NamedTuple):
+    """Heuristic parameters for one tokenizer family."""
+    name: str
+    # Letters covered by a single token for words up to this length
+    word_chars: int
+    # Average letters per token in longer words
+    chars_per_token: float
+    # Tokens added per chat message, and once per request for the reply primer
+    message_overhead: int
+    reply_overhead: int
+
+CL100K = TokenizerProfile("cl100k", word_chars=7, chars_per_token=3.2, message_overhead=4, reply_overhead=3)
+O200K = TokenizerProfile("o200k", word_chars=8, chars_per_token=3.6, message_overhead=4, reply_overhead=3)
+
+# Tokenizer family per model name prefix; the longest matching prefix wins
+MODEL_PROFILES: Dict[str, TokenizerProfile] = {
+    "gpt-4o": O200K,
+    "gpt-4.1": O200K,
+    "o1": O200K,
+    "o3": O200K,
+    "o4": O200K,
+    "gpt-4": CL100K,
+    "gpt-3.5": CL100K,
+}
+DEFAULT_PROFILE = O200K
+
+# Models that spend output tokens on hidden reasoning before they answer
+REASONING_MODEL_PREFIXES = ("o1", "o3", "o4")
+
+# Word pieces roughly as a BPE pre-tokenizer splits them
+_PIECES = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+
+# Weight of each new observation in the running correction factor
+CALIBRATION_RATE = 0.1
+MIN_CORRECTION, MAX_CORRECTION = 0.5, 2.0
+
+def profile_for(model: Optional[str]) -> TokenizerProfile:
+    """
+    Get the tokenizer profile of a model.
+
+    Args:
+        model: Model name (None for the default profile)
+
+    Returns:
+        TokenizerProfile: Profile of the longest matching prefix in MODEL_PROFILES
+    """
+    if model:
+        for prefix in sorted(MODEL_PROFILES, key=len, reverse=True):
+            if model.startswith(prefix):
+                return MODEL_PROFILES[prefix]
+    return DEFAULT_PROFILE
+
+def is_reasoning_model(model: Optional[str]) -> bool:
+    """Whether a model's output tokens include hidden reasoning, so small max_tokens caps can leave no answer."""
+    return bool(model) and model.startswith(REASONING_MODEL_PREFIXES)
+
+def count_tokens(text: str, profile: TokenizerProfile = DEFAULT_PROFILE) -> int:
+    """
+    Estimate the tokens in a text without calibration.
+
+    Args:
+        text: Text to count
+        profile: Tokenizer profile
+
+    Returns:
+        int: Estimated token count
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        core = piece.lstrip(" ")
+        if not core:
+            tokens += 1
+        elif core[0].isalpha():
+            tokens += 1 if len(core) <= profile.word_chars else math.ceil(len(core) / profile.chars_per_token)
+        elif core[0].isdigit() or core[0].isspace():
+            tokens += 1
+        else:
+            # Runs of punctuation merge in pairs
+            tokens += math.ceil(len(core) / 2)
+    return tokens
+
+class TokenEstimator:
+    """Estimate tokens per model and track the error against actual usage."""
+
+    def __init__(self, calibrate: bool = True):
+        """
+        Initialize the estimator.
+
+        Args:
+            calibrate: Apply the observed correction factor to estimates
+        """
+        self.calibrate = calibrate
+        self._corrections: Dict[str, float] = {}
+        self._errors: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def correction(self, model: Optional[str]) -> float:
+        """Current correction factor for a model's prompt estimates."""
+        return self._corrections.get(model or "", 1.0) if self.calibrate else 1.0
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """
+        Estimate the tokens in a text.
+
+        Args:
+            text: Text to count
+            model: Model the text is sent to or produced by
+
+        Returns:
+            int: Estimated token count
+        """
+        return round(count_tokens(text, profile_for(model)) * self.correction(model))
+
+    def count_messages(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+        """
+        Estimate the prompt tokens of chat messages, including per-message overhead.
+
+        Args:
+            messages: Chat messages
+            model: Model the messages are sent to
+
+        Returns:
+            int: Estimated prompt tokens
+        """
+        profile = profile_for(model)
+        tokens = sum(count_tokens(message.get("content") or "", profile) + profile.message_overhead for message in messages)
+        return round(tokens * self.correction(model)) + profile.reply_overhead
+
+    def observe(self, model: str, estimated: int, actual: int, kind: str = "prompt"):
+        """
+        Record an estimate against the actual usage reported by the API.
+
+        Prompt observations also update the model's correction factor.
+
+        Args:
+            model: Model of the call
+            estimated: Estimated tokens
+            actual: Tokens reported by the API
+            kind: "prompt" or "completion"
+        """
+        if not isinstance(actual, int) or actual <= 0 or estimated <= 0:
+            return
+        error = (estimated - actual) / actual
+        with self._lock:
+            stats = self._errors.setdefault(model, {}).setdefault(
+                kind, {"calls": 0, "mean_error": 0.0, "mean_abs_error": 0.0}
+            )
+            stats["calls"] += 1
+            stats["mean_error"] += (error - stats["mean_error"]) / stats["calls"]
+            stats["mean_abs_error"] += (abs(error) - stats["mean_abs_error"]) / stats["calls"]
+            if kind == "prompt":
+                # estimated already includes the current correction
+                correction = self._corrections.get(model, 1.0)
+                target = correction * actual / estimated
+                correction += CALIBRATION_RATE * (target - correction)
+                self._corrections[model] = min(MAX_CORRECTION, max(MIN_CORRECTION, correction))
+
+    def error_report(self) -> Dict[str, Dict]:
+        """
+        Estimation error per model.
+
+        Returns:
+            Dict[str, Dict]: Per model and kind, the number of calls, mean relative
+                error (positive means overestimated) and mean absolute relative
+                error, plus the current correction factor
+        """
+        with self._lock:
+            return {
+                model: {**{kind: dict(stats) for kind, stats in kinds.items()},
+                        "correction": self._corrections.get(model, 1.0)}
+                for model, kinds in self._errors.items()
+            }
+
+# Global token estimator instance
+token_estimator = TokenEstimator()
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimate the tokens in a text with the global estimator."""
+    return token_estimator.count(text, model)
+
+def estimate_message_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+    """Estimate the prompt tokens of chat messages with the global estimator."""
+    return token_estimator.count_messages(messages, model)
@@ -1,8 +1,6 @@
-import openai
 from typing import List, Dict
 from .models import SelectedContent
 from ..reviewer.models import ReviewedContent
-from .. import config
 
 def select_best_version(versions: List[ReviewedContent]) -> ReviewedContent:
     """
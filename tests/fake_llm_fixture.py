@@ -0,0 +1,23 @@
+"""Shared fixture that points the pipeline at a local fake LLM server.
+
+Test modules import the fixture to use it:
+
+    from fake_llm_fixture import fake_llm
+"""
+import pytest
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.utils.backends import set_backend
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Fixture for a fake LLM server the pipeline is pointed at, with model routing off."""
+    with FakeLLMServer(seed=0) as server:
+        monkeypatch.setattr(config, "OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+        monkeypatch.setattr(config, "MODEL_ROUTING", False)
+        previous = set_backend(None)
+        try:
+            yield server
+        finally:
+            set_backend(previous)
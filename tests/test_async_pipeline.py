@@ -0,0 +1,80 @@
+import asyncio
+import time
+import pytest
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.input_handler.content_input import ContentInput
+from src.utils.backends import LLMBackend, set_backend
+from fake_llm_fixture import fake_llm
+
+SECTIONS = [
+    ContentInput(section=section, keypoints=["Gold nanoparticles"], word_limit=120)
+    for section in ["Introduction", "Methods", "Results", "Discussion"]
+]
+
+def test_sections_share_one_event_loop(fake_llm):
+    """Test that concurrent sections overlap their calls instead of running one after another."""
+    from src.pipeline import arun_paper
+    fake_llm.latency = 0.2
+
+    start = time.perf_counter()
+    published = asyncio.run(arun_paper(SECTIONS, "fake-key", num_versions=2))
+    elapsed = time.perf_counter() - start
+
+    assert [p.formatted_content["section"] for p in published] == [s.section for s in SECTIONS]
+    assert all(p.original_content.cited_content and p.metadata["pipeline"]["num_versions"] == 2 for p in published)
+    # Four sections of four sequential stages each: about 4 x 0.2s when they overlap
+    assert fake_llm.requests >= 4 * 4
+    assert elapsed < 4 * 4 * 0.2
+
+def test_async_stage_functions(fake_llm):
+    """Test the async stage functions against the fake server."""
+    from src.reviewer import areview_content
+    from src.revision_agent import arevise_content
+    from src.citation_editor import aadd_citations
+
+    async def run():
+        return await asyncio.gather(
+            areview_content("Gold nanoparticles are studied widely.", api_key="fake-key"),
+            arevise_content("Gold nanoparticles are studied widely.", api_key="fake-key"),
+            aadd_citations("Gold nanoparticles are studied widely.", api_key="fake-key")
+        )
+
+    reviewed, revised, cited = asyncio.run(run())
+    assert 0 <= reviewed.total_score <= 10
+    assert revised.revised_content
+    assert cited.cited_content
+
+def test_backend_without_acreate_runs_on_a_thread(monkeypatch):
+    """Test that a backend with only create() still serves the async pipeline."""
+    from openai.types.chat import ChatCompletion
+    from src.pipeline import arun_section
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "MODEL_ROUTING", False)
+
+    class SyncBackend(LLMBackend):
+        def __init__(self):
+            self.fake = FakeLLMServer(seed=0)
+
+        def create(self, messages, api_key, **params):
+            return ChatCompletion.model_validate(self.fake.complete({"messages": messages, **params}))
+
+    previous = set_backend(SyncBackend())
+    try:
+        published = asyncio.run(arun_section(SECTIONS[0], "unused-key", num_versions=2))
+    finally:
+        set_backend(previous)
+    assert published.original_content.cited_content
+    assert len(published.metadata["pipeline"]["review_scores"]) >= 1
+
+def test_async_section_rescores_revision(fake_llm):
+    """Test that arun_section re-scores the revision when asked to."""
+    from src.pipeline import arun_section
+    published = asyncio.run(arun_section(SECTIONS[0], "fake-key", num_versions=1, rescore_revision=True))
+    assert published.metadata["pipeline"]["revised_score"] is not None
+
+def test_async_section_rejects_speculative():
+    """Test that arun_section refuses speculative revision instead of ignoring it."""
+    from src.pipeline import arun_section
+    with pytest.raises(ValueError, match="speculative"):
+        asyncio.run(arun_section(SECTIONS[0], "fake-key", speculative=True))
@@ -0,0 +1,71 @@
+import time
+import pytest
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.input_handler.content_input import ContentInput
+from src.utils.cost_tracker import cost_tracker
+from src.utils.backends import RecordingBackend, ReplayBackend, CassetteMiss, set_backend, create_backend
+
+SECTION = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Fixture restoring the default backend after a test."""
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    previous = set_backend(None)
+    yield
+    set_backend(previous)
+
+def test_record_then_replay_pipeline(backend, tmp_path, monkeypatch):
+    """Test that a recorded pipeline run replays identically without the server."""
+    from src.pipeline import run_section
+    cassette = str(tmp_path / "run.jsonl")
+
+    with FakeLLMServer(seed=0, latency=0.02) as server:
+        monkeypatch.setattr(config, "OPENAI_BASE_URL", server.base_url)
+        set_backend(RecordingBackend(cassette))
+        recorded = run_section(SECTION, "fake-key", num_versions=2)
+        requests = server.requests
+
+    replay = ReplayBackend(cassette, latency_scale=0)
+    assert len(replay) == requests
+    set_backend(replay)
+    start = time.perf_counter()
+    replayed = run_section(SECTION, "fake-key", num_versions=2)
+
+    assert time.perf_counter() - start < 0.02 * requests
+    assert replay.hits == requests
+    assert replayed.formatted_content["content"] == recorded.formatted_content["content"]
+    assert replayed.metadata["pipeline"]["review_scores"] == recorded.metadata["pipeline"]["review_scores"]
+
+def test_replay_scales_latency_and_reports_misses(backend, tmp_path, monkeypatch):
+    """Test scaled replay latency and unknown requests."""
+    from src.utils.llm import chat_completion
+    cassette = str(tmp_path / "call.jsonl")
+    messages = [{"role": "user", "content": "Hello"}]
+
+    with FakeLLMServer(seed=0, latency=0.1) as server:
+        monkeypatch.setattr(config, "OPENAI_BASE_URL", server.base_url)
+        set_backend(RecordingBackend(cassette))
+        recorded = chat_completion(messages, "fake-key", "generate_content")
+
+    set_backend(ReplayBackend(cassette, latency_scale=0.5))
+    start = time.perf_counter()
+    with cost_tracker.track_calls() as calls:
+        replayed = chat_completion(messages, "fake-key", "generate_content")
+    elapsed = time.perf_counter() - start
+
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+    assert 0.04 <= elapsed < 0.1
+    assert 0.04 <= calls[0]["latency"] <= elapsed
+    with pytest.raises(CassetteMiss):
+        chat_completion([{"role": "user", "content": "Unrecorded"}], "fake-key", "generate_content")
+
+def test_create_backend_from_config(monkeypatch):
+    """Test choosing the backend by mode name."""
+    monkeypatch.setattr(config, "CASSETTE_PATH", None)
+    assert create_backend("openai").name == "openai"
+    with pytest.raises(ValueError):
+        create_backend("replay")
+    with pytest.raises(ValueError):
+        create_backend("unknown")
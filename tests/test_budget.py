@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src import config
+from src.input_handler.content_input import ContentInput
+from src.utils.budget import Budget, BudgetExceeded, use_budget
+from src.utils.tokens import estimate_message_tokens
+
+MESSAGES = [{"role": "user", "content": "word " * 400}]
+
+@pytest.fixture
+def models(monkeypatch):
+    """Fixture for an expensive and a cheap model with known rates."""
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "CHEAP_MODEL_NAME", "gpt-4o-mini")
+    monkeypatch.setattr(config, "MODEL_ROUTING", False)
+
+@pytest.fixture
+def client():
+    """Fixture for a mocked OpenAI client returning fixed usage."""
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(index=0, message=MagicMock(content="Answer"))],
+        usage=MagicMock(prompt_tokens=500, completion_tokens=500)
+    )
+    with patch('src.utils.llm.get_client', return_value=client):
+        yield client
+
+def test_nested_budget_reserve_and_settle():
+    """Test that calls count against every budget up the chain."""
+    batch = Budget(max_cost=1.0, name="batch")
+    section = Budget(max_cost=0.5, name="section", parent=batch)
+
+    reservation = section.reserve(0.4, 100)
+    assert section.remaining_cost() == pytest.approx(0.1)
+    section.settle(reservation, 0.3, 80)
+
+    assert section.spent_cost == pytest.approx(0.3)
+    assert batch.spent_cost == pytest.approx(0.3)
+    assert batch.reserved_cost == pytest.approx(0.0)
+    with pytest.raises(BudgetExceeded):
+        section.reserve(0.3, 10)
+
+def test_call_refused_before_sending(models, client):
+    """Test that a call that cannot fit is refused without contacting the API."""
+    from src.utils.llm import chat_completion
+    with use_budget(Budget(max_cost=0.0001)):
+        with pytest.raises(BudgetExceeded):
+            chat_completion(MESSAGES, "key", "review_content")
+    client.chat.completions.create.assert_not_called()
+
+def test_call_downgraded_to_cheap_model(models, client, caplog):
+    """Test that a call too expensive for the budget is sent to the cheap model."""
+    from src.utils.llm import chat_completion
+    budget = Budget(max_cost=0.01)
+    with use_budget(budget):
+        chat_completion(MESSAGES, "key", "review_content")
+
+    assert client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o-mini"
+    assert budget.downgrades == 1
+    assert budget.spent_tokens == 1000
+    assert "downgrading call from gpt-4o to gpt-4o-mini" in caplog.text
+
+def test_downgrades_counted_under_lock():
+    """Test that downgrades reserved from many threads are all counted."""
+    import threading
+    budget = Budget()
+
+    def reserve():
+        for _ in range(200):
+            budget.settle(budget.reserve(0.0, 1, downgraded=True))
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert budget.downgrades == 8 * 200
+
+def test_token_budget_caps_max_tokens(models, client):
+    """Test that max_tokens is lowered so a token budget cannot be overrun."""
+    from src.utils.llm import chat_completion
+    budget = Budget(max_tokens=estimate_message_tokens(MESSAGES, "gpt-4o") + 300)
+    with use_budget(budget):
+        chat_completion(MESSAGES, "key", "review_content")
+    assert client.chat.completions.create.call_args.kwargs["max_tokens"] == 300
+
+def test_fewer_drafts_when_budget_is_low(models):
+    """Test that the orchestrator plans fewer drafts for a small budget."""
+    from src.pipeline.orchestrator import affordable_versions, estimate_section_cost
+    section_input = ContentInput(section="Introduction", keypoints=["Point"], word_limit=500)
+    two_drafts, _ = estimate_section_cost(section_input, 2)
+
+    assert affordable_versions(Budget(), section_input, 5) == 5
+    assert affordable_versions(Budget(max_cost=two_drafts), section_input, 5) == 2
+    assert affordable_versions(Budget(max_cost=0.0), section_input, 5) == 1
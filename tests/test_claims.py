@@ -0,0 +1,77 @@
+from src import config
+from src.input_handler.content_input import ContentInput
+from src.utils.cost_tracker import cost_tracker
+from fake_llm_fixture import fake_llm
+
+TEXT = """Gold nanoparticles are small metal particles. Particles of 3.5 nm show a 20% plasmon shift.
+
+This is the second paragraph. However, yields were higher than with citrate reduction. Bayesian optimization has been used widely for synthesis planning. We then dried the samples."""
+
+def test_detect_claims_flags_only_supported_statements():
+    """Test that quantitative, comparative, evidence and method sentences are flagged."""
+    from src.citation_editor import detect_claims
+    claims = detect_claims(TEXT)
+    assert [(c.paragraph, c.sentence) for c in claims] == [(1, 2), (2, 2), (2, 3)]
+    assert claims[0].signals == ["quantitative"]
+    assert claims[1].signals == ["comparative"]
+    assert set(claims[2].signals) == {"evidence", "named_method"}
+    assert all(TEXT[c.start:c.end] == c.text for c in claims)
+
+def test_prompt_carries_only_flagged_sentences_with_context():
+    """Test that unflagged sentences stay local, except as context for a dependent claim."""
+    from src.citation_editor.claims import create_claim_citation_messages, detect_claims
+    prompt = create_claim_citation_messages(TEXT, detect_claims(TEXT))[-1]["content"]
+    assert "We then dried the samples." not in prompt
+    assert "Gold nanoparticles are small metal particles." not in prompt
+    assert "(after: This is the second paragraph.)" in prompt
+
+def test_reasons_inserted_after_their_sentences():
+    """Test that reasons from the response are placed after the matching sentences."""
+    from src.citation_editor.claims import claim_citations_from_response, detect_claims
+    claims = detect_claims(TEXT)
+    cited = claim_citations_from_response(TEXT, claims, "1 | Reason: Measured shift\n3 | Reason: Prior use of the method\n9 | Reason: Unknown")
+
+    assert "20% plasmon shift. [Measured shift]" in cited.cited_content
+    assert "synthesis planning. [Prior use of the method] We then" in cited.cited_content
+    assert [c.location for c in cited.citations] == ["Paragraph 1, sentence 2", "Paragraph 2, sentence 3"]
+    assert cited.original_content == TEXT
+
+def test_run_section_cites_claims_only(fake_llm, monkeypatch):
+    """Test that the pipeline uses the claim detector when CITE_CLAIMS_ONLY is set."""
+    from src.pipeline import run_section
+    monkeypatch.setattr(config, "CITE_CLAIMS_ONLY", True)
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+    with cost_tracker.track_calls() as calls:
+        published = run_section(section, "fake-key", num_versions=1)
+
+    operations = [call["operation"] for call in calls]
+    assert "cite_claims" in operations and "add_citations" not in operations
+    assert published.original_content.citations
+
+def test_abbreviations_do_not_end_sentences():
+    """Test that full stops of abbreviations such as et al., e.g. and Fig. stay inside their sentence."""
+    from src.citation_editor.claims import detect_claims, split_sentences
+    text = "Smith et al. (2020) showed that catalysis works. See Fig. 2 for the setup, e.g. the reactor. It ran overnight."
+    sentences = split_sentences(text)
+    assert [s.text for s in sentences] == [
+        "Smith et al. (2020) showed that catalysis works.",
+        "See Fig. 2 for the setup, e.g. the reactor.",
+        "It ran overnight."
+    ]
+    assert [(c.sentence, c.text) for c in detect_claims(text)] == [(1, "Smith et al. (2020) showed that catalysis works.")]
+
+def test_plain_statements_are_not_flagged():
+    """Test that acronyms, years and phrases like rather than are not taken for claims."""
+    from src.citation_editor import detect_claims
+    text = ("DNA is a molecule. The samples were stored in 2021. We used water rather than ethanol. "
+            "Nothing other than the buffer was added. The model was trained once.")
+    assert detect_claims(text) == []
+
+def test_cite_claims_caps_its_output(fake_llm):
+    """Test that the citation call asks for no more tokens than one short reason per claim."""
+    from unittest.mock import patch
+    from src.utils import llm
+    from src.citation_editor.claims import CLAIM_REASON_TOKENS, cite_claims, detect_claims
+    with patch.object(llm, "_send", wraps=llm._send) as send:
+        cite_claims(TEXT, "fake-key")
+    assert send.call_args.args[3]["max_tokens"] == CLAIM_REASON_TOKENS * len(detect_claims(TEXT))
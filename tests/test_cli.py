@@ -0,0 +1,65 @@
+import sys
+import json
+import subprocess
+from pathlib import Path
+from src.cli import main
+
+PROJECT_ROOT = str(Path(__file__).parent.parent)
+
+def _imported_modules(code: str) -> list:
+    """Run code in a fresh interpreter and list the heavy modules it imported."""
+    script = f"{code}\nimport sys\nprint(','.join(m for m in ('openai', 'pydantic', 'dotenv', 'rich') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+def test_cli_import_is_lazy():
+    """Test that starting the CLI does not import heavy dependencies."""
+    assert _imported_modules("import src.cli") == []
+
+def test_publisher_does_not_import_openai():
+    """Test that the publish path does not load the OpenAI client or .env file."""
+    modules = _imported_modules("from src.publisher import publish_content")
+    assert "openai" not in modules
+    assert "dotenv" not in modules
+
+def test_help_does_not_import_typer():
+    """Test that --help and publish --help run on argparse alone."""
+    for argv in (["--help"], ["publish", "--help"]):
+        script = f"import sys\nfrom src.cli import main\ntry:\n    main({argv!r})\nexcept SystemExit:\n    pass\nprint(','.join(m for m in ('typer', 'click', 'rich') if m in sys.modules), file=sys.stderr)"
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        assert result.stderr.strip() == ""
+
+def test_help_lists_commands(capsys):
+    """Test that every subcommand is registered."""
+    assert main([]) == 0
+    output = capsys.readouterr().out
+    for command in ["run", "batch", "publish", "export", "cost-report"]:
+        assert command in output
+
+def test_publish_and_export(tmp_path, capsys):
+    """Test publishing existing cited content and exporting it."""
+    cited_file = tmp_path / "cited.json"
+    cited_file.write_text(json.dumps({
+        "original_content": "Text",
+        "cited_content": "Gold nanoparticles are used widely [Reason].",
+        "citations": [{"text": "[Reason]", "source": "Citation reason", "location": "P1", "reason": "Reason"}],
+        "citation_changes": [],
+        "citation_summary": "Added 1 citation"
+    }))
+
+    assert main(["publish", str(cited_file), "--section", "Results", "--word-limit", "6", "-o", str(tmp_path)]) == 0
+    published_file = next(tmp_path.glob("published_content_*.json"))
+    assert json.loads(published_file.read_text())["formatted_content"]["section"] == "Results"
+
+    assert main(["export", str(published_file), "-s", "markdown", "-o", str(tmp_path)]) == 0
+    assert next(tmp_path.glob("published_content_*.md")).read_text().startswith("# Results")
+
+def test_cost_report(tmp_path, capsys):
+    """Test summarising saved cost histories."""
+    from src.utils.cost_tracker import CostTracker
+    tracker = CostTracker()
+    tracker.add_call(model="gpt-4", input_tokens=1000, output_tokens=1000, operation="generate_content")
+    tracker.save(str(tmp_path / "costs.json"))
+
+    assert main(["cost-report", str(tmp_path / "costs.json")]) == 0
+    assert "Total Cost: $0.0900" in capsys.readouterr().out
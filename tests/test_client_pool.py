@@ -0,0 +1,95 @@
+import pytest
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from openai import InternalServerError
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.utils.backends import set_backend, create_backend
+from src.utils.client_pool import ClientPool, Endpoint, NoHealthyEndpoint, PooledBackend, parse_endpoints
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+def _pool(servers, **kwargs):
+    """Pool with one endpoint per fake server."""
+    return ClientPool([Endpoint(server.base_url, f"key-{i}") for i, server in enumerate(servers)], **kwargs)
+
+def test_parse_endpoints():
+    """Test parsing endpoints with default URLs and weights."""
+    endpoints = parse_endpoints("|sk-one, https://proxy.example/v1|sk-two|2")
+    assert [(e.base_url, e.api_key, e.weight) for e in endpoints] == [
+        (None, "sk-one", 1.0), ("https://proxy.example/v1", "sk-two", 2.0)
+    ]
+    with pytest.raises(ValueError):
+        parse_endpoints("https://proxy.example/v1")
+    for weight in ("0", "-1", "nan"):
+        with pytest.raises(ValueError):
+            parse_endpoints(f"|sk-aaaa|{weight}")
+
+def test_requests_spread_by_outstanding_load():
+    """Test that concurrent requests are shared between endpoints."""
+    with FakeLLMServer(latency=0.05, seed=0) as a, FakeLLMServer(latency=0.05, seed=1) as b:
+        pool = _pool([a, b])
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: pool.create(MESSAGES, model="gpt-4o"), range(8)))
+        assert (a.requests, b.requests) == (4, 4)
+
+def test_weights_shift_traffic():
+    """Test that a heavier endpoint takes a larger share of sequential requests."""
+    with FakeLLMServer(seed=0) as a, FakeLLMServer(seed=1) as b:
+        pool = ClientPool([Endpoint(a.base_url, "key-a", weight=3), Endpoint(b.base_url, "key-b")])
+        for _ in range(8):
+            pool.create(MESSAGES, model="gpt-4o")
+        assert (a.requests, b.requests) == (6, 2)
+
+def test_failing_endpoint_circuit_opens_and_requests_fail_over():
+    """Test that errors fail over and a broken endpoint is skipped once its circuit opens."""
+    with FakeLLMServer(error_rate=1.0, seed=0) as broken, FakeLLMServer(seed=1) as healthy:
+        pool = _pool([broken, healthy], failure_threshold=2, cooldown=60)
+        for _ in range(6):
+            pool.create(MESSAGES, model="gpt-4o")
+
+        assert broken.requests == 2
+        assert healthy.requests == 6
+        report = pool.report()
+        assert report[0]["circuit_open"] and report[0]["failures"] == 2
+        assert not report[1]["circuit_open"]
+
+def test_half_open_probe_closes_recovered_circuit():
+    """Test that an endpoint is used again after a successful probe."""
+    with FakeLLMServer(error_rate=1.0, seed=0) as flaky, FakeLLMServer(seed=1) as healthy:
+        pool = _pool([flaky, healthy], failure_threshold=1, cooldown=0)
+        pool.create(MESSAGES, model="gpt-4o")
+        assert pool.report()[0]["circuit_open"]
+
+        flaky.error_rate = 0.0
+        pool.create(MESSAGES, model="gpt-4o")
+        assert not pool.report()[0]["circuit_open"]
+
+def test_all_endpoints_failing_raises():
+    """Test that the last error is raised when every endpoint fails."""
+    with FakeLLMServer(error_rate=1.0, seed=0) as a, FakeLLMServer(error_rate=1.0, seed=1) as b:
+        pool = _pool([a, b], failure_threshold=1, cooldown=60)
+        with pytest.raises(InternalServerError):
+            pool.create(MESSAGES, model="gpt-4o")
+        with pytest.raises(NoHealthyEndpoint):
+            pool.create(MESSAGES, model="gpt-4o")
+
+def test_pipeline_runs_across_endpoints(monkeypatch):
+    """Test a full section served by a pool configured in LLM_ENDPOINTS."""
+    from src.pipeline import run_section
+    from src.input_handler.content_input import ContentInput
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "MODEL_ROUTING", False)
+    monkeypatch.setattr(config, "LLM_BACKEND", "openai")
+
+    with FakeLLMServer(seed=0) as a, FakeLLMServer(seed=1) as b:
+        monkeypatch.setattr(config, "LLM_ENDPOINTS", f"{a.base_url}|key-a,{b.base_url}|key-b")
+        backend = create_backend()
+        assert isinstance(backend, PooledBackend)
+        previous = set_backend(backend)
+        try:
+            section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+            contextvars.copy_context().run(run_section, section, "unused-key", num_versions=2)
+        finally:
+            set_backend(previous)
+        assert a.requests > 0 and b.requests > 0
@@ -0,0 +1,134 @@
+import asyncio
+import time
+import threading
+import pytest
+from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from openai import RateLimitError
+from src import config
+from src.utils.backends import LLMBackend, set_backend
+from src.utils.concurrency import AdaptiveLimiter, set_limiter, get_limiter
+from src.utils.deadline import Deadline, DeadlineExceeded, use_deadline
+
+def _call(limiter, seconds=0.0, key="review_content:gpt-4o"):
+    """Hold a slot for a while."""
+    with limiter.slot(key):
+        time.sleep(seconds)
+
+def test_limit_grows_while_latency_is_stable():
+    """Test additive increase of about one per round of calls."""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=10)
+    for _ in range(3):
+        _call(limiter)
+    assert limiter.limit == 3
+    for _ in range(100):
+        _call(limiter)
+    assert limiter.limit == 10
+    assert limiter.report()["peak_limit"] == 10
+
+def test_burst_of_429s_cuts_once():
+    """Test that overloaded calls from one round halve the limit only once."""
+    limiter = AdaptiveLimiter(initial=8, min_limit=1, max_limit=10)
+    barrier = threading.Barrier(4)
+
+    def overloaded():
+        with limiter.slot() as slot:
+            barrier.wait()
+            slot.overloaded()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: overloaded(), range(4)))
+    assert limiter.limit == 4
+    assert limiter.report()["decreases"] == 1
+
+def test_latency_spike_cuts_limit():
+    """Test that a call much slower than usual for its kind cuts the limit."""
+    limiter = AdaptiveLimiter(initial=8, min_limit=1, max_limit=10)
+    for _ in range(3):
+        _call(limiter, 0.01)
+    _call(limiter, 0.01, key="generate_content:gpt-4o")
+    _call(limiter, 0.2, key="generate_content:gpt-4o")  # First of its kind is not a spike
+    before = limiter.limit
+    _call(limiter, 0.2)
+    assert limiter.limit == before // 2
+
+def test_in_flight_calls_never_exceed_limit():
+    """Test that calls wait for a free slot."""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2)
+    peak = []
+
+    def call():
+        with limiter.slot():
+            peak.append(limiter.in_flight)
+            time.sleep(0.03)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(lambda _: call(), range(6)))
+    assert max(peak) == 2
+
+def test_waiting_for_slot_respects_deadline():
+    """Test that a call stops waiting for a slot when its deadline passes."""
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1)
+    with limiter.slot():
+        with use_deadline(Deadline(0.05, name="section")):
+            with pytest.raises(DeadlineExceeded):
+                with limiter.slot():
+                    pass
+
+class RateLimitedBackend(LLMBackend):
+    """Backend answering every request with a 429."""
+
+    def create(self, messages, api_key, **params):
+        error = RateLimitError.__new__(RateLimitError)
+        Exception.__init__(error, "Rate limit reached for requests")
+        raise error
+
+def test_chat_completion_reports_429s(monkeypatch):
+    """Test that rate-limited calls through the shared call path cut the limit."""
+    from src.utils.llm import chat_completion
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "ADAPTIVE_CONCURRENCY", True)
+    previous_limiter = set_limiter(AdaptiveLimiter(initial=8, min_limit=1, max_limit=16))
+    previous_backend = set_backend(RateLimitedBackend())
+    try:
+        with pytest.raises(RateLimitError):
+            chat_completion([{"role": "user", "content": "Hello"}], "key", "review_content")
+        assert get_limiter().report()["limit"] == 4
+    finally:
+        set_backend(previous_backend)
+        set_limiter(previous_limiter)
+
+def test_async_calls_share_the_limit():
+    """Test that coroutines wait for a slot on the event loop and respect the limit."""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2)
+    peak = []
+
+    async def call():
+        async with limiter.aslot():
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.03)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert len(peak) == 6
+    assert time.perf_counter() - start >= 3 * 0.03
+
+def test_achat_completion_reports_429s(monkeypatch):
+    """Test that rate-limited async calls cut the shared limit as threaded calls do."""
+    from src.utils.llm import achat_completion
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "ADAPTIVE_CONCURRENCY", True)
+    previous_limiter = set_limiter(AdaptiveLimiter(initial=8, min_limit=1, max_limit=16))
+    previous_backend = set_backend(RateLimitedBackend())
+    try:
+        with pytest.raises(RateLimitError):
+            asyncio.run(achat_completion([{"role": "user", "content": "Hello"}], "key", "review_content"))
+        assert get_limiter().report()["limit"] == 4
+        assert get_limiter().report()["in_flight"] == 0
+    finally:
+        set_backend(previous_backend)
+        set_limiter(previous_limiter)
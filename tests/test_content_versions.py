@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+def _completion(contents, prompt_tokens=100, completion_tokens=60):
+    """Build a mocked ChatCompletion with one choice per content."""
+    return MagicMock(
+        choices=[MagicMock(index=i, message=MagicMock(content=c)) for i, c in enumerate(contents)],
+        usage=MagicMock(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    )
+
+def test_split_usage_across_choices():
+    """Test that multi-choice usage is split without losing tokens."""
+    from src.utils.llm import split_usage
+    parts = split_usage(_completion(["a" * 10, "b" * 20, "c" * 30], prompt_tokens=101, completion_tokens=60))
+    assert sum(p[0] for p in parts) == 101
+    assert sum(p[1] for p in parts) == 60
+    assert [p[1] for p in parts] == [10, 20, 30]
+
+@patch('src.content_generator.generator.chat_completion')
+def test_generate_versions_single_request(mock_chat):
+    """Test that all versions come from one request using the n parameter."""
+    from src.content_generator.generator import generate_content_versions
+    mock_chat.return_value = _completion(["Draft 1", "Draft 2", "Draft 3"])
+
+    versions = generate_content_versions("Introduction", ["Point 1"], 500, "key", num_versions=3, model="gpt-4o")
+
+    assert mock_chat.call_count == 1
+    assert mock_chat.call_args.kwargs["n"] == 3
+    assert [v.content for v in versions] == ["Draft 1", "Draft 2", "Draft 3"]
+    assert versions[2].generation_params["choice_index"] == 2
+
+@patch('src.content_generator.generator.chat_completion')
+def test_generate_versions_fallback_without_n(mock_chat):
+    """Test falling back to concurrent single requests when n is rejected."""
+    from openai import BadRequestError
+    from src.content_generator import generator
+    error = BadRequestError.__new__(BadRequestError)
+    Exception.__init__(error, "Unsupported parameter: 'n'")
+    error.param = "n"
+    mock_chat.side_effect = [error, _completion(["A"]), _completion(["B"])]
+
+    versions = generator.generate_content_versions("Introduction", ["Point 1"], 500, "key", num_versions=2, model="no-n-model")
+    assert "no-n-model" in generator._N_UNSUPPORTED_MODELS
+
+    assert sorted(v.content for v in versions) == ["A", "B"]
+    assert mock_chat.call_count == 3
+
+def _draft(content):
+    """Build a GeneratedContent draft."""
+    from src.content_generator import GeneratedContent
+    return GeneratedContent(content=content, section="Introduction", word_limit=500, generation_params={})
+
+def test_deduplicate_versions():
+    """Test collapsing near-duplicate drafts before review."""
+    from src.content_generator import deduplicate_versions
+    base = " ".join(f"word{i}" for i in range(300))
+    near_duplicate = base.replace("word150", "changed")
+    distinct = " ".join(f"other{i}" for i in range(300))
+
+    kept, result = deduplicate_versions([_draft(base), _draft(near_duplicate), _draft(distinct)], threshold=0.9)
+
+    assert [v.content for v in kept] == [base, distinct]
+    assert result.kept == [0, 2]
+    assert len(result.duplicates) == 1
+    assert result.duplicates[0].index == 1
+    assert result.duplicates[0].duplicate_of == 0
+    assert result.duplicates[0].similarity >= 0.9
+
+def test_deduplicate_versions_threshold():
+    """Test that drafts below the threshold are all kept."""
+    from src.content_generator import deduplicate_versions
+    base = " ".join(f"word{i}" for i in range(100))
+    rewritten = " ".join(f"word{i}" if i % 3 else f"new{i}" for i in range(100))
+    kept, result = deduplicate_versions([_draft(base), _draft(rewritten)], threshold=0.9)
+    assert len(kept) == 2
+    assert result.duplicates == []
+
+def test_minhash_signature_is_stable_across_processes():
+    """Test that signatures do not depend on the per-process hash seed."""
+    import os
+    import subprocess
+    import sys
+    code = "from src.content_generator.dedup import minhash_signature; print(sorted(minhash_signature('one two three four five six seven')))"
+    outputs = {
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
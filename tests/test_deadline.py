@@ -0,0 +1,109 @@
+import time
+import pytest
+from src import config
+from src.fake_llm import FakeLLMServer
+from src.fake_llm.responses import detect_stage
+from src.input_handler.content_input import ContentInput
+from src.utils.backends import LLMBackend, set_backend
+from src.utils.deadline import Deadline, DeadlineExceeded, use_deadline
+
+SECTION = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+
+class StallingBackend(LLMBackend):
+    """Canned responses, except that some stages hang until their timeout."""
+
+    def __init__(self, stalled_stages):
+        self.fake = FakeLLMServer(seed=0)
+        self.stalled_stages = stalled_stages
+        self.timeouts = []
+
+    def create(self, messages, api_key, **params):
+        from openai.types.chat import ChatCompletion
+
+        self.timeouts.append(params.get("timeout"))
+        if detect_stage(messages) in self.stalled_stages:
+            time.sleep(params.get("timeout") or 10)
+            raise TimeoutError("Request timed out")
+        return ChatCompletion.model_validate(self.fake.complete({"messages": messages, **params}))
+
+@pytest.fixture
+def stalling(monkeypatch):
+    """Fixture installing a stalling backend for a test."""
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "MODEL_ROUTING", False)
+    monkeypatch.setattr(config, "SECTION_TIMEOUT", None)
+    backends = []
+
+    def install(*stages):
+        backends.append(StallingBackend(stages))
+        set_backend(backends[-1])
+        return backends[-1]
+
+    previous = set_backend(None)
+    yield install
+    set_backend(previous)
+
+def test_child_deadline_never_outlives_parent():
+    """Test that nested deadlines keep the tightest limit."""
+    job = Deadline(1.0, name="job")
+    stage = job.child(0.5, name="stage")
+    assert stage.timeout == pytest.approx(0.5, abs=0.01)
+    assert Deadline(10.0, name="section", parent=job).timeout == pytest.approx(1.0, abs=0.01)
+    assert Deadline(name="unbounded").remaining() is None
+
+    expired = Deadline(0.0, name="job")
+    with pytest.raises(DeadlineExceeded, match="job deadline"):
+        expired.check("review_content")
+
+def test_call_gets_remaining_time_as_timeout(stalling):
+    """Test that the time left is passed to the request and a cut-off call raises."""
+    from src.utils.llm import chat_completion
+    backend = stalling("generate")
+    messages = [{"role": "user", "content": "Generate an academic Introduction section that is EXACTLY 100 words"}]
+
+    with use_deadline(Deadline(0.2, name="section")):
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded, match="during generate_content"):
+            chat_completion(messages, "key", "generate_content")
+        # Later calls are refused without reaching the backend
+        with pytest.raises(DeadlineExceeded):
+            chat_completion(messages, "key", "generate_content")
+
+    assert time.perf_counter() - start < 0.5
+    assert len(backend.timeouts) == 1
+    assert 0 < backend.timeouts[0] <= 0.2
+
+def test_section_publishes_best_draft_when_revision_stalls(stalling):
+    """Test that a stalled revision yields the selected draft with citations."""
+    from src.pipeline import run_section
+    stalling("revise")
+
+    start = time.perf_counter()
+    published = run_section(SECTION, "key", num_versions=2, deadline=Deadline(1.0, name="job"))
+
+    assert time.perf_counter() - start < 1.5
+    pipeline = published.metadata["pipeline"]
+    assert pipeline["deadline"]["expired_stages"] == ["revise_content"]
+    assert len(pipeline["review_scores"]) == 2
+    assert pipeline["selected_score"] == max(pipeline["review_scores"])
+
+def test_speculative_section_keeps_finished_reviews(stalling):
+    """Test that a stalled speculative revision still publishes the best reviewed draft."""
+    from src.pipeline import run_section
+    stalling("revise")
+
+    published = run_section(SECTION, "key", num_versions=2, speculative=True, deadline=Deadline(1.0, name="job"),
+                            dedup_threshold=1.0)
+
+    pipeline = published.metadata["pipeline"]
+    assert pipeline["deadline"]["expired_stages"] == ["review_content", "revise_content"]
+    assert len(pipeline["review_scores"]) == 2
+    assert pipeline["selected_score"] == max(pipeline["review_scores"])
+
+def test_section_without_drafts_raises(stalling):
+    """Test that a section fails when no draft finishes in time."""
+    from src.pipeline import run_section
+    stalling("generate")
+
+    with pytest.raises(DeadlineExceeded):
+        run_section(SECTION, "key", num_versions=2, deadline=Deadline(0.3, name="job"))
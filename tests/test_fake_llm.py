@@ -0,0 +1,71 @@
+import random
+import time
+import pytest
+from openai import OpenAI, RateLimitError, InternalServerError
+from src.fake_llm import FakeLLMServer, LatencyDistribution
+
+REVIEW_PROMPT = "Review this text.\n\nSCORES:\nClarity: [X]/10 | Feedback: ..."
+
+def _client(server):
+    """Build a client for the fake server that does not retry."""
+    return OpenAI(api_key="fake-key", base_url=server.base_url, max_retries=0)
+
+def test_latency_distributions():
+    """Test parsing and sampling latency distributions."""
+    rng = random.Random(0)
+    assert LatencyDistribution.parse(0.2).sample(rng) == 0.2
+    samples = [LatencyDistribution.parse("uniform:0.1,0.3").sample(rng) for _ in range(100)]
+    assert all(0.1 <= s <= 0.3 for s in samples)
+    assert all(s >= 0 for s in (LatencyDistribution.parse("normal:0.01,0.1").sample(rng) for _ in range(100)))
+    assert str(LatencyDistribution.parse("lognormal:0.3,0.5")) == "lognormal:0.3,0.5"
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("gamma:1,2")
+
+def test_stage_responses():
+    """Test that reviewer prompts get SCORES-format responses."""
+    with FakeLLMServer(seed=0) as server:
+        response = _client(server).chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": REVIEW_PROMPT}])
+    assert response.choices[0].message.content.startswith("SCORES:")
+    assert response.usage.completion_tokens > 0
+
+def test_streaming_at_tokens_per_second():
+    """Test that streamed responses arrive in chunks paced by the token rate."""
+    with FakeLLMServer(seed=0, tokens_per_second=2000) as server:
+        start = time.perf_counter()
+        stream = _client(server).chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": "Generate EXACTLY 200 words"}],
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        chunks = list(stream)
+        elapsed = time.perf_counter() - start
+
+    text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+    usage = chunks[-1].usage
+    assert len(text.split()) >= 200
+    assert len(chunks) > 100
+    assert elapsed >= usage.completion_tokens / 2000 * 0.8
+
+def test_error_injection():
+    """Test injected 429 and 5xx responses."""
+    with FakeLLMServer(seed=0, rate_limit_rate=1.0, retry_after=2) as server:
+        with pytest.raises(RateLimitError) as exc:
+            _client(server).chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Hi"}])
+        assert exc.value.response.headers["retry-after"] == "2"
+        assert server.faults == {429: 1}
+
+    with FakeLLMServer(seed=0, error_rate=1.0) as server:
+        with pytest.raises(InternalServerError):
+            _client(server).chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Hi"}])
+
+    with FakeLLMServer(seed=0, error_rate=0.3) as server:
+        client = _client(server)
+        failures = 0
+        for _ in range(50):
+            try:
+                client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Hi"}])
+            except InternalServerError:
+                failures += 1
+        assert 5 <= failures <= 25
+        assert sum(server.faults.values()) == failures
@@ -0,0 +1,71 @@
+import pytest
+from src.input_handler.content_input import ContentInput
+from src.utils.model_router import OutputRejected
+from fake_llm_fixture import fake_llm
+
+RESPONSE = """Revised and cited content:
+Gold nanoparticles show size-dependent plasmon resonance [Citation: Foundational plasmonics work]. They are widely studied.
+
+Bayesian optimization explores synthesis spaces efficiently [Citation: Prior optimization study].
+
+Revision changes:
+1. First paragraph: Shortened the opening sentence.
+2. Second paragraph: Replaced an informal verb.
+
+Citations:
+1. Location: First paragraph | Reason: Foundational plasmonics work
+2. Location: Second paragraph | Reason: Prior optimization study"""
+
+def test_fused_response_yields_revision_and_citations():
+    """Test that one response is split into matching revised and cited content."""
+    from src.citation_editor.fused import revision_and_citations_from_response
+    revised, cited = revision_and_citations_from_response("Original text.", RESPONSE)
+
+    assert revised.revised_content == (
+        "Gold nanoparticles show size-dependent plasmon resonance. They are widely studied.\n\n"
+        "Bayesian optimization explores synthesis spaces efficiently."
+    )
+    assert cited.original_content == revised.revised_content
+    assert "plasmon resonance [Foundational plasmonics work]." in cited.cited_content
+    assert cited.cited_content.count("[") == 2
+    assert [c.location for c in revised.revision_changes] == ["First paragraph", "Second paragraph"]
+    assert [c.reason for c in cited.citations] == ["Foundational plasmonics work", "Prior optimization study"]
+    assert all(change.type == "citation" for change in cited.citation_changes)
+
+def test_fused_response_keeps_existing_references():
+    """Test that only marked citation reasons are stripped, not the draft's numeric references."""
+    from src.citation_editor.fused import revision_and_citations_from_response
+    response = (
+        "Revised and cited content:\n"
+        "Results agree with prior data [12]. Yields rose by 40% [3, 4] [Citation: Reported yield increase].\n\n"
+        "Citations:\n1. Location: First paragraph | Reason: Reported yield increase"
+    )
+    revised, cited = revision_and_citations_from_response("Original text.", response)
+
+    assert revised.revised_content == "Results agree with prior data [12]. Yields rose by 40% [3, 4]."
+    assert cited.original_content == revised.revised_content
+    assert cited.cited_content == "Results agree with prior data [12]. Yields rose by 40% [3, 4] [Reported yield increase]."
+
+def test_fused_response_without_citations_is_rejected():
+    """Test that a response missing its citations is rejected with a best-effort result."""
+    from src.citation_editor.fused import revision_and_citations_from_response
+    with pytest.raises(OutputRejected) as rejected:
+        revision_and_citations_from_response("Original text.", "Revised and cited content:\nRevised text.")
+    revised, cited = rejected.value.result
+    assert revised.revised_content == "Revised text."
+    assert cited.citations == []
+
+def test_run_section_fused_makes_one_post_selection_call(fake_llm):
+    """Test that the fused pipeline replaces the revise and cite calls with one."""
+    from src.pipeline import run_section
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+
+    published = run_section(section, "fake-key", num_versions=2, fused_revise_cite=True)
+
+    pipeline = published.metadata["pipeline"]
+    operations = pipeline["routing"]["models"]
+    assert pipeline["fused_revise_cite"] is True
+    assert "revise_and_cite" in operations
+    assert "revise_content" not in operations and "add_citations" not in operations
+    assert published.original_content.citations
+    assert "[" not in published.original_content.original_content
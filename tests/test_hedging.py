@@ -0,0 +1,160 @@
+import asyncio
+import time
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src import config
+from src.utils.cost_tracker import cost_tracker
+from src.utils.backends import LLMBackend, set_backend
+from src.utils.hedging import Hedger
+
+def _warm(hedger, latency=0.01, samples=20):
+    """Record typical latencies for a stage."""
+    for _ in range(samples):
+        hedger.observe("revise_content", "gpt-4o", latency)
+
+def test_threshold_needs_samples():
+    """Test that no threshold is set before enough calls were seen."""
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=20)
+    _warm(hedger, samples=19)
+    assert hedger.threshold("revise_content", "gpt-4o") is None
+    _warm(hedger, samples=1)
+    assert hedger.threshold("revise_content", "gpt-4o") == pytest.approx(0.01)
+    assert hedger.threshold("review_content", "gpt-4o") is None
+
+def test_percentile_outside_quantile_range_rejected(monkeypatch):
+    """Test that percentiles without a quantile cut point are rejected instead of mis-indexed."""
+    for percentile in (0, 100, -5):
+        with pytest.raises(ValueError):
+            Hedger(percentile=percentile)
+    monkeypatch.setattr(config, "HEDGE_PERCENTILE", 100.0)
+    hedger = Hedger(max_fraction=1.0, min_samples=2)
+    _warm(hedger)
+    with pytest.raises(ValueError):
+        hedger.threshold("revise_content", "gpt-4o")
+
+def test_slow_call_hedged_and_duplicate_wins():
+    """Test that a duplicate answers a call stuck past the threshold."""
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=20)
+    _warm(hedger)
+    sent = []
+
+    def send(hedge):
+        sent.append(hedge)
+        time.sleep(0.01 if hedge else 0.5)
+        return "duplicate" if hedge else "primary"
+
+    start = time.perf_counter()
+    assert hedger.call("revise_content", "gpt-4o", send) == "duplicate"
+    assert time.perf_counter() - start < 0.3
+    assert sent == [False, True]
+    assert hedger.report()["hedge_wins"] == 1
+
+def test_failed_duplicate_falls_back_to_primary():
+    """Test that the primary response is used when the duplicate fails."""
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=20)
+    _warm(hedger)
+
+    def send(hedge):
+        if hedge:
+            raise RuntimeError("rate limited")
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedger.call("revise_content", "gpt-4o", send) == "primary"
+    assert hedger.report()["hedge_wins"] == 0
+
+def test_hedges_capped_as_fraction_of_calls():
+    """Test that hedges stop once they reach the allowed share of calls."""
+    hedger = Hedger(percentile=50, max_fraction=0.25, min_samples=20)
+    _warm(hedger, latency=0.001)
+    sent = []
+
+    def send(hedge):
+        sent.append(hedge)
+        time.sleep(0.02)
+        return "ok"
+
+    for _ in range(8):
+        hedger.call("revise_content", "gpt-4o", send)
+    assert sent.count(True) == 2
+    assert hedger.report()["hedge_rate"] == pytest.approx(0.25)
+
+def test_async_slow_call_hedged_and_duplicate_wins():
+    """Test that a duplicate task answers an async call stuck past the threshold."""
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=20)
+    _warm(hedger)
+    sent = []
+
+    async def send(hedge):
+        sent.append(hedge)
+        await asyncio.sleep(0.01 if hedge else 0.5)
+        return "duplicate" if hedge else "primary"
+
+    start = time.perf_counter()
+    assert asyncio.run(hedger.acall("revise_content", "gpt-4o", send)) == "duplicate"
+    assert time.perf_counter() - start < 0.3
+    assert sent == [False, True]
+    assert hedger.report()["hedge_wins"] == 1
+
+class SlowFirstBackend(LLMBackend):
+    """Backend whose first request stalls and later ones answer quickly."""
+
+    def __init__(self):
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def create(self, messages, api_key, **params):
+        with self.lock:
+            self.requests += 1
+            first = self.requests == 1
+        time.sleep(0.5 if first else 0.01)
+        return MagicMock(
+            choices=[MagicMock(index=0, message=MagicMock(content="Answer"))],
+            usage=MagicMock(prompt_tokens=100, completion_tokens=50)
+        )
+
+def test_chat_completion_records_hedges(monkeypatch):
+    """Test that hedged duplicates are counted separately in the cost tracker."""
+    from src.utils import llm
+    from src.utils.llm import chat_completion
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "HEDGE_REQUESTS", True)
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=5)
+    _warm(hedger, samples=5)
+    monkeypatch.setattr(llm, "hedger", hedger)
+    previous = set_backend(SlowFirstBackend())
+    hedges_before = cost_tracker.hedge_count
+    try:
+        with cost_tracker.track_calls() as calls:
+            response = chat_completion([{"role": "user", "content": "Hello"}], "key", "revise_content")
+            time.sleep(0.6)  # Let the stalled request finish and record its usage
+    finally:
+        set_backend(previous)
+
+    assert response.choices[0].message.content == "Answer"
+    assert sorted(call["hedge"] for call in calls) == [False, True]
+    assert cost_tracker.hedge_count == hedges_before + 1
+    summary = cost_tracker.hedge_summary(calls)
+    assert summary["hedges"] == 1
+    assert summary["hedge_cost_share"] == pytest.approx(0.5)
+
+def test_concurrent_calls_do_not_queue_or_hedge():
+    """Test that many concurrent calls start at once, so none waits past the threshold for a worker."""
+    hedger = Hedger(percentile=95, max_fraction=1.0, min_samples=20)
+    _warm(hedger, latency=0.2)
+    sent = []
+
+    def send(hedge):
+        sent.append(hedge)
+        time.sleep(0.1)
+        return "ok"
+
+    threads = [threading.Thread(target=hedger.call, args=("revise_content", "gpt-4o", send)) for _ in range(64)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.perf_counter() - start < 0.5
+    assert sent.count(True) == 0
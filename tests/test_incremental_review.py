@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src.reviewer import ReviewedContent, ReviewScore, ReviewCriteria
+from src.reviewer.incremental import ParagraphReviewCache, review_incremental, parse_paragraph_scores
+from fake_llm_fixture import fake_llm
+
+TEXT = "First paragraph about gold.\n\nSecond paragraph about silver.\n\nThird paragraph about copper."
+
+def _paragraph_response(count, score=8):
+    """Build a mocked paragraph review response for count paragraphs."""
+    blocks = [
+        f"[Paragraph {i + 1}]\n" + "\n".join(f"{c.value}: {score}/10 | Feedback: Note {i + 1}" for c in ReviewCriteria)
+        for i in range(count)
+    ]
+    content = "PARAGRAPH SCORES:\n\n" + "\n\n".join(blocks)
+    return MagicMock(choices=[MagicMock(index=0, message=MagicMock(content=content))])
+
+def test_parse_paragraph_scores():
+    """Test parsing per-paragraph score blocks."""
+    parsed = parse_paragraph_scores(_paragraph_response(2).choices[0].message.content)
+    assert sorted(parsed) == [1, 2]
+    assert parsed[2]["CLARITY"].score == 8
+
+@patch('src.reviewer.incremental.chat_completion')
+def test_only_changed_paragraphs_are_rescored(mock_chat):
+    """Test that a revision only sends its changed paragraphs for review."""
+    cache = ParagraphReviewCache()
+    mock_chat.return_value = _paragraph_response(3, score=8)
+    first = review_incremental(TEXT, "key", cache, model="gpt-4o")
+    assert first.total_score == pytest.approx(8.0)
+    assert len(cache) == 3
+
+    revised = TEXT.replace("silver", "platinum")
+    mock_chat.return_value = _paragraph_response(1, score=5)
+    second = review_incremental(revised, "key", cache, model="gpt-4o")
+
+    prompt = mock_chat.call_args.kwargs["messages"][1]["content"]
+    assert "platinum" in prompt and "gold" not in prompt
+    # Paragraphs are weighted by length; each has 4 words
+    assert second.total_score == pytest.approx((8 * 8 + 5 * 4) / 12)
+    assert "Paragraph 2" in second.scores[0].feedback
+    assert cache.hits == 2
+
+@patch('src.reviewer.incremental.chat_completion')
+def test_seeded_cache_needs_no_call(mock_chat):
+    """Test that a full review seeds the cache for unchanged paragraphs."""
+    scores = [ReviewScore(criterion=c, score=7, feedback="ok") for c in ReviewCriteria]
+    cache = ParagraphReviewCache()
+    cache.seed(ReviewedContent(content=TEXT, scores=scores, total_score=7.0, overall_feedback="ok"))
+
+    reviewed = review_incremental(TEXT, "key", cache, model="gpt-4o")
+
+    mock_chat.assert_not_called()
+    assert reviewed.total_score == pytest.approx(7.0)
+
+def test_pipeline_rescores_revision(fake_llm):
+    """Test re-scoring a revision through the pipeline against the fake server."""
+    from src.input_handler.content_input import ContentInput
+    from src.pipeline import run_section
+    section_input = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+    published = run_section(section_input, "fake-key", num_versions=1, rescore_revision=True)
+
+    assert 6 <= published.metadata["pipeline"]["revised_score"] <= 10
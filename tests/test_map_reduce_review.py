@@ -0,0 +1,148 @@
+import pytest
+
+from src.reviewer import ReviewedContent, ReviewScore, ReviewCriteria
+from src.utils.cost_tracker import cost_tracker
+from src.utils.model_router import OutputRejected
+from fake_llm_fixture import fake_llm
+
+PARAGRAPH = "Gold nanoparticles were synthesised by citrate reduction and characterised by absorption spectroscopy."
+
+def make_review(score, feedback="Fine."):
+    """Build a review with the same score on every criterion."""
+    return ReviewedContent(
+        content="part",
+        scores=[ReviewScore(criterion=c, score=score, feedback=f"{feedback} ({c.value})") for c in ReviewCriteria],
+        total_score=float(score),
+        overall_feedback=feedback
+    )
+
+def test_split_chunks_groups_whole_paragraphs():
+    """Test that paragraphs are grouped up to the chunk size and never split."""
+    from src.reviewer.map_reduce import split_chunks
+    text = "\n\n".join([PARAGRAPH] * 5)
+    chunks = split_chunks(text, 40)
+    assert len(chunks) > 1
+    assert all(chunk.split("\n\n") == [PARAGRAPH] * len(chunk.split("\n\n")) for chunk in chunks)
+    assert "\n\n".join(chunks) == text
+    assert split_chunks(text, 10_000) == [text]
+
+def test_merge_scores_weights_by_length_and_keeps_weakest_feedback():
+    """Test that scores are word-weighted and feedback comes from the weakest part."""
+    from src.reviewer.map_reduce import merge_scores
+    merged = merge_scores("whole", [(make_review(9, "Strong."), 300), (make_review(5, "Weak."), 100)])
+    assert [score.score for score in merged.scores] == [8] * len(ReviewCriteria)
+    assert merged.total_score == pytest.approx(8.0)
+    assert merged.scores[0].feedback.startswith("Part 2: Weak.")
+    assert merged.content == "whole"
+
+def test_reduce_response_replaces_feedback_or_is_rejected():
+    """Test that condensed feedback is parsed and incomplete output rejected."""
+    from src.reviewer.map_reduce import merge_scores, reduce_from_response
+    merged = merge_scores("whole", [(make_review(7), 50), (make_review(8), 50)])
+    lines = "\n".join(f"{c.value}: Condensed {c.name.lower()}." for c in ReviewCriteria)
+    reduced = reduce_from_response(merged, f"MERGED FEEDBACK:\n{lines}\n\nOVERALL FEEDBACK:\nGood overall.")
+    assert reduced.scores == [s.model_copy(update={"feedback": f"Condensed {s.criterion.name.lower()}."}) for s in merged.scores]
+    assert reduced.overall_feedback == "Good overall."
+
+    with pytest.raises(OutputRejected) as rejected:
+        reduce_from_response(merged, "MERGED FEEDBACK:\nClarity: Only one.")
+    assert rejected.value.result == merged
+
+def test_review_map_reduce_reduces_chunk_reviews_in_a_tree(fake_llm):
+    """Test that long content is reviewed per chunk and merged by reduce calls."""
+    from src.reviewer import review_map_reduce
+    text = "\n\n".join([PARAGRAPH] * 6)
+    with cost_tracker.track_calls() as calls:
+        reviewed = review_map_reduce(text, "fake-key", chunk_tokens=40, fan_in=2)
+    with cost_tracker.track_calls() as short_calls:
+        review_map_reduce(PARAGRAPH, "fake-key", chunk_tokens=40)
+
+    operations = [call["operation"] for call in calls]
+    # Six chunk reviews, merged into 3, then 2, then 1: 3 + 2 + 1 reduce calls
+    assert operations.count("review_content") == 6
+    assert operations.count("reduce_reviews") == 6
+    assert reviewed.content == text
+    assert len(reviewed.scores) == len(ReviewCriteria)
+    assert reviewed.overall_feedback
+    assert [call["operation"] for call in short_calls] == ["review_content"]
+
+def test_merge_helpers_share_weighting():
+    """Test that paragraph and part reviews are merged by the same weighting."""
+    from src.reviewer import ParagraphReview
+    from src.reviewer.incremental import merge_paragraph_reviews
+    from src.reviewer.map_reduce import merge_scores
+    strong, weak = make_review(9, "Strong."), make_review(5, "Weak.")
+    paragraphs = [
+        ParagraphReview(paragraph_hash="a", word_count=300, scores=strong.scores),
+        ParagraphReview(paragraph_hash="b", word_count=100, scores=weak.scores)
+    ]
+    by_paragraph = merge_paragraph_reviews("whole", paragraphs, 2)
+    by_part = merge_scores("whole", [(strong, 300), (weak, 100)])
+    assert [s.score for s in by_paragraph.scores] == [s.score for s in by_part.scores]
+    assert by_paragraph.scores[0].feedback == by_part.scores[0].feedback.replace("Part", "Paragraph")
+
+def test_fan_in_below_two_rejected():
+    """Test that a fan-in that cannot shrink the reduce tree is rejected before any call."""
+    import asyncio
+    from src.reviewer import review_map_reduce, areview_map_reduce
+    for fan_in in (0, 1):
+        with pytest.raises(ValueError):
+            review_map_reduce(PARAGRAPH, "fake-key", fan_in=fan_in)
+        with pytest.raises(ValueError):
+            asyncio.run(areview_map_reduce(PARAGRAPH, "fake-key", fan_in=fan_in))
+
+def test_chunk_reviews_capped_in_flight(fake_llm, monkeypatch):
+    """Test that a draft with many chunks does not start one worker per chunk."""
+    import threading
+    import time
+    from src.reviewer import map_reduce
+    monkeypatch.setattr(map_reduce, "MAX_CHUNK_WORKERS", 2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    complete = map_reduce.chat_completion
+
+    def chat_completion(**kwargs):
+        with lock:
+            in_flight.append(kwargs["operation"])
+            peak.append(len(in_flight))
+        time.sleep(0.02)
+        try:
+            return complete(**kwargs)
+        finally:
+            with lock:
+                in_flight.remove(kwargs["operation"])
+
+    monkeypatch.setattr(map_reduce, "chat_completion", chat_completion)
+    map_reduce.review_map_reduce("\n\n".join([PARAGRAPH] * 6), "fake-key", chunk_tokens=40)
+    assert max(peak) == 2
+
+def test_async_section_reviews_long_drafts_by_map_reduce(fake_llm, monkeypatch):
+    """Test that arun_section splits a draft longer than REVIEW_CHUNK_TOKENS into chunk reviews."""
+    import asyncio
+    from src import config
+    from src.input_handler.content_input import ContentInput
+    from src.pipeline import arun_section
+    monkeypatch.setattr(config, "REVIEW_CHUNK_TOKENS", 20)
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=300)
+    with cost_tracker.track_calls() as calls:
+        asyncio.run(arun_section(section, "fake-key", num_versions=1))
+    operations = [call["operation"] for call in calls]
+    assert operations.count("review_content") > 1
+    assert "reduce_reviews" in operations
+
+def test_split_chunks_cuts_one_long_paragraph():
+    """Test that a paragraph longer than a chunk is cut at sentence ends, or between words without them."""
+    from src.reviewer.map_reduce import split_chunks
+    from src.utils.tokens import estimate_tokens
+    text = " ".join([PARAGRAPH] * 40)
+    chunks = split_chunks(text, 60)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+    assert all(chunk.endswith("spectroscopy.") for chunk in chunks)
+    assert " ".join(chunks) == text
+
+    words = " ".join(["nanoparticle"] * 500)
+    chunks = split_chunks(words, 60)
+    assert len(chunks) > 1
+    assert " ".join(chunks) == words
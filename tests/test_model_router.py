@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src import config
+from src.utils.cost_tracker import CostTracker
+from src.utils.model_router import ModelRouter, OutputRejected
+
+FULL_REVIEW = """SCORES:
+Clarity: 8/10 | Feedback: Clear
+Coherence: 7/10 | Feedback: Flows well
+Academic Style: 8/10 | Feedback: Formal
+Content Quality: 7/10 | Feedback: Thorough
+Structure: 8/10 | Feedback: Organised
+
+OVERALL FEEDBACK:
+Good text."""
+
+@pytest.fixture
+def routing(monkeypatch):
+    """Fixture enabling routing between a cheap and an expensive model."""
+    monkeypatch.setattr(config, "MODEL_ROUTING", True)
+    monkeypatch.setattr(config, "CHEAP_MODEL_NAME", "gpt-4o-mini")
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+
+def _completion(content):
+    """Build a mocked ChatCompletion with a single choice."""
+    return MagicMock(choices=[MagicMock(index=0, message=MagicMock(content=content))])
+
+def test_router_escalates_on_rejected_output(routing):
+    """Test that a rejected cheap attempt is retried on the expensive model."""
+    router = ModelRouter({"review_content": ["cheap", "expensive"]})
+    tried = []
+
+    def attempt(model):
+        tried.append(model)
+        if model == "gpt-4o-mini":
+            raise OutputRejected("unparseable", "partial")
+        return "complete"
+
+    assert router.run("review_content", attempt) == "complete"
+    assert tried == ["gpt-4o-mini", "gpt-4o"]
+
+def test_router_returns_best_effort_result(routing):
+    """Test that the last rejected result is returned when no model is left."""
+    router = ModelRouter({"add_citations": ["cheap", "expensive"]})
+
+    def attempt(model):
+        raise OutputRejected("unparseable", model)
+
+    assert router.run("add_citations", attempt) == "gpt-4o"
+
+def test_router_disabled(routing, monkeypatch):
+    """Test that every stage uses MODEL_NAME when routing is disabled."""
+    monkeypatch.setattr(config, "MODEL_ROUTING", False)
+    assert ModelRouter().models_for("generate_content") == ["gpt-4o"]
+    assert ModelRouter().models_for("unknown_stage") == ["gpt-4o"]
+
+@patch('src.reviewer.reviewer.chat_completion')
+def test_review_escalates_on_missing_criteria(mock_chat, routing):
+    """Test that a review missing criteria is escalated to the expensive model."""
+    from src.reviewer.reviewer import review_content
+    mock_chat.side_effect = [_completion("SCORES:\nClarity: 8/10 | Feedback: Clear"), _completion(FULL_REVIEW)]
+
+    reviewed = review_content("Some text", "key")
+
+    assert [call.kwargs["model"] for call in mock_chat.call_args_list] == ["gpt-4o-mini", "gpt-4o"]
+    assert reviewed.total_score == pytest.approx(7.6)
+
+def test_estimate_savings():
+    """Test comparing routed calls with running every call on one model."""
+    tracker = CostTracker()
+    tracker.add_call("gpt-4o-mini", 1000, 1000, "generate_content")
+    tracker.add_call("gpt-4o", 1000, 1000, "revise_content")
+
+    report = tracker.estimate_savings("gpt-4o")
+
+    assert report["cost"] == pytest.approx(0.00075 + 0.09)
+    assert report["baseline_cost"] == pytest.approx(0.18)
+    assert report["savings"] == pytest.approx(0.18 - 0.09075)
+
+def test_track_calls_scope():
+    """Test that only calls made inside the scope are collected."""
+    tracker = CostTracker()
+    tracker.add_call("gpt-4o", 10, 10, "generate_content")
+    with tracker.track_calls() as calls:
+        tracker.add_call("gpt-4o-mini", 10, 10, "review_content")
+    assert [call["operation"] for call in calls] == ["review_content"]
+    assert len(tracker.calls_history) == 2
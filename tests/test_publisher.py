@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 from src.publisher import ContentPublisher, publish_content
 from src.publisher.models import ValidationResult, PublishedContent
+from src.citation_editor.models import CitedContent, Citation
 
 def test_validation_result():
     """Test creating a ValidationResult instance."""
@@ -106,4 +107,146 @@ def test_publish_content_convenience(sample_cited_content):
     """Test the convenience function for publishing."""
     result = publish_content(sample_cited_content)
     assert isinstance(result, PublishedContent)
-    assert result.validation.is_valid is not None 
\ No newline at end of file
+    assert result.validation.is_valid is not None
+
+
+def _make_cited_content(text: str) -> CitedContent:
+    """Build a CitedContent with three well-formed citations."""
+    return CitedContent(
+        original_content=text,
+        cited_content=text,
+        citations=[
+            Citation(text=f"[Reason {i}]", source="Citation reason", location=f"paragraph {i}", reason=f"Reason {i}")
+            for i in range(1, 4)
+        ],
+        citation_changes=[],
+        citation_summary="Added citations"
+    )
+
+
+def test_text_stats():
+    """Test that text statistics are computed in one pass."""
+    from src.publisher import compute_text_stats
+    stats = compute_text_stats("First sentence [cite]. Second one!\n\nThird paragraph here.")
+    assert stats.paragraph_count == 2
+    assert stats.sentence_count == 3
+    assert stats.citation_spans == [(15, 21)]
+    assert stats.word_count == 8
+
+
+def test_word_limit_from_section_input():
+    """Test that the word limit target comes from the section input."""
+    from src.input_handler import ContentInput
+    content = _make_cited_content(" ".join(["word"] * 100))
+    section_input = ContentInput(section="Results", keypoints=["Point"], word_limit=100)
+
+    result = publish_content(content, section_input)
+    assert result.validation.is_valid
+    assert result.formatted_content["section"] == "Results"
+    assert result.metadata["section_type"] == "Results"
+
+    default_result = publish_content(content)
+    assert not default_result.validation.is_valid
+    assert any("1000" in issue for issue in default_result.validation.issues)
+
+
+def test_stats_computed_once():
+    """Test that publish computes text statistics only once per document."""
+    from unittest.mock import patch
+    from src.publisher import publisher as publisher_module
+    content = _make_cited_content("Some text [cite].")
+    with patch.object(publisher_module, "compute_text_stats", wraps=publisher_module.compute_text_stats) as mock_stats:
+        ContentPublisher().publish(content)
+    assert mock_stats.call_count == 1
+
+
+def test_custom_validator_registration():
+    """Test declarative registration of a custom validator."""
+    from src.publisher import ValidationEngine
+    engine = ValidationEngine()
+
+    @engine.register("paragraphs", severity="warning")
+    def warn_single_paragraph(context):
+        return ["Only one paragraph"] if context.stats.paragraph_count < 2 else []
+
+    result = ContentPublisher(engine=engine).publish(_make_cited_content("One paragraph."))
+    assert engine.names == ["paragraphs"]
+    assert result.validation.is_valid
+    assert result.validation.warnings == ["Only one paragraph"]
+
+
+def test_publish_many_in_process():
+    """Test bulk publishing without a process pool."""
+    from src.publisher import publish_many
+    contents = [_make_cited_content(f"Document {i} text [cite].") for i in range(5)]
+    results = list(publish_many(contents, workers=1))
+    assert [r.original_content for r in results] == contents
+
+
+def test_publish_many_process_pool():
+    """Test bulk publishing across worker processes with chunked dispatch."""
+    from src.publisher import publish_many
+    from src.input_handler import ContentInput
+    contents = [_make_cited_content(f"Document {i} text [cite].") for i in range(7)]
+    section_inputs = [ContentInput(section="Results", keypoints=["Point"], word_limit=4)] * 7
+    results = list(publish_many(contents, workers=2, section_inputs=section_inputs, chunksize=3))
+    assert len(results) == 7
+    assert {r.original_content.cited_content for r in results} == {c.cited_content for c in contents}
+    assert all(r.formatted_content["section"] == "Results" for r in results)
+
+
+def test_publish_many_rejects_misaligned_section_inputs():
+    """Test that section inputs must line up with the documents one to one."""
+    from src.publisher import publish_many
+    from src.input_handler import ContentInput
+    contents = [_make_cited_content(f"Document {i} text [cite].") for i in range(3)]
+    section_input = ContentInput(section="Results", keypoints=["Point"], word_limit=4)
+    for section_inputs in ([section_input] * 2, [section_input] * 4):
+        with pytest.raises(ValueError):
+            list(publish_many(contents, workers=1, section_inputs=section_inputs))
+
+
+def test_output_sinks(tmp_path):
+    """Test writing published content to all sinks concurrently."""
+    import json
+    from src.publisher import create_sinks, write_outputs
+    published = publish_content(_make_cited_content("Text with 50% yield [cite]."))
+    sinks = create_sinks(["json", "jsonl", "markdown", "latex"], output_dir=str(tmp_path), fast=True)
+
+    first = write_outputs(published, sinks)
+    second = write_outputs(published, sinks)
+
+    assert first["json"] != second["json"]
+    assert first["jsonl"] == second["jsonl"]
+    with open(first["json"], encoding="utf-8") as f:
+        assert json.load(f)["validation"]["is_valid"] is False
+    with open(first["jsonl"], encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert records[0]["run_id"] != records[1]["run_id"]
+    assert "# Introduction" in open(first["markdown"], encoding="utf-8").read()
+    assert r"50\% yield" in open(first["latex"], encoding="utf-8").read()
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_compressed_jsonl_sink(tmp_path):
+    """Test appending gzip-compressed JSON lines."""
+    import gzip
+    import json
+    from src.publisher import JSONLSink
+    published = publish_content(_make_cited_content("Some text [cite]."))
+    sink = JSONLSink(str(tmp_path), compress=True)
+    sink.write(published, "run-1")
+    path = sink.write(published, "run-2")
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["run_id"] for line in f] == ["run-1", "run-2"]
+
+def test_output_sink_requires_write(tmp_path):
+    """Test that a sink without write() cannot be created."""
+    from src.publisher import OutputSink
+
+    class IncompleteSink(OutputSink):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteSink(str(tmp_path))
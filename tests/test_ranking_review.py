@@ -0,0 +1,63 @@
+import pytest
+from src.input_handler.content_input import ContentInput
+from src.utils.cost_tracker import cost_tracker
+from src.utils.model_router import OutputRejected
+from fake_llm_fixture import fake_llm
+
+def test_ranking_response_parsed_to_scores():
+    """Test that score-only lines become a full set of criterion scores."""
+    from src.reviewer.reviewer import ranking_from_response
+    reviewed = ranking_from_response("Text.", "RANKING SCORES:\nClarity: 8/10\nCoherence: 7/10\nAcademic Style: 9/10\nContent Quality: 6/10\nStructure: 10/10")
+    assert [s.score for s in reviewed.scores] == [8, 7, 9, 6, 10]
+    assert reviewed.total_score == 8.0
+
+    with pytest.raises(OutputRejected):
+        ranking_from_response("Text.", "Clarity: 8/10")
+
+def test_ranking_prompt_asks_for_far_less_output():
+    """Test that the ranking prompt asks for numbers only, unlike the detailed review."""
+    from src.reviewer.reviewer import create_ranking_messages, create_review_messages
+    ranking = create_ranking_messages("Text.")[-1]["content"]
+    detailed = create_review_messages("Text.")[-1]["content"]
+    assert "Feedback" not in ranking
+    assert len(ranking) < len(detailed) / 2
+
+def test_ranking_call_caps_its_output(fake_llm):
+    """Test that ranking calls ask for a small max_tokens, so the budget reserves little output."""
+    from unittest.mock import patch
+    from src.reviewer import score_content
+    from src.reviewer.reviewer import RANKING_MAX_TOKENS
+    from src.utils import llm
+    with patch.object(llm, "_send", wraps=llm._send) as send:
+        score_content("Gold nanoparticles are studied widely.", "fake-key", model="gpt-4o")
+    assert send.call_args.args[3]["max_tokens"] == RANKING_MAX_TOKENS <= 100
+
+def test_ranking_cap_leaves_room_for_reasoning():
+    """Test that reasoning models get headroom for their hidden reasoning tokens."""
+    from src.reviewer.reviewer import RANKING_MAX_TOKENS, ranking_max_tokens
+    assert ranking_max_tokens("gpt-4o-mini") == RANKING_MAX_TOKENS
+    assert ranking_max_tokens("o1-2024-12-17") > 10 * RANKING_MAX_TOKENS
+
+def test_unparsed_ranking_falls_back_to_full_review(fake_llm, caplog):
+    """Test that a draft without any parsed ranking score is reviewed in full, not ranked on defaults."""
+    from unittest.mock import patch
+    from src.reviewer import reviewer
+    with patch.object(reviewer, "ranking_from_response", side_effect=reviewer.OutputRejected("no criteria parsed", None)), \
+            cost_tracker.track_calls() as calls:
+        reviewed = reviewer.score_content("Gold nanoparticles are studied widely.", "fake-key", model="gpt-4o")
+    assert [call["operation"] for call in calls] == ["score_content", "review_content"]
+    assert reviewed.scores[0].feedback != "Scored for ranking only"
+    assert "No ranking scores parsed" in caplog.text
+
+def test_run_section_reviews_only_the_winner_in_detail(fake_llm):
+    """Test that drafts are ranked with score_content and one detailed review follows."""
+    from src.pipeline import run_section
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+    with cost_tracker.track_calls() as calls:
+        published = run_section(section, "fake-key", num_versions=3, rank_drafts=True, dedup_threshold=1.0)
+
+    pipeline = published.metadata["pipeline"]
+    operations = [call["operation"] for call in calls]
+    assert pipeline["rank_drafts"] is True
+    assert operations.count("score_content") == len(pipeline["review_scores"]) > 1
+    assert operations.count("review_content") == 1
@@ -0,0 +1,99 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+from src import config
+from src.service import JobManager, JobRequest, JobStatus, ServiceServer
+from fake_llm_fixture import fake_llm
+
+SECTION = {"section": "Introduction", "keypoints": ["Gold nanoparticles"], "word_limit": 120}
+
+@pytest.fixture
+def service(fake_llm):
+    """Fixture for a running service backed by the fake LLM server."""
+    manager = JobManager(api_key="fake-key", workers=2)
+    server = ServiceServer(manager, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    manager.shutdown()
+
+def _request(method, url, payload=None):
+    """Send a JSON request and decode the response."""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    with urllib.request.urlopen(req) as response:
+        return response.status, json.loads(response.read())
+
+def test_job_request_from_payload():
+    """Test creating section and paper job requests."""
+    section_job = JobRequest.from_payload({"section": SECTION})
+    assert section_job.type == "section"
+    assert len(section_job.sections) == 1
+
+    paper_job = JobRequest.from_payload({"sections": [SECTION, SECTION], "num_versions": 2})
+    assert paper_job.type == "paper"
+    assert paper_job.num_versions == 2
+
+def test_paper_job_through_http(service, fake_llm):
+    """Test submitting a paper job and fetching its status and result."""
+    status, job = _request("POST", f"{service.url}/jobs", {"sections": [SECTION, SECTION], "num_versions": 2})
+    assert status == 202
+    assert job["status"] in ("queued", "running")
+
+    service.manager.wait(job["id"], timeout=30)
+    _, job = _request("GET", f"{service.url}/jobs/{job['id']}")
+    assert job["status"] == "succeeded"
+    assert job["sections_completed"] == 2
+
+    _, result = _request("GET", f"{service.url}/jobs/{job['id']}/result")
+    assert len(result["results"]) == 2
+    # One multi-choice generation, two reviews, one revision and one citation call per section
+    assert fake_llm.requests == 2 * (1 + 2 + 1 + 1)
+
+def test_cancel_queued_job(fake_llm):
+    """Test that queued jobs can be cancelled before they run."""
+    fake_llm.latency = 0.2
+    manager = JobManager(api_key="fake-key", workers=1)
+    running = manager.submit(JobRequest.from_payload({"section": SECTION, "num_versions": 1}))
+    queued = manager.submit(JobRequest.from_payload({"section": SECTION, "num_versions": 1}))
+
+    assert manager.cancel(queued.id).status == JobStatus.CANCELLED
+    assert manager.wait(running.id, timeout=30).status == JobStatus.SUCCEEDED
+    assert manager.result(queued.id) == []
+    manager.shutdown()
+
+def test_unknown_job_and_bad_request(service):
+    """Test error responses for unknown jobs and invalid submissions."""
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _request("GET", f"{service.url}/jobs/missing")
+    assert exc.value.code == 404
+
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _request("POST", f"{service.url}/jobs", {"sections": []})
+    assert exc.value.code == 400
+
+def test_metrics_expose_concurrency_limit(service, monkeypatch):
+    """Test that the adaptive concurrency limit is reported when enabled."""
+    _, metrics = _request("GET", f"{service.url}/metrics")
+    assert metrics["concurrency"] is None
+
+    monkeypatch.setattr(config, "ADAPTIVE_CONCURRENCY", True)
+    _, metrics = _request("GET", f"{service.url}/metrics")
+    assert metrics["concurrency"]["limit"] >= config.CONCURRENCY_MIN
+    assert "hedges" in metrics["hedging"]
+
+def test_finished_jobs_beyond_limit_are_forgotten(fake_llm):
+    """Test that only the most recent keep_finished finished jobs are kept."""
+    from src.service.jobs import JobNotFoundError
+    manager = JobManager(api_key="fake-key", workers=1, keep_finished=2)
+    jobs = [manager.submit(JobRequest.from_payload({"section": SECTION, "num_versions": 1})) for _ in range(3)]
+    manager.wait(jobs[2].id, timeout=30)
+    manager.shutdown()
+
+    assert [job.id for job in manager.list()] == [job.id for job in jobs[1:]]
+    assert len(manager.result(jobs[2].id)) == 1
+    with pytest.raises(JobNotFoundError):
+        manager.result(jobs[0].id)
@@ -0,0 +1,75 @@
+import time
+from unittest.mock import patch
+from src.reviewer import ReviewedContent, ReviewScore, ReviewCriteria
+from src.revision_agent import RevisedContent
+from src.pipeline.speculative import review_and_revise, clear_leader
+
+# Draft text -> (review delay in seconds, total score)
+DRAFTS = {"strong": (0.01, 9.0), "weak": (0.02, 5.0), "slow": (0.15, 6.0)}
+
+def _review(content, api_key):
+    """Review a draft after its delay, with its fixed score."""
+    delay, score = DRAFTS[content]
+    time.sleep(delay)
+    scores = [ReviewScore(criterion=c, score=round(score), feedback="ok") for c in ReviewCriteria]
+    return ReviewedContent(content=content, scores=scores, total_score=score, overall_feedback="ok")
+
+def _revise(content, api_key):
+    """Revise a draft after a fixed delay, recording usage."""
+    from src.utils.cost_tracker import cost_tracker
+    time.sleep(0.1)
+    cost_tracker.add_call("gpt-4o", 100, 50, "revise_content")
+    return RevisedContent(original_content=content, revised_content=f"revised {content}", revision_changes=[], revision_summary="")
+
+def test_clear_leader():
+    """Test calling a leader only with enough reviews and margin."""
+    review = lambda name: _review(name, "key")
+    assert clear_leader([review("strong"), None, None], 0.5, 2) is None
+    assert clear_leader([review("weak"), review("slow"), None], 1.5, 2) is None
+    assert clear_leader([review("weak"), review("strong"), None], 0.5, 2) == 1
+
+@patch('src.pipeline.speculative.revise_content', side_effect=_revise)
+@patch('src.pipeline.speculative.review_content', side_effect=_review)
+def test_speculation_used_saves_latency(mock_review, mock_revise):
+    """Test that revising a clear leader early is used when it wins."""
+    reviews, selected, revised, report = review_and_revise(["strong", "weak", "slow"], "key")
+
+    assert [r.content for r in reviews] == ["strong", "weak", "slow"]
+    assert selected.content == "strong"
+    assert revised.revised_content == "revised strong"
+    assert report["used"] and report["speculations"] == 1
+    assert report["latency_saved"] > 0.05
+    assert report["tokens_wasted"] == 0
+    assert mock_revise.call_count == 1
+
+def _run_with_late_winner(score):
+    """Review drafts where a late review beats the early leader."""
+    DRAFTS["late_winner"] = (0.05, score)
+    try:
+        return review_and_revise(["weak", "slow", "late_winner", "strong"], "key")
+    finally:
+        del DRAFTS["late_winner"]
+
+@patch('src.pipeline.speculative.revise_content', side_effect=_revise)
+@patch('src.pipeline.speculative.review_content', side_effect=_review)
+def test_overtaken_speculation_is_discarded(mock_review, mock_revise):
+    """Test that speculation on an overtaken leader is discarded and its tokens reported."""
+    _, selected, revised, report = _run_with_late_winner(9.2)
+
+    assert selected.content == "late_winner"
+    assert revised.revised_content == "revised late_winner"
+    assert not report["used"]
+    assert report["latency_saved"] == 0
+    assert report["discarded"] == 1
+    assert report["tokens_wasted"] == 150
+
+@patch('src.pipeline.speculative.revise_content', side_effect=_revise)
+@patch('src.pipeline.speculative.review_content', side_effect=_review)
+def test_new_clear_leader_replaces_speculation(mock_review, mock_revise):
+    """Test switching speculation to a draft that takes a clear lead."""
+    _, selected, revised, report = _run_with_late_winner(9.5)
+
+    assert selected.content == "late_winner"
+    assert report["used"] and report["speculations"] == 2
+    assert report["discarded"] + report["cancelled"] == 1
+    assert report["tokens_wasted"] == 150 * report["discarded"]
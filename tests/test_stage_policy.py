@@ -0,0 +1,70 @@
+import pytest
+from src import config
+from src.input_handler.content_input import ContentInput
+from src.pipeline import StagePolicy, StageAction
+from src.reviewer import ReviewedContent, ReviewScore, ReviewCriteria
+from src.utils.budget import Budget
+from fake_llm_fixture import fake_llm
+
+TEXT = " ".join(["Gold nanoparticles exhibit plasmon resonance that depends on their size."] * 10)
+
+def _review(score):
+    """Build a review with the same score on every criterion."""
+    return ReviewedContent(
+        content=TEXT,
+        scores=[ReviewScore(criterion=c, score=score, feedback="Fine.") for c in ReviewCriteria],
+        total_score=float(score),
+        overall_feedback="Fine."
+    )
+
+@pytest.fixture
+def models(monkeypatch):
+    """Fixture pinning the models the policy prices calls with."""
+    monkeypatch.setattr(config, "MODEL_NAME", "gpt-4o")
+    monkeypatch.setattr(config, "CHEAP_MODEL_NAME", "gpt-4o-mini")
+    monkeypatch.setattr(config, "MODEL_ROUTING", True)
+
+def test_revision_skipped_for_high_scores_within_word_limit(models):
+    """Test that revision is skipped only when every score is high and the length complies."""
+    policy = StagePolicy(skip_score=9)
+    assert policy.revision(TEXT, _review(9), word_limit=100).action == StageAction.SKIP
+    assert policy.revision(TEXT, _review(8), word_limit=100).action == StageAction.RUN
+    assert policy.revision(TEXT, _review(10), word_limit=300).action == StageAction.RUN
+    assert policy.revision(TEXT, None, word_limit=100).action == StageAction.RUN
+
+def test_tight_budget_shortens_then_skips(models):
+    """Test that a stage moves to the cheap model, then is skipped, as the budget shrinks."""
+    policy = StagePolicy()
+    assert policy.revision(TEXT, _review(5), 100, Budget(max_cost=1.0)).action == StageAction.RUN
+
+    shortened = policy.revision(TEXT, _review(5), 100, Budget(max_cost=0.001))
+    assert shortened.action == StageAction.SHORTEN
+    assert shortened.model == "gpt-4o-mini"
+
+    assert policy.citation(TEXT, Budget(max_cost=0.000001)).action == StageAction.SKIP
+
+def test_run_section_logs_policy_decisions(fake_llm):
+    """Test that a skipped revision makes no call and is recorded in the metadata."""
+    from src.pipeline import run_section
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+    published = run_section(section, "fake-key", num_versions=2, policy=StagePolicy(skip_score=0))
+
+    pipeline = published.metadata["pipeline"]
+    assert "revise_content" not in pipeline["routing"]["models"]
+    assert [(d["stage"], d["action"]) for d in pipeline["policy"]] == [
+        ("revise_content", "skip"), ("add_citations", "run")
+    ]
+
+def test_speculative_revision_logs_policy_bypass_and_rescores(fake_llm):
+    """Test that a speculative section records that revision bypassed the policy and still re-scores."""
+    from src.pipeline import run_section
+    section = ContentInput(section="Introduction", keypoints=["Gold nanoparticles"], word_limit=120)
+    published = run_section(section, "fake-key", num_versions=2, speculative=True, rescore_revision=True,
+                            policy=StagePolicy(skip_score=0))
+
+    pipeline = published.metadata["pipeline"]
+    assert [(d["stage"], d["action"]) for d in pipeline["policy"]] == [
+        ("revise_content", "run"), ("add_citations", "run")
+    ]
+    assert "speculative" in pipeline["policy"][0]["reason"]
+    assert pipeline["revised_score"] is not None
@@ -0,0 +1,56 @@
+import time
+from unittest.mock import patch, MagicMock
+from src.utils.tokens import TokenEstimator, count_tokens, profile_for, CL100K, O200K
+
+def test_profile_registry():
+    """Test that models map to their tokenizer family by prefix."""
+    assert profile_for("gpt-4o-mini") is O200K
+    assert profile_for("o1-2024-12-17") is O200K
+    assert profile_for("gpt-4-0613") is CL100K
+    assert profile_for("unknown-model") is O200K
+
+def test_count_tokens_is_plausible():
+    """Test estimates against known token counts of common text."""
+    # "The quick brown fox jumps over the lazy dog." is 10 tokens in both families
+    assert count_tokens("The quick brown fox jumps over the lazy dog.") == 10
+    assert count_tokens("") == 0
+    assert count_tokens("nanoparticles", CL100K) > 1
+
+def test_estimator_calibrates_towards_actual_usage():
+    """Test that observed usage corrects later estimates and is reported."""
+    estimator = TokenEstimator()
+    text = "word " * 100
+    for _ in range(50):
+        estimator.observe("gpt-4o", estimator.count(text, "gpt-4o"), 150)
+
+    assert abs(estimator.count(text, "gpt-4o") - 150) <= 3
+    report = estimator.error_report()["gpt-4o"]
+    assert report["prompt"]["calls"] == 50
+    assert report["prompt"]["mean_error"] < 0  # underestimated at first
+    assert report["correction"] > 1
+
+def test_estimator_is_fast_on_prompts():
+    """Test that estimating a generation prompt takes well under a millisecond."""
+    from src.content_generator.generator import create_prompt
+    prompt = create_prompt("Introduction", ["Gold nanoparticles", "Drug delivery"], 1000)
+    estimator = TokenEstimator()
+    start = time.perf_counter()
+    for _ in range(200):
+        estimator.count(prompt, "gpt-4o")
+    assert (time.perf_counter() - start) / 200 < 0.001
+
+def test_chat_completion_records_estimation_error():
+    """Test that the shared call path compares estimates with reported usage."""
+    from src.utils import llm
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(index=0, message=MagicMock(content="Short answer."))],
+        usage=MagicMock(prompt_tokens=20, completion_tokens=3, completion_tokens_details=None)
+    )
+    estimator = TokenEstimator()
+    with patch.object(llm, "get_client", return_value=client), patch.object(llm, "token_estimator", estimator):
+        llm.chat_completion([{"role": "user", "content": "Hello there"}], "key", "review_content", model="gpt-4o")
+
+    report = estimator.error_report()["gpt-4o"]
+    assert report["prompt"]["calls"] == 1
+    assert report["completion"]["calls"] == 1